@@ -22,6 +22,7 @@ import random
 
 from AutomationUtils.cvtestcase import CVTestCase
 from VirtualServer.VSAUtils import VirtualServerHelper, OptionsHelper
+from VirtualServer.VSAUtils.RestoreCampaign import RestoreCampaign
 from AutomationUtils import logger, constants, qcconstants
 
 
@@ -78,14 +79,21 @@ class TestCase(CVTestCase):
             except ValueError:
                 pass
 
+            # restores of all the jobs run together, one at a time per destination host
+            campaign = RestoreCampaign(self.commcell)
             for job in jobs_to_restore:
                 vm_restore_options = OptionsHelper.FullVMRestoreOptions(auto_subclient, self)
                 vm_restore_options.unconditional_overwrite = True
                 vm_restore_options.power_on_after_restore = True
                 vm_restore_options.restore_backup_job = job
-                log.info("*" * 10 + "Submitting full VM restore for job {0} ".format(
+                log.info("*" * 10 + "Adding full VM restore for job {0} ".format(
                     str(job)) + "*" * 10)
-                auto_subclient.virtual_machine_restore(vm_restore_options)
+                campaign.add_full_vm_restore(auto_subclient, vm_restore_options)
+
+            try:
+                campaign.run()
+            finally:
+                log.info("Restore campaign report: {0}".format(campaign.report()))
 
         except Exception as exp:
             log.error('Failed with error: ' + str(exp))
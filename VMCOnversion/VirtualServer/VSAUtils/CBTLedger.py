@@ -0,0 +1,213 @@
+"""Main file for recording and verifying the CBT change ids of the VSA backups
+
+CBTLedger keeps the change ids generated by each backup, read from the browse metadata,
+and the change ids used by the next backup, read from the CBT stats of the proxies
+
+    #.  change ids are kept in memory, per backup type, VM and disk, and verified
+        without reading the files back
+
+    #.  each record is appended to a single json lines file of the run, so the ledger
+        of a run can be loaded again by the next testcase of the run
+
+    #.  change ids of a VM are extracted from the browse response in a single pass
+
+classes defined:
+    CBTLedger   - change ids generated and used by the backups of a run
+
+Methods:
+
+    extract_change_ids()    - change id of each disk from the browse response of a VM
+
+    parse_cbt_stat_files()  - change id used for each disk, from the CBT stat files of a VM
+
+"""
+
+import json
+import os
+import threading
+import time
+
+from AutomationUtils import logger
+
+LEDGER_FILE = "cbt_ledger.jsonl"
+GENERATED = "generated"
+USED = "used"
+
+
+def extract_change_ids(response_json):
+    """
+    change id of each disk of the VM, from the browse response
+
+    Args:
+            response_json   (dict)  - browse response of the VM like
+                                        {path: {'name': 'disk1.vhdx', 'advanced_data': {}}}
+
+    Return:
+            change_ids      (dict)  - change id of each disk like {'disk1.vhdx': '1234'}
+    """
+    change_ids = {}
+    for value in response_json.values():
+        change_id = (((value.get('advanced_data') or {})
+                      .get('browseMetaData') or {})
+                     .get('virtualServerMetaData') or {}).get('changeId')
+        if change_id:
+            change_ids[value.get('name')] = change_id
+
+    return change_ids
+
+
+def parse_cbt_stat_files(stat_folder, remove=True):
+    """
+    change id used by the backup for each disk of the VM, from the CBT stat files
+
+    Args:
+            stat_folder     (str)   - local folder with the CBT stat files of the VM
+
+            remove          (bool)  - remove the stat files once parsed
+
+    Return:
+            change_ids      (dict)  - change id of each disk like {'disk1': '1234'}
+    """
+    marker = "ChangeId from previous job : "
+    change_ids = {}
+
+    for file_name in sorted(os.listdir(stat_folder)):
+        stat_file = os.path.join(stat_folder, file_name)
+        lower_name = file_name.lower()
+        if not os.path.isfile(stat_file) or "avhdx.txt" in lower_name or ".vhd" not in lower_name:
+            continue
+
+        disk_name = stat_file[stat_file.rfind("-") + 1:len(stat_file) - 4]
+        with open(stat_file, "r") as stats_file:
+            for line in stats_file:
+                if marker in line:
+                    change_ids[disk_name] = line[line.index("[") + 1:line.index("]")]
+
+        if remove:
+            os.remove(stat_file)
+
+    return change_ids
+
+
+class CBTLedger(object):
+    """
+    Change ids generated and used by the backups of a run
+
+    Methods:
+            record_generated()  - records the change ids generated by the backup of the VM
+
+            record_used()       - records the change ids used by the backup of the VM
+
+            generated()         - returns the change ids generated by the backup of the VM
+
+            used()              - returns the change ids used by the backup of the VM
+
+            verify()            - verifies the backup used the change ids of the previous backup
+
+    """
+
+    def __init__(self, ledger_path):
+        """
+        Args:
+                ledger_path     (str)   - json lines file of the run, loaded if it exists
+        """
+        self.log = logger.get_log()
+        self.ledger_path = ledger_path
+        # {(generated / used, backup type, vm): {disk: change id}}
+        self._records = {}
+        self._lock = threading.Lock()
+
+        if os.path.exists(ledger_path):
+            self._load()
+
+    def _load(self):
+        """loads the records of the ledger file"""
+        with open(self.ledger_path, "r") as ledger_file:
+            for line in ledger_file:
+                if line.strip():
+                    record = json.loads(line)
+                    self._records.setdefault(
+                        (record["kind"], record["backup_type"], record["vm"]), {}
+                    ).update(record["disks"])
+
+    def _record(self, kind, backup_type, vm_name, change_ids):
+        """adds the change ids to the ledger, and appends the record to the ledger file"""
+        disks = dict((str(disk).lower(), str(change_id).strip())
+                     for disk, change_id in change_ids.items())
+        line = json.dumps({
+            "time": int(time.time()), "kind": kind, "backup_type": backup_type,
+            "vm": vm_name, "disks": disks
+        })
+
+        with self._lock:
+            self._records.setdefault((kind, backup_type, vm_name), {}).update(disks)
+            with open(self.ledger_path, "a") as ledger_file:
+                ledger_file.write(line + "\n")
+
+    def record_generated(self, backup_type, vm_name, change_ids):
+        """
+        records the change ids generated by the backup of the VM
+
+        Args:
+                backup_type     (str)   - FULL/INCREMENTAL/DIFFERENTIAL/SYNTHETIC_FULL
+
+                vm_name         (str)   - name of the VM
+
+                change_ids      (dict)  - change id of each disk
+        """
+        self._record(GENERATED, backup_type, vm_name, change_ids)
+
+    def record_used(self, backup_type, vm_name, change_ids):
+        """
+        records the change ids used by the backup of the VM
+
+        Args:
+                backup_type     (str)   - FULL/INCREMENTAL/DIFFERENTIAL/SYNTHETIC_FULL
+
+                vm_name         (str)   - name of the VM
+
+                change_ids      (dict)  - change id of each disk
+        """
+        self._record(USED, backup_type, vm_name, change_ids)
+
+    def generated(self, backup_type, vm_name):
+        """returns the change ids generated by the backup of the VM, None if not recorded"""
+        return self._records.get((GENERATED, backup_type, vm_name))
+
+    def used(self, backup_type, vm_name):
+        """returns the change ids used by the backup of the VM, None if not recorded"""
+        return self._records.get((USED, backup_type, vm_name))
+
+    def verify(self, backup_type, vm_list):
+        """
+        verifies the backup of the VMs used the change ids generated by the previous backup,
+        the previous full for differential, and the previous incremental or full otherwise
+
+        Args:
+                backup_type     (str)   - backup type of the backup to verify
+
+                vm_list         (list)  - list of VMs
+
+        Return:
+                mismatches      (list)  - (vm, disk, generated change id, used change id)
+                                            of the disks which did not use the change id
+        """
+        mismatches = []
+        for vm_name in vm_list:
+            previous = None
+            if backup_type != "DIFFERENTIAL":
+                previous = self.generated("INCREMENTAL", vm_name)
+            if previous is None:
+                previous = self.generated("FULL", vm_name) or {}
+
+            used = self.used(backup_type, vm_name) or {}
+            for disk, change_id in previous.items():
+                if used.get(disk) != change_id:
+                    self.log.info("Used incorrect change IDs for {0} backup for Disk {1}".format(
+                        backup_type, disk))
+                    mismatches.append((vm_name, disk, change_id, used.get(disk)))
+                else:
+                    self.log.info("Used correct change IDs for {0} backup Disk {1}".format(
+                        backup_type, disk))
+
+        return mismatches
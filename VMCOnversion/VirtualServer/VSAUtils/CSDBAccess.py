@@ -0,0 +1,261 @@
+"""Main file for the CSDB queries of the VSA automation
+
+CSDBAccess wraps the CS Database object of the testcase
+
+    #.  queries are prepared with ? placeholders, and the parameters are rendered as
+        escaped literals, instead of formatting the values into the query by the callers
+
+    #.  lookups for many ids, like the copies of many storage policies, or the child jobs of
+        many jobs, are run as batched IN (...) queries
+
+    #.  results are cached for a short time, keyed by the query and the parameters, so the
+        same lookup from many subclients of a suite is run once
+
+    #.  number of queries run against the DB, and served from the cache are counted
+
+classes defined:
+    CSDBAccess  - prepared, batched and cached queries on the CSDB
+
+"""
+
+import threading
+import time
+
+from AutomationUtils import logger
+
+DEFAULT_CACHE_TTL = 30
+DEFAULT_BATCH_SIZE = 500
+
+# quotes of the literals and identifiers, in which ? is not a placeholder
+_QUOTES = {"'": "'", '"': '"', "[": "]"}
+
+
+def _literal(value):
+    """
+    renders the parameter as a SQL literal
+
+    Args:
+            value   (int/str/list)  - value of the parameter, list is rendered as (v1, v2)
+
+    Return:
+            literal (str)   - escaped SQL literal
+    """
+    if isinstance(value, (list, tuple, set, frozenset)):
+        if not value:
+            raise Exception("Empty list can not be used as a query parameter")
+        return "(" + ", ".join(_literal(each_value) for each_value in value) + ")"
+
+    if value is None:
+        return "NULL"
+
+    if isinstance(value, bool):
+        return str(int(value))
+
+    if isinstance(value, (int, float)):
+        return str(value)
+
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _split_placeholders(query):
+    """
+    splits the query at the ? placeholders, skipping the ? inside the quoted literals like
+    'what?' and identifiers like [name?]
+    """
+    parts = []
+    start = 0
+    quote = None
+    for index, char in enumerate(query):
+        if quote is not None:
+            # escaped quote '' closes and opens the literal again
+            if char == quote:
+                quote = None
+        elif char in _QUOTES:
+            quote = _QUOTES[char]
+        elif char == "?":
+            parts.append(query[start:index])
+            start = index + 1
+
+    parts.append(query[start:])
+    return parts
+
+
+def prepare(query, params=()):
+    """
+    renders the parameters of the query in place of the ? placeholders
+
+    Args:
+            query   (str)   - query with ? placeholders like
+                                select copy from archGroupCopy where archGroupId in ?
+
+            params  (tuple) - value of each placeholder
+
+    Return:
+            query   (str)   - query to run against the DB
+
+    Exception:
+            if the number of placeholders and the parameters do not match
+    """
+    parts = _split_placeholders(query)
+    if len(parts) - 1 != len(params):
+        raise Exception("Query expects {0} parameters, {1} given".format(
+            len(parts) - 1, len(params)))
+
+    prepared = [parts[0]]
+    for value, part in zip(params, parts[1:]):
+        prepared.append(_literal(value))
+        prepared.append(part)
+
+    return "".join(prepared)
+
+
+class CSDBAccess(object):
+    """
+    Prepared, batched and cached queries on the CSDB
+
+    Methods:
+            fetch_all()     - returns all the rows of the query
+
+            fetch_one()     - returns the first row of the query
+
+            fetch_in()      - runs the query for many keys in batched IN (...) lookups
+
+            clear_cache()   - clears the cached results
+
+            reset_stats()   - resets the query counts
+
+    Attributes:
+            stats           - number of queries run, and served from the cache
+
+    """
+
+    def __init__(self, csdb, cache_ttl=DEFAULT_CACHE_TTL, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Args:
+                csdb        (obj)   - CS Database object from testcase
+
+                cache_ttl   (int)   - seconds the results are cached, 0 to disable
+
+                batch_size  (int)   - maximum number of keys in an IN (...) lookup
+        """
+        self.log = logger.get_log()
+        self.csdb = csdb
+        self.cache_ttl = cache_ttl
+        self.batch_size = batch_size
+
+        self._cache = {}
+        self._lock = threading.Lock()
+        self._queries = 0
+        self._cache_hits = 0
+
+    @property
+    def stats(self):
+        """returns the number of queries like {'queries': 12, 'cache_hits': 30}"""
+        return {'queries': self._queries, 'cache_hits': self._cache_hits}
+
+    def reset_stats(self):
+        """resets the number of queries run, and served from the cache"""
+        with self._lock:
+            self._queries = 0
+            self._cache_hits = 0
+
+    def clear_cache(self):
+        """clears all the cached results"""
+        with self._lock:
+            self._cache.clear()
+
+    def _run(self, query, use_cache):
+        """
+        runs the prepared query, or returns its cached result
+
+        Args:
+                query       (str)   - prepared query
+
+                use_cache   (bool)  - return the cached result, if not expired
+
+        Return:
+                rows        (list)  - all the rows of the query, a copy of the cached rows,
+                                        so the callers can modify them
+        """
+        # CSDB object keeps the result of the last query, execute and fetch are run together
+        with self._lock:
+            if use_cache and self.cache_ttl:
+                cached = self._cache.get(query)
+                if cached and cached[0] > time.time():
+                    self._cache_hits += 1
+                    return [list(row) for row in cached[1]]
+
+            self.csdb.execute(query)
+            rows = [list(row) for row in (self.csdb.fetch_all_rows() or [])
+                    if row and any(str(value).strip() for value in row)]
+            self._queries += 1
+
+            # empty results are not cached, the rows may be added by a running job
+            if self.cache_ttl and rows:
+                self._cache[query] = (time.time() + self.cache_ttl, [list(row) for row in rows])
+
+            return rows
+
+    def fetch_all(self, query, params=(), use_cache=True):
+        """
+        returns all the rows of the query
+
+        Args:
+                query       (str)   - query with ? placeholders
+
+                params      (tuple) - value of each placeholder
+
+                use_cache   (bool)  - return the cached result, if not expired
+
+        Return:
+                rows        (list)  - all the rows of the query
+        """
+        return self._run(prepare(query, params), use_cache)
+
+    def fetch_one(self, query, params=(), use_cache=True):
+        """
+        returns the first row of the query
+
+        Args:
+                query       (str)   - query with ? placeholders
+
+                params      (tuple) - value of each placeholder
+
+                use_cache   (bool)  - return the cached result, if not expired
+
+        Return:
+                row         (list)  - first row of the query, None if no rows
+        """
+        rows = self.fetch_all(query, params, use_cache)
+        return rows[0] if rows else None
+
+    def fetch_in(self, query, keys, params=(), use_cache=True):
+        """
+        runs the query for many keys, in batched IN (...) lookups
+
+        Query has the IN ? placeholder for the keys as the first parameter, and selects the
+        key as the first column, like
+            select archGroupId, copy from archGroupCopy where archGroupId in ? and type = ?
+
+        Args:
+                query       (str)   - query with ? placeholders
+
+                keys        (list)  - keys to look up
+
+                params      (tuple) - value of the placeholders after the keys
+
+                use_cache   (bool)  - return the cached result, if not expired
+
+        Return:
+                rows        (dict)  - rows of each key, like {'12': [['12', '3']]}, keys
+                                        without rows are not in the dict
+        """
+        keys = list(dict.fromkeys(keys))
+        result = {}
+
+        for index in range(0, len(keys), self.batch_size):
+            batch = keys[index:index + self.batch_size]
+            for row in self.fetch_all(query, (batch,) + tuple(params), use_cache):
+                result.setdefault(str(row[0]).strip(), []).append(row)
+
+        return result
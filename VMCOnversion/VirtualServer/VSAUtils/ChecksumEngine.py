@@ -0,0 +1,376 @@
+"""Main file for calculating the checksum of all the files of a folder tree
+
+ChecksumEngine hashes the files of a local, or UNC folder, instead of walking the folder and
+hashing each file one after the other with small reads
+
+    #.  files are read with large reads, and large local files are memory mapped, so a file
+        over SMB is read with few round trips
+
+    #.  files can be hashed on a pool of processes, when there are enough files to hash.
+        The pool is opt-in, as the spawn start method on windows imports the main module
+        of the caller again in each process
+
+    #.  hash can be any hashlib algorithm, or "fast" for the fastest available hash
+        (xxhash if installed, else blake2b, else md5)
+
+    #.  checksums can be cached on the disk, by the path, size, modification and change time
+        of each file, so hashing an unchanged folder again costs only a walk of the folder.
+        The cache is opt-in, and only for the source test data, as a file restored with the
+        same size and timestamps would be served the checksum of its old content
+
+classes defined:
+    ChecksumEngine  - calculates the checksum of all the files of a folder tree
+
+Methods:
+
+    resolve_hash_name() - returns the hash algorithm for the hash name, resolving "fast"
+
+    file_checksum()     - returns the checksum of a single file
+
+"""
+
+import hashlib
+import json
+import mmap
+import multiprocessing
+import os
+import tempfile
+import time
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+DEFAULT_HASH = "md5"
+FAST_HASH = "fast"
+DEFAULT_READ_SIZE = 4 * 1024 * 1024
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "VSAChecksumCache")
+
+# files smaller than this are read, and not memory mapped
+MMAP_THRESHOLD = 16 * 1024 * 1024
+# fewer files than this are hashed in this process, as starting the pool costs more
+POOL_MIN_FILES = 16
+
+_CACHE_VERSION = 1
+
+
+def resolve_hash_name(hash_name):
+    """
+    returns the hash algorithm for the hash name
+
+    Args:
+            hash_name   (str)   - hashlib algorithm, xxhash algorithm like xxh64, or "fast"
+                                    for the fastest available hash
+
+    Return:
+            hash_name   (str)   - name of the hash algorithm
+
+    Exception:
+            if the hash algorithm is not available
+    """
+    hash_name = hash_name.lower()
+    if hash_name == FAST_HASH:
+        if xxhash is not None:
+            return "xxh64"
+        if "blake2b" in getattr(hashlib, "algorithms_available", ()):
+            return "blake2b"
+        return "md5"
+
+    _new_hash(hash_name)
+    return hash_name
+
+
+def _new_hash(hash_name):
+    """returns a new hash object of the hash algorithm"""
+    if hash_name.startswith("xxh"):
+        if xxhash is None:
+            raise ValueError("xxhash is not installed, for the hash {0}".format(hash_name))
+        return getattr(xxhash, hash_name)()
+
+    return hashlib.new(hash_name)
+
+
+def _is_remote(path):
+    """returns True if the path is a UNC path"""
+    return path.startswith("\\\\") or path.startswith("//")
+
+
+def file_checksum(path, hash_name=DEFAULT_HASH, read_size=DEFAULT_READ_SIZE, use_mmap=None):
+    """
+    returns the checksum of the file
+
+    Args:
+            path        (str)   - path of the file
+
+            hash_name   (str)   - name of the hash algorithm, resolved by resolve_hash_name()
+
+            read_size   (int)   - bytes read from the file at a time
+
+            use_mmap    (bool)  - memory map the large files, default is True for
+                                    local files, and False for UNC paths
+
+    Return:
+            checksum    (str)   - hex digest of the content of the file
+    """
+    if use_mmap is None:
+        use_mmap = not _is_remote(path)
+
+    hasher = _new_hash(hash_name)
+    with open(path, 'rb') as f_obj:
+        size = os.fstat(f_obj.fileno()).st_size
+
+        if use_mmap and size >= MMAP_THRESHOLD:
+            mapped = mmap.mmap(f_obj.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                for offset in range(0, size, read_size):
+                    hasher.update(mapped[offset:offset + read_size])
+            finally:
+                mapped.close()
+        else:
+            buf = bytearray(read_size)
+            view = memoryview(buf)
+            while True:
+                read = f_obj.readinto(buf)
+                if not read:
+                    break
+                hasher.update(view[:read])
+
+    return hasher.hexdigest()
+
+
+def _checksum_worker(args):
+    """
+    calculates the checksum of the file, in a process of the pool
+
+    Return:
+            (path, checksum, error)     - checksum is None, and error is set if the file
+                                            could not be read
+    """
+    path, hash_name, read_size, use_mmap = args
+    try:
+        return path, file_checksum(path, hash_name, read_size, use_mmap), None
+    except (IOError, OSError, ValueError) as err:
+        return path, None, str(err)
+
+
+def _stat_signature(stat):
+    """
+    returns the size, modification, change time and id of the file, to detect changes
+
+    change time is the creation time, and the id is 0 from os.scandir() on windows, so the
+    signature does not detect a file rewritten with the same size and timestamps
+    """
+    mtime = getattr(stat, "st_mtime_ns", None)
+    ctime = getattr(stat, "st_ctime_ns", None)
+    if mtime is None:
+        mtime = int(stat.st_mtime * 1000000000)
+        ctime = int(stat.st_ctime * 1000000000)
+
+    return [stat.st_size, mtime, ctime, stat.st_ino]
+
+
+def _walk(root):
+    """
+    yields the path, and the stat of each file of the folder tree, with the stat from the
+    directory listing where the platform provides it
+    """
+    scandir = getattr(os, "scandir", None)
+    if scandir is None:
+        for dirpath, _, filenames in os.walk(root):
+            for file_name in filenames:
+                path = os.path.join(dirpath, file_name)
+                yield path, os.stat(path)
+        return
+
+    folders = [root]
+    while folders:
+        for entry in scandir(folders.pop()):
+            if entry.is_dir(follow_symlinks=False):
+                folders.append(entry.path)
+            elif entry.is_file():
+                yield entry.path, entry.stat()
+
+
+class ChecksumEngine(object):
+    """
+    Calculates the checksum of all the files of a local, or UNC folder tree
+
+    Methods:
+            checksum_tree()     - returns the checksum of each file of the folder tree
+
+            clear_cache()       - deletes the cached checksums of the folder tree
+
+    Attributes:
+            stats   (dict)  - files walked, hashed and served from the cache, bytes hashed
+                                and the time taken, by the last checksum_tree()
+
+    """
+
+    def __init__(self, hash_name=DEFAULT_HASH, processes=1, read_size=DEFAULT_READ_SIZE,
+                 use_mmap=None, cache_dir=DEFAULT_CACHE_DIR, use_cache=False):
+        """
+        Args:
+                hash_name   (str)   - hashlib algorithm, xxhash algorithm, or "fast"
+                                        default: md5, same as md5sum on the unix machines
+
+                processes   (int)   - number of processes hashing the files, None for the
+                                        number of CPUs, only if the main module of the
+                                        caller is guarded by if __name__ == "__main__"
+                                        default: 1, the files are hashed in this process
+
+                read_size   (int)   - bytes read from a file at a time
+
+                use_mmap    (bool)  - memory map the large files,
+                                        default is True for local files, False for UNC paths
+
+                cache_dir   (str)   - folder of the cached checksums
+
+                use_cache   (bool)  - reuse the checksums of the files not changed since
+                                        they were last hashed, only for the trees which
+                                        are not restored to, like the source test data
+                                        default: False
+        """
+        self.hash_name = resolve_hash_name(hash_name)
+        if processes is None:
+            processes = multiprocessing.cpu_count()
+        self.processes = max(1, processes)
+        self.read_size = read_size
+        self.use_mmap = use_mmap
+        self.cache_dir = cache_dir
+        self.use_cache = use_cache
+        self.stats = {}
+
+    def _cache_path(self, root):
+        """returns the path of the cache file of the folder tree"""
+        key = u"{0}|{1}".format(os.path.normcase(os.path.abspath(root)), self.hash_name)
+        return os.path.join(self.cache_dir,
+                            hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+
+    def _load_cache(self, root):
+        """returns the cached {path: [size, mtime, ctime, id, checksum]} of the folder tree"""
+        try:
+            with open(self._cache_path(root), 'r') as f_obj:
+                cache = json.load(f_obj)
+        except (IOError, OSError, ValueError):
+            return {}
+
+        if cache.get("version") != _CACHE_VERSION or cache.get("hash") != self.hash_name:
+            return {}
+
+        return cache.get("files", {})
+
+    def _save_cache(self, root, files):
+        """writes the checksums of the folder tree to the cache file, replacing it at once"""
+        cache_path = self._cache_path(root)
+        if not os.path.isdir(self.cache_dir):
+            try:
+                os.makedirs(self.cache_dir)
+            except OSError:
+                if not os.path.isdir(self.cache_dir):
+                    raise
+
+        temp_path = "{0}.{1}.tmp".format(cache_path, os.getpid())
+        with open(temp_path, 'w') as f_obj:
+            json.dump({"version": _CACHE_VERSION, "root": root, "hash": self.hash_name,
+                       "files": files}, f_obj)
+
+        if hasattr(os, "replace"):
+            os.replace(temp_path, cache_path)
+        else:
+            if os.path.exists(cache_path):
+                os.remove(cache_path)
+            os.rename(temp_path, cache_path)
+
+    def clear_cache(self, root):
+        """
+        deletes the cached checksums of the folder tree
+
+        Args:
+                root    (str)   - path of the folder
+        """
+        cache_path = self._cache_path(root)
+        if os.path.exists(cache_path):
+            os.remove(cache_path)
+
+    def _hash_files(self, paths):
+        """
+        yields the path, checksum and error of each file, hashed on the pool of processes
+        if there are enough files
+        """
+        args = [(path, self.hash_name, self.read_size, self.use_mmap) for path in paths]
+
+        if self.processes == 1 or len(args) < POOL_MIN_FILES:
+            for arg in args:
+                yield _checksum_worker(arg)
+            return
+
+        pool = multiprocessing.Pool(min(self.processes, len(args)))
+        try:
+            for result in pool.imap_unordered(_checksum_worker, args):
+                yield result
+        finally:
+            pool.close()
+            pool.join()
+
+    def checksum_tree(self, root):
+        """
+        returns the checksum of each file of the folder tree
+
+        Args:
+                root    (str)   - path of the local, or UNC folder
+
+        Return:
+                checksums   (dict)  - checksum of each file like {file path: checksum},
+                                        where the file path is os.path.join() of the folder
+                                        of the file and its name, same as os.walk()
+
+        Exception:
+                if any of the files could not be read
+        """
+        start_time = time.time()
+        cached = self._load_cache(root) if self.use_cache else {}
+
+        signatures = {}
+        checksums = {}
+        to_hash = []
+        for path, stat in _walk(root):
+            signature = _stat_signature(stat)
+            signatures[path] = signature
+
+            entry = cached.get(path)
+            if entry is not None and entry[:-1] == signature:
+                checksums[path] = entry[-1]
+            else:
+                to_hash.append(path)
+
+        # largest files first, so a large file does not start last on the pool
+        to_hash.sort(key=lambda path: signatures[path][0], reverse=True)
+
+        errors = []
+        for path, checksum, error in self._hash_files(to_hash):
+            if error is not None:
+                errors.append("{0}: {1}".format(path, error))
+            else:
+                checksums[path] = checksum
+
+        if errors:
+            raise IOError("Failed to calculate the checksum of {0} files: {1}".format(
+                len(errors), "; ".join(errors)))
+
+        if self.use_cache and (to_hash or len(cached) != len(checksums)):
+            self._save_cache(root, dict(
+                (path, signatures[path] + [checksum]) for path, checksum in checksums.items()))
+
+        time_taken = time.time() - start_time
+        bytes_hashed = sum(signatures[path][0] for path in to_hash)
+        self.stats = {
+            "files": len(checksums),
+            "hashed": len(to_hash),
+            "cached": len(checksums) - len(to_hash),
+            "bytes_hashed": bytes_hashed,
+            "time_taken": round(time_taken, 3),
+            "throughput": round(bytes_hashed / (1024.0 ** 2) / time_taken, 2) if time_taken else 0
+        }
+
+        return checksums
@@ -0,0 +1,224 @@
+"""Main file for evaluating the dynamic VM content rules of a VSA subclient in bulk
+
+Dynamic content rules like [VM]=Starts with=test* or [OS]=Contains=Windows are compiled once
+into a single matcher per VM attribute, and evaluated against the attributes of all the VMs
+of the inventory in one pass, instead of one VM and one rule at a time.
+
+    #.  rules on the same attribute are combined into a single case insensitive regex union,
+        one for the include rules and one for the exclude (Does Not ...) rules
+
+    #.  the result of the matcher is cached per distinct attribute value, so attributes shared
+        by many VMs, like guest OS, host or datastore, are matched only once
+
+Matching semantics are the same as AutoVSASubclient._match_pattern_in_input()
+
+classes defined:
+    ContentRule     - a single parsed dynamic content rule
+
+    ContentRuleSet  - compiled set of rules, evaluated against a VM inventory
+
+Method:
+
+    compile_pattern()   - compiles the content pattern for the equality, to a regex to search
+
+"""
+
+import re
+from collections import namedtuple
+
+from . import VirtualServerConstants
+
+NEGATIVE_EQUALITIES = ("Does Not Equals", "Does Not Contains")
+
+
+def compile_pattern(equality, pattern):
+    """
+    Translates the content pattern for the equality to a regex, which when searched
+    matches the same VMs as AutoVSASubclient._match_pattern_in_input()
+
+    Args:
+            equality    (str)   - like Equals, Contains, Starts with, Ends with
+
+            pattern     (str)   - pattern like test*, test*1
+
+    returns:
+            regex       (str)   - regex to search in the attribute value, case insensitive
+
+    """
+    if equality in ("Equals", "Does Not Equals"):
+        return pattern
+
+    if equality in ("Contains", "Does Not Contains"):
+        pattern = ".*" + pattern + ".*"
+
+    elif equality == "Starts with":
+        pattern = pattern + ".*"
+
+    elif equality == "Ends with":
+        pattern = ".*" + pattern
+
+    open_ended = pattern[-1] in ('*', '+')
+
+    if pattern[0] != '.':
+        # re.match() of the pattern, anchored at the start
+        return r"\A(?:" + pattern + (")" if open_ended else "$)")
+
+    # re.search() of the pattern
+    return "(?:" + pattern + (")" if open_ended else "$)")
+
+
+class ContentRule(namedtuple('ContentRule', ('option', 'equality', 'pattern'))):
+    """
+    Single dynamic content rule like [VM]=Starts with=test*
+
+    Attributes:
+            option      (str)   - [VM], [HN], [OS], [DNS], [DS]
+
+            equality    (str)   - Equals, Does Not Equals, Contains, Starts with etc.
+
+            pattern     (str)   - pattern to match like test*
+
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_string(cls, content):
+        """
+        parse the rule from the content string [VM]=Starts with=test*
+
+        Args:
+                content (str)   - dynamic content string
+
+        returns:
+                rule    (obj)   - object of ContentRule
+
+        Exception:
+                if the content string is not in the correct format
+
+        """
+        values = content.split("=")
+        if len(values) != 3:
+            raise Exception("Input string id in not correct format")
+
+        return cls(*[value.strip() for value in values])
+
+    @property
+    def attribute(self):
+        """returns the VM attribute on which the rule is evaluated"""
+        return VirtualServerConstants.vm_pattern_names[self.option]
+
+    @property
+    def is_negative(self):
+        """returns True if the rule disqualifies the matching VMs"""
+        return self.equality in NEGATIVE_EQUALITIES
+
+    @property
+    def regex(self):
+        """returns the regex to search in the attribute value"""
+        return compile_pattern(self.equality, self.pattern)
+
+
+class _AttributeMatcher(object):
+    """
+    Matcher for all the include / exclude rules on a single VM attribute
+    """
+
+    def __init__(self, regexes):
+        """
+        Args:
+                regexes     (list)  - regex of each of the rules on the attribute
+        """
+        self._cache = {}
+
+        try:
+            self._matchers = [re.compile("|".join(regexes), flags=re.I)]
+        except re.error:
+            # patterns which can not be combined, are matched one by one
+            self._matchers = [re.compile(regex, flags=re.I) for regex in regexes]
+
+    def __call__(self, value):
+        """returns True if any of the rules match the value"""
+        try:
+            return self._cache[value]
+        except KeyError:
+            pass
+
+        matched = value is not None and any(
+            matcher.search(value) is not None for matcher in self._matchers)
+        self._cache[value] = matched
+        return matched
+
+
+class ContentRuleSet(object):
+    """
+    Compiled set of dynamic content rules, evaluated against all the VMs in one pass
+
+    Methods:
+            from_content()  - creates the rule set from the dynamic content strings
+
+            attributes      - the VM attributes needed to evaluate the rules
+
+            evaluate()      - returns the VMs qualified by the rules, from the inventory
+
+    """
+
+    def __init__(self, rules):
+        """
+        Args:
+                rules   (list)  - list of ContentRule objects
+        """
+        self.rules = list(rules)
+
+        include, exclude = {}, {}
+        for rule in self.rules:
+            rule_map = exclude if rule.is_negative else include
+            rule_map.setdefault(rule.attribute, []).append(rule.regex)
+
+        self._include = dict(
+            (attribute, _AttributeMatcher(regexes)) for attribute, regexes in include.items())
+        self._exclude = dict(
+            (attribute, _AttributeMatcher(regexes)) for attribute, regexes in exclude.items())
+
+    @classmethod
+    def from_content(cls, content_list):
+        """
+        creates the rule set from the dynamic content strings
+
+        Args:
+                content_list    (list)  - list of content like [VM]=Starts with=test*
+
+        returns:
+                rule_set        (obj)   - object of ContentRuleSet
+
+        """
+        return cls(ContentRule.from_string(content) for content in content_list)
+
+    @property
+    def attributes(self):
+        """returns the set of the VM attributes on which the rules are evaluated"""
+        return set(rule.attribute for rule in self.rules)
+
+    def evaluate(self, inventory):
+        """
+        evaluates all the rules against all the VMs of the inventory, in one pass
+
+        Args:
+                inventory   (dict)  - attributes of all the VMs like
+                                        {vm_name: {'vm_name': vm_name, 'GuestOS': 'Windows'}}
+
+        returns:
+                qualified_list  (list)  - VMs matching any include rule, and no exclude rule
+
+        """
+        qualified_list = []
+
+        for vm_name, vm_attributes in inventory.items():
+            if any(matcher(vm_attributes.get(attribute))
+                   for attribute, matcher in self._exclude.items()):
+                continue
+
+            if any(matcher(vm_attributes.get(attribute))
+                   for attribute, matcher in self._include.items()):
+                qualified_list.append(vm_name)
+
+        return qualified_list
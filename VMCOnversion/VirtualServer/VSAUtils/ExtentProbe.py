@@ -0,0 +1,218 @@
+"""Main file for reading the extent statistics of the live browse DB on a MediaAgent
+
+The Extentcount probe is built into an exe on the controller, and deployed to the MA once.
+
+    #.  the probe takes the DB path as an argument, so it is built once for all the DBs,
+        instead of rewriting the script with the DB path and building it for every check
+
+    #.  the deployed folder is named by the content hash of the probe, so it is reused across
+        the checks, the test runs, and is deployed again only when the probe changes
+
+    #.  extent count and LruExtents statistics are returned together in one call
+
+    #.  watch() polls on the MA itself, and returns as soon as the extents are pruned,
+        instead of the controller checking at fixed intervals
+
+classes defined:
+    ExtentProbe     - extent statistics of the live browse DB on a MA
+
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import socket
+import sys
+import threading
+
+from AutomationUtils import logger
+from AutomationUtils.machine import Machine
+from . import VirtualServerUtils
+
+PROBE_FILES = ("Extentcount.py", "setup.py")
+PROBE_EXE = "Extentcount.exe"
+
+# remote folder of the probe deployed on each MA, {(ma client name, content hash): folder}
+_DEPLOYED_PROBES = {}
+_DEPLOY_LOCK = threading.Lock()
+
+
+def probe_hash():
+    """
+    returns the content hash of the probe script and its build setup
+
+    Return:
+            hash    (str)   - sha256 hexdigest of the probe files
+    """
+    sha = hashlib.sha256()
+    for file_name in PROBE_FILES:
+        with open(os.path.join(VirtualServerUtils.UTILS_PATH, file_name), 'rb') as f_obj:
+            sha.update(f_obj.read())
+
+    return sha.hexdigest()
+
+
+class ExtentProbe(object):
+    """
+    Extent statistics of the live browse DB on a MediaAgent
+
+    Methods:
+            deploy()        - build and copy the probe to the MA, if not already there
+
+            get_stats()     - returns the extent count and LruExtents statistics of the DB
+
+            watch()         - polls the statistics on the MA until the extents are pruned
+
+    """
+
+    def __init__(self, commcell, ma_name, deploy_dir):
+        """
+        Args:
+                commcell    (obj)   - cvpysdk commcell object
+
+                ma_name     (str)   - client name of the MA
+
+                deploy_dir  (str)   - folder on the MA where the probe is deployed,
+                                        like the job results directory
+        """
+        self.log = logger.get_log()
+        self.commcell = commcell
+        self.ma_name = ma_name
+        self.deploy_dir = deploy_dir
+        self.ma_machine = Machine(ma_name, commcell)
+        self.ma_client = commcell.clients.get(ma_name)
+        self._probe_folder = None
+
+    def _build(self, folder_name):
+        """
+        builds the probe exe on the controller
+
+        Args:
+                folder_name     (str)   - name of the folder the exe is built into
+
+        Return:
+                build_path      (str)   - local path of the folder with the exe
+        """
+        utils_path = VirtualServerUtils.UTILS_PATH
+        build_path = os.path.join(utils_path, "build")
+        probe_path = os.path.join(utils_path, folder_name)
+
+        for _path in (build_path, probe_path):
+            if os.path.exists(_path):
+                shutil.rmtree(_path)
+
+        exe_command = "\"{0}\" \"{1}\" build".format(
+            sys.executable, os.path.join(utils_path, "setup.py"))
+        controller_machine = Machine(socket.getfqdn(), self.commcell)
+        output = controller_machine.execute_command(exe_command)
+
+        if not os.path.exists(build_path):
+            raise Exception("Failed to build the extent probe {0}".format(output))
+
+        os.rename(build_path, probe_path)
+        return probe_path
+
+    def deploy(self):
+        """
+        build and copy the probe to the MA, unless the probe with the same content hash
+        is already deployed
+
+        Return:
+                probe_folder    (str)   - folder of the probe exe on the MA
+        """
+        if self._probe_folder:
+            return self._probe_folder
+
+        content_hash = probe_hash()
+        folder_name = "ExtentProbe_{0}".format(content_hash[:12])
+        remote_folder = self.ma_machine.join_path(self.deploy_dir, folder_name)
+
+        with _DEPLOY_LOCK:
+            key = (self.ma_name.lower(), content_hash)
+            if key not in _DEPLOYED_PROBES:
+                if self.ma_machine.check_file_exists(
+                        self.ma_machine.join_path(remote_folder, PROBE_EXE)):
+                    self.log.info("Extent probe already deployed at {0}".format(remote_folder))
+                else:
+                    self.log.info("Deploying the extent probe to {0}".format(remote_folder))
+                    probe_path = self._build(folder_name)
+                    try:
+                        self.ma_client.upload_folder(probe_path, self.deploy_dir)
+                    finally:
+                        shutil.rmtree(probe_path, ignore_errors=True)
+
+                    if not self.ma_machine.check_directory_exists(remote_folder):
+                        raise Exception("Failed to copy the extent probe folder")
+
+                _DEPLOYED_PROBES[key] = remote_folder
+
+            self._probe_folder = _DEPLOYED_PROBES[key]
+
+        return self._probe_folder
+
+    def _run(self, db_file, *args):
+        """
+        runs the probe on the MA, and returns the samples printed by it
+
+        Args:
+                db_file     (str)   - path of the live browse DB on the MA
+
+                args        (str)   - arguments of the probe
+
+        Return:
+                samples     (list)  - statistics printed by the probe
+        """
+        exe_path = self.ma_machine.join_path(self.deploy(), PROBE_EXE)
+        cmd = "iex \"& '{0}' '{1}' {2}\"".format(exe_path, db_file, " ".join(args))
+        output = self.ma_machine.execute_command(cmd)
+
+        samples = []
+        for line in output.formatted_output.strip().splitlines():
+            line = line.strip()
+            if line.startswith("{"):
+                samples.append(json.loads(line))
+
+        if not samples:
+            raise Exception("Failed to get the extent statistics: {0}".format(output.output))
+
+        return samples
+
+    def get_stats(self, db_file):
+        """
+        returns the extent count and LruExtents statistics of the DB
+
+        Args:
+                db_file     (str)   - path of the live browse DB on the MA
+
+        Return:
+                stats       (dict)  - like {'exists': True, 'extents': 120, 'devices': 2}
+        """
+        return self._run(db_file)[-1]
+
+    def watch(self, db_file, interval=15, timeout=600, target=0, max_increases=4):
+        """
+        polls the statistics on the MA, and returns as soon as the extents are pruned
+        to the target, have increased more than max_increases times, or the timeout
+
+        Args:
+                db_file         (str)   - path of the live browse DB on the MA
+
+                interval        (int)   - seconds between the samples
+
+                timeout         (int)   - maximum seconds to wait
+
+                target          (int)   - extent count at which pruning is complete
+
+                max_increases   (int)   - number of times the extents may increase
+
+        Return:
+                samples     (list)  - statistics of each sample, status of the last sample
+                                        is pruned, increasing or timeout
+        """
+        samples = self._run(
+            db_file, "--watch", "--interval", str(interval), "--timeout", str(timeout),
+            "--target", str(target), "--max-increases", str(max_increases))
+        self.log.info("Extent statistics after {0} secs: {1}".format(
+            samples[-1].get("time"), samples[-1]))
+        return samples
@@ -1,23 +1,39 @@
 """
 File for calculating the extents on remote machine without python . This will be packaged into exe
 
+The exe is built once, and deployed to the MA by ExtentProbe. The path of the live browse DB
+is passed on the command line, so the same exe is used for all the DBs of the MA.
+
+    Extentcount.exe <db_file>                       - prints the extent statistics once
+
+    Extentcount.exe <db_file> --watch [options]     - polls the extent statistics, and exits
+                                                        as soon as the extents are pruned
+
+Each sample is printed as a line of json like
+{"exists": true, "extents": 120, "devices": 2, "time": 30.0}
+
 create_connection - Create connection with sqlite database
-get_extent_count - get the extent count from DB
+get_extent_stats - get the extent count and LruExtents statistics from DB
+watch_extents - poll the extent statistics until pruned, increasing, or timed out
 
 """
 
+import argparse
+import json
+import os
+import time
+
 try:
     import sqlite3
 except ImportError as error:
     raise Exception('Failed to import sqlite3\nError: "{0}"'.format(error.msg))
 
 
-def create_connection():
+def create_connection(db_file):
     """ create a database connection to the SQLite database
         specified by the db_file
     :return: Connection object or None
     """
-    db_file = "##Automation--db_path--##"
     try:
         conn = sqlite3.connect(db_file)
         return conn
@@ -27,19 +43,80 @@ def create_connection():
     return None
 
 
-def get_extent_count():
+def get_extent_stats(db_file):
+    """
+    Get the extent count, and the number of devices with extents from LruExtents
+    :param db_file: path of the live browse DB
+    :return: dict with the statistics, extents are 0 if the DB is removed
+    """
+    if not os.path.exists(db_file):
+        return {"exists": False, "extents": 0, "devices": 0}
+
+    conn = create_connection(db_file)
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT count(DeviceId), count(DISTINCT DeviceId) from LruExtents")
+        row = cur.fetchone()
+    finally:
+        conn.close()
+
+    return {"exists": True, "extents": row[0], "devices": row[1]}
+
+
+def watch_extents(db_file, interval, timeout, target, max_increases):
     """
-    Query all rows in the tasks table
-    :param conn: the Connection object
-    :return:
+    Poll the extent statistics, printing each sample, until the extents are pruned to the
+    target, have increased more than max_increases times, or the timeout
+    :return: None
     """
-    conn = create_connection()
-    cur = conn.cursor()
-    cur.execute("SELECT count(DeviceId) from LruExtents")
+    start_time = time.time()
+    previous = None
+    increases = 0
+
+    while True:
+        stats = get_extent_stats(db_file)
+        stats["time"] = round(time.time() - start_time, 1)
+
+        if previous is not None and stats["extents"] > previous:
+            increases += 1
+        stats["increases"] = increases
+
+        if stats["extents"] <= target:
+            stats["status"] = "pruned"
+        elif increases > max_increases:
+            stats["status"] = "increasing"
+        elif stats["time"] + interval > timeout:
+            stats["status"] = "timeout"
+        else:
+            stats["status"] = "waiting"
 
-    rows = cur.fetchall()
+        print(json.dumps(stats))
+        if stats["status"] != "waiting":
+            return
+
+        previous = stats["extents"]
+        time.sleep(interval)
+
+
+def main():
+    """
+    parse the arguments, and print the extent statistics
+    """
+    parser = argparse.ArgumentParser(description="extent statistics of the live browse DB")
+    parser.add_argument("db_file")
+    parser.add_argument("--watch", action="store_true")
+    parser.add_argument("--interval", type=float, default=15)
+    parser.add_argument("--timeout", type=float, default=600)
+    parser.add_argument("--target", type=int, default=0)
+    parser.add_argument("--max-increases", type=int, default=4)
+    args = parser.parse_args()
 
-    print(rows[0][0])
+    if args.watch:
+        watch_extents(args.db_file, args.interval, args.timeout, args.target,
+                      args.max_increases)
+    else:
+        print(json.dumps(get_extent_stats(args.db_file)))
 
 
-get_extent_count()
+if __name__ == "__main__":
+    main()
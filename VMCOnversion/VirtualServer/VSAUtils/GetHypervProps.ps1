@@ -26,30 +26,22 @@ $global:vm = $vms | where-object {$_.elementname -eq $global:vmName}
 
 }
 
-if($global:Property -eq "All")
+if($global:Property -eq "Bulk")
 {
-$var1 = NOOFDISKS
-$var2 = POWERSTATUS
-$var3,$var11 = Nic
-$var4 = Memory
-$var5 = cpunum
-$var7 = GUID
-$var8 = GUESTOS
-$var9 = IP
-$var12 = DiskPath
-$var13 = Version
-$var14 = GetVMFilesPath
-
-write-host "Diskcount="$var1";PowerState="$var2";NicName="$var3";Memory="$var4";NoofCPU="$var5";GUID="$var7";GuestOS="$var8";IP="$var9";NIC="$var11";DiskPath="$var12";Version="$var13";VMFilesPath="$var14
+#properties of all the VMs in one invocation, ExtraArgs is the property group, All or Basic
+foreach($eachVM in $global:vmName.Split(","))
+{
+$global:vmName = $eachVM.Trim()
+$global:vm = $vms | where-object {$_.elementname -eq $global:vmName}
+$props = GetProps $global:ExtraArgs
+write-host "VMName="$global:vmName";"$props
+}
 }
 
-elseif($global:Property -eq "Basic")
+elseif(($global:Property -eq "All") -or ($global:Property -eq "Basic"))
 {
-$var1 = GUID
-$var2 = POWERSTATUS
-$var3 = GUESTOS
-
-write-host "GUID="$var1";PowerState="$var2";GuestOS="$var3
+$props = GetProps $global:Property
+write-host $props
 }
 
 else
@@ -67,6 +59,32 @@ write-host $global:Property"="$var10
 }
 }
 
+function GetProps($prop)
+{
+if($prop -eq "All")
+{
+$var1 = NOOFDISKS
+$var2 = POWERSTATUS
+$var3,$var11 = Nic
+$var4 = Memory
+$var5 = cpunum
+$var7 = GUID
+$var8 = GUESTOS
+$var9 = IP
+$var12 = DiskPath
+$var13 = Version
+$var14 = GetVMFilesPath
+
+return "Diskcount=$var1;PowerState=$var2;NicName=$var3;Memory=$var4;NoofCPU=$var5;GUID=$var7;GuestOS=$var8;IP=$var9;NIC=$var11;DiskPath=$var12;Version=$var13;VMFilesPath=$var14"
+}
+
+$var1 = GUID
+$var2 = POWERSTATUS
+$var3 = GUESTOS
+
+return "GUID=$var1;PowerState=$var2;GuestOS=$var3"
+}
+
 function NOOFDISKS()
 {
 
@@ -18,7 +18,32 @@ $global:property= "##Automation--property--##"
 
 
 Connect-VIServer -Server $Server -User $user -Password $pwd -Protocol $protocol | Out-Null
-if($property -eq "All")
+if($property -eq "Bulk")
+{
+#properties of all the VMs in one connection, ExtraArgs is the property group, All or Basic
+foreach($eachVM in $global:vmName.Split(","))
+{
+$global:vmName = $eachVM.Trim()
+$props = GetProps $global:ExtraArgs
+write-host "VMName="$global:vmName";"$props
+}
+}
+elseif(($property -eq "All") -or ($property -eq "Basic"))
+{
+$props = GetProps $global:property
+write-host $props
+}
+else
+{
+$var10 = &$global:property 
+write-host $global:property "=" $var10
+}
+}
+
+
+Function GetProps($prop)
+{
+if($prop -eq "All")
 {
 $var1 = GUID
 $var2 = PowerState
@@ -37,21 +62,14 @@ $var14 = Tools
 $var15 = SnapExists
 $var16 = VMSpace
 
-write-host "GUID="$var1";PowerState="$var2";GuestOS="$var3";Memory="$var9";NoofCPU="$var5";Diskcount="$var6";IP="$var7";NIC="$var8";ESXHost="$var4";Datastore="$var10";ResourcePool="$var11";DataCenter="$var12";Hostname="$var13";ToolsStatus="$var14";snapExists="$var15";VMSpace="$var16 
+return "GUID=$var1;PowerState=$var2;GuestOS=$var3;Memory=$var9;NoofCPU=$var5;Diskcount=$var6;IP=$var7;NIC=$var8;ESXHost=$var4;Datastore=$var10;ResourcePool=$var11;DataCenter=$var12;Hostname=$var13;ToolsStatus=$var14;snapExists=$var15;VMSpace=$var16"
 }
-elseif($global:property -eq "Basic")
-{
+
 $var1 = GUID
 $var2 = POWERSTATE
 $var3 = GUESTOS
 
-write-host "GUID="$var1";PowerState="$var2";GuestOS="$var3
-}
-else
-{
-$var10 = &$global:property 
-write-host $global:property "=" $var10
-}
+return "GUID=$var1;PowerState=$var2;GuestOS=$var3"
 }
 
 
@@ -19,9 +19,12 @@ from abc import ABCMeta, abstractmethod
 from collections import OrderedDict
 from operator import itemgetter
 import hashlib
+import threading
 import requests
 from AutomationUtils import logger
 from . import VMHelper, VirtualServerConstants, VirtualServerUtils, VmwareServices, FusionComputeServices
+from .VMOperations import VMOperationExecutor
+from .HypervisorHttpClient import HypervisorHttpClient, create_session
 from AutomationUtils import machine
 from requests.packages.urllib3.exceptions import InsecureRequestWarning
 
@@ -36,6 +39,19 @@ class Hypervisor(object):
     Methods:
          get_all_vms_in_hypervisor()    - abstract -get all the VMs in HYper-V Host
 
+        get_vm_attributes()             - get the attributes of all the VMs, for evaluating
+                                                    the dynamic content rules
+
+        take_vm_snapshot()              - collect the properties of all the VMs in one
+                                                    invocation per host, for the VM objects
+
+        pop_vm_snapshot()               - returns the collected properties of the VM, once
+
+        get_vm_placement()              - returns the host and datastore of the VM
+
+        run_vm_operation()              - runs the operation on the VMs concurrently, limited
+                                                    per host and per datastore
+
         compute_free_resources()        - compute the hyperv host and destiantion path
                                                     for perfoming restores
 
@@ -85,10 +101,27 @@ class Hypervisor(object):
         self.password = password
         self.instance_type = instance_type
         self._VMs = {}
+        # properties collected in bulk, {(vm_name, prop): {property: value}}
+        self._vm_snapshot = {}
+        # concurrency limits of the VM operations can be set on the executor
+        self.vm_operation_executor = VMOperationExecutor()
         self.log = logger.get_log()
         self.utils_path = VirtualServerUtils.UTILS_PATH
-        self.machine = machine.Machine(
+        # Machine objects are not thread safe, each worker of the VM operations gets its own
+        self._worker = threading.local()
+        self._worker.machine = machine.Machine(
             self.host_machine, self.commcell)
+        # REST calls to the hypervisor share a pooled keep-alive session, which is not the
+        # session of the commcell, as its adapter retries the PUT and DELETE requests
+        self._session = create_session()
+
+    @property
+    def machine(self):
+        """gets the Machine object of the host machine for the calling thread. it is read only attribute"""
+        if not hasattr(self._worker, "machine"):
+            self._worker.machine = machine.Machine(self.host_machine, self.commcell)
+
+        return self._worker.machine
 
     @property
     def vm_user_name(self):
@@ -126,6 +159,13 @@ class Hypervisor(object):
 
         try:
             if isinstance(vm_list, list):
+                if len(vm_list) > 1:
+                    try:
+                        self.take_vm_snapshot(vm_list)
+                    except Exception as err:
+                        self.log.warning(
+                            "Bulk snapshot failed, collecting properties per VM %s" % err)
+
                 for each_vm in vm_list:
                     self._VMs[each_vm] = VMHelper.HypervisorVM(self, each_vm)
 
@@ -138,6 +178,169 @@ class Hypervisor(object):
                 "An exception occurred in creating object %s" % err)
             raise Exception(err)
 
+    def _get_vm_snapshot(self, vm_list, prop):
+        """
+        collect the properties of all the VMs, in one invocation per host
+
+        Base implementation does not support bulk collection, and the VM objects
+        collect their properties individually
+
+        Args:
+                vm_list     (list)  - list of VMs
+
+                prop        (str)   - Basic or All
+
+        Return:
+                snapshot    (dict)  - properties of each VM like {vm_name: {'GUID': '...'}}
+        """
+        return {}
+
+    @staticmethod
+    def _parse_vm_snapshot(output):
+        """
+        parse the output of the Bulk property of the props scripts
+
+        Args:
+                output      (str)   - lines like VMName=vm1;GUID=...;PowerState=...
+
+        Return:
+                snapshot    (dict)  - properties of each VM like {vm_name: {'GUID': '...'}}
+        """
+        snapshot = {}
+        for _each_line in output.splitlines():
+            _each_line = _each_line.strip()
+            if not _each_line.startswith("VMName="):
+                continue
+
+            _props = {}
+            for _each_prop in _each_line.split(';'):
+                if "=" not in _each_prop:
+                    continue
+                key, val = _each_prop.split("=")[:2]
+                val = val.strip()
+                _props[key.strip()] = val if val != "" else None
+
+            snapshot[_props.pop("VMName")] = _props
+
+        return snapshot
+
+    def take_vm_snapshot(self, vm_list, prop='Basic'):
+        """
+        collect the properties of all the VMs in one invocation per host, and keep them
+        for the VM objects, which then do not fetch the same properties individually
+
+        Args:
+                vm_list     (list)  - list of VMs
+
+                prop        (str)   - Basic or All
+
+        Return:
+                snapshot    (dict)  - properties of each VM like {vm_name: {'GUID': '...'}}
+        """
+        snapshot = self._get_vm_snapshot(list(vm_list), prop)
+        for each_vm, props in snapshot.items():
+            self._vm_snapshot[(each_vm, prop)] = props
+
+        if snapshot:
+            self.log.info("Collected %s properties of %d VMs in bulk" % (prop, len(snapshot)))
+
+        return snapshot
+
+    def pop_vm_snapshot(self, vm_name, prop):
+        """
+        returns the properties of the VM collected in bulk, and discards them, so the next
+        update of the VM fetches the current properties
+
+        Args:
+                vm_name     (str)   - name of the VM
+
+                prop        (str)   - Basic or All
+
+        Return:
+                props       (dict)  - properties of the VM, None if not collected
+        """
+        return self._vm_snapshot.pop((vm_name, prop), None)
+
+    def get_vm_placement(self, vm_name):
+        """
+        returns the host and datastore of the VM, on which the concurrent operations
+        of the VMs are limited
+
+        Base implementation does not know the placement, and the operations are
+        limited only by the number of workers
+
+        Args:
+                vm_name     (str)   - name of the VM
+
+        Return:
+                placement   (tuple) - host and datastore of the VM, None if not known
+        """
+        return None, None
+
+    def run_vm_operation(self, operation, vm_list=None, raise_error=True, **kwargs):
+        """
+        runs the operation on the VMs concurrently, with at most the configured number
+        of operations running at a time per host and per datastore
+
+        Args:
+                operation   (str/callable)  - name of the method of the VM object like
+                                                power_off, or function taking the VM name
+
+                vm_list     (list)          - list of VMs, default: all the VMs
+
+                raise_error (bool)          - raise an exception with the failures of all
+                                                the VMs, if the operation failed for any VM
+
+                kwargs                      - keyword arguments for the method of the VM object
+
+        Return:
+                results     (dict)  - VMOperationResult of each VM, with the value returned,
+                                        the exception raised and the time taken
+
+        Exception:
+                VMOperationError, if the operation failed for any VM
+
+        """
+        if vm_list is None:
+            vm_list = list(self.VMs.keys())
+
+        if callable(operation):
+            _operation = operation
+            _operation_name = getattr(operation, "__name__", "VM operation")
+        else:
+            def _operation(vm_name):
+                return getattr(self.VMs[vm_name], operation)(**kwargs)
+            _operation_name = operation
+
+        return self.vm_operation_executor.run(
+            _operation, vm_list, placement=self.get_vm_placement,
+            operation_name=_operation_name, raise_error=raise_error)
+
+    def get_vm_attributes(self, vm_list, attributes):
+        """
+        get the attributes of all the VMs, for evaluating the dynamic content rules
+
+        Base implementation reads the attributes from the VM objects, creating the missing
+        VM objects, so the VM properties are still fetched for each VM not already known
+
+        Args:
+                vm_list     (list)  - list of VMs for which the attributes are needed
+
+                attributes  (set)   - VM attributes like GuestOS, Datastore
+
+        Return:
+                vm_attributes   (dict)  - attributes of each VM like
+                                            {vm_name: {'GuestOS': 'Windows'}}
+        """
+        _missing_vms = [each_vm for each_vm in vm_list if each_vm not in self._VMs]
+        if _missing_vms:
+            self.VMs = _missing_vms
+
+        return dict(
+            (each_vm, dict((attribute, getattr(self._VMs[each_vm], attribute, None))
+                           for attribute in attributes))
+            for each_vm in vm_list)
+
     @abstractmethod
     def get_all_vms_in_hypervisor(self, server=""):
         """
@@ -204,6 +407,16 @@ class HyperVHelper(Hypervisor):
 
             _get_required_diskspace_for_restore()- Sum of disk space of the VM to be restored
 
+            _get_vm_host_map()              - get the Hyper-V host of all the VMs, with one
+                                                    GetAllVM per host
+
+            get_vm_host()                   - returns the Hyper-V host of the VM, if known
+
+            _get_vm_snapshot()              - collect the properties of all the VMs, with one
+                                                    invocation per Hyper-V host
+
+            get_vm_placement()              - returns the Hyper-V host of the VM
+
     """
 
     def __init__(self, server_host_name,
@@ -233,6 +446,114 @@ class HyperVHelper(Hypervisor):
             "extra_args": "$null",
             "vhd_name": "$null"
         }
+        # Hyper-V host of each VM, {vm_name: host client name}
+        self._vm_host_map = {}
+
+    def _get_vm_host_map(self):
+        """
+        get the Hyper-V host of all the VMs, running GetAllVM once per host
+
+        Return:
+                vm_host_map     (dict)  - Hyper-V host client of each VM like {vm1: host1}
+        """
+        try:
+            if not isinstance(self.server_list, list):
+                server_list = [self.server_list]
+            else:
+                server_list = self.server_list
+
+            _ps_path = os.path.join(self.utils_path, self.operation_ps_file)
+            _vm_host_map = {}
+            for _each_server in server_list:
+                client = self.commcell.clients.get(_each_server)
+                _prop_dict = dict(self.prop_dict)
+                _prop_dict["server_name"] = client.client_hostname
+                _prop_dict["property"] = "GetAllVM"
+                output = self.machine._execute_script(_ps_path, _prop_dict)
+                _stdout = output.output.rsplit("=", 1)[1].strip()
+                for each_vm in _stdout.split(","):
+                    each_vm = each_vm.strip()
+                    if each_vm != "" and each_vm not in _vm_host_map:
+                        _vm_host_map[each_vm] = _each_server
+
+            self._vm_host_map = _vm_host_map
+            return _vm_host_map
+
+        except Exception as err:
+            self.log.exception(
+                "An exception occurred while getting the hosts of all Vms from Hypervisor")
+            raise Exception(err)
+
+    def get_vm_host(self, vm_name):
+        """
+        returns the Hyper-V host client of the VM, found by the last bulk snapshot
+
+        Args:
+                vm_name     (str)   - name of the VM
+
+        Return:
+                host        (str)   - Hyper-V host client name, None if not known
+        """
+        return self._vm_host_map.get(vm_name)
+
+    def get_vm_placement(self, vm_name):
+        """
+        returns the Hyper-V host of the VM, the operations are not limited per volume
+
+        Args:
+                vm_name     (str)   - name of the VM
+
+        Return:
+                placement   (tuple) - Hyper-V host of the VM and None
+        """
+        _vm_host = self.get_vm_host(vm_name)
+        if not _vm_host and vm_name in self.VMs:
+            _vm_host = getattr(self.VMs[vm_name], "server_client_name", None)
+            if not isinstance(_vm_host, str):
+                _vm_host = None
+
+        return _vm_host, None
+
+    def _get_vm_snapshot(self, vm_list, prop):
+        """
+        collect the properties of all the VMs, with one invocation of the props script
+        per Hyper-V host
+
+        Args:
+                vm_list     (list)  - list of VMs
+
+                prop        (str)   - Basic or All
+
+        Return:
+                snapshot    (dict)  - properties of each VM like {vm_name: {'GUID': '...'}}
+        """
+        try:
+            _vm_host_map = self._get_vm_host_map()
+            _default_host = self.server_list[0] if isinstance(
+                self.server_list, list) else self.server_list
+
+            _host_vms = OrderedDict()
+            for each_vm in vm_list:
+                _host_vms.setdefault(_vm_host_map.get(each_vm, _default_host), []).append(each_vm)
+
+            _ps_path = os.path.join(self.utils_path, self.operation_ps_file)
+            snapshot = {}
+            for _host, _vms in _host_vms.items():
+                client = self.commcell.clients.get(_host)
+                _host_machine = machine.Machine(_host, self.commcell)
+                _prop_dict = dict(self.prop_dict)
+                _prop_dict["server_name"] = client.client_hostname
+                _prop_dict["vm_name"] = ",".join(_vms)
+                _prop_dict["property"] = "Bulk"
+                _prop_dict["extra_args"] = prop
+                output = _host_machine._execute_script(_ps_path, _prop_dict)
+                snapshot.update(self._parse_vm_snapshot(output.output))
+
+            return snapshot
+
+        except Exception as err:
+            self.log.exception("An exception occurred while collecting the VM properties")
+            raise Exception(err)
 
     def get_all_vms_in_hypervisor(self, server=""):
         """
@@ -778,6 +1099,11 @@ class VmwareHelper(Hypervisor):
 
             copy_test_data_to_each_volume   - Copy test data to backup vm
 
+            _get_vm_snapshot                - Collect properties of all the vms in one
+                                                invocation for the vcenter
+
+            get_vm_placement                - ESX host and datastore of the vm
+
     """
 
     def __init__(self, server_host_name, host_machine, user_name,
@@ -797,6 +1123,9 @@ class VmwareHelper(Hypervisor):
             'Content-type': 'application/json',
             'vmware-api-session-id': None}
         self._services = VmwareServices.get_services(self.server_host_name)
+        # REST calls to the vcenter, refreshing the session id on 401
+        self.http_client = HypervisorHttpClient(
+            self._session, self._headers, 'vmware-api-session-id', self._vmware_login)
         self.prop_dict = {
             "server_name": self.server_host_name,
             "user": self.user_name,
@@ -824,8 +1153,8 @@ class VmwareHelper(Hypervisor):
         """
         try:
             login_request = (self.user_name, self.password)
-            response = self._make_request(
-                'POST', self._services['LOGIN'], login_request)
+            response = self.http_client.request(
+                'POST', self._services['LOGIN'], login_request, authenticate=False)
             if response[1].status_code != 200:
                 raise Exception
             else:
@@ -834,7 +1163,7 @@ class VmwareHelper(Hypervisor):
             self.log.exception("An exception occurred while logging in to the vcenter")
             raise Exception(err)
 
-    def _make_request(self, method, url, payload=None, attempts=0):
+    def _make_request(self, method, url, payload=None):
         """Makes the request of the type specified in the argument 'method'
 
         Args:
@@ -845,9 +1174,6 @@ class VmwareHelper(Hypervisor):
             payload   (dict / str)  --  data to be passed along with the request
                 default: None
 
-            attempts  (int)         --  number of attempts made with the same request
-                default: 0
-
         Returns:
             tuple:
                 (True, response) - in case of success
@@ -858,37 +1184,51 @@ class VmwareHelper(Hypervisor):
             Vmware SDK Exception:
                 if the method passed is incorrect/not supported
 
-            requests Connection Error   --  requests.exceptions.ConnectionError
+                if the login did not succeed after 3 attempts
 
+                if the vcenter is not reachable after the retries
+
+        """
+        return self.http_client.request(method, url, payload)
+
+    def _get_vm_snapshot(self, vm_list, prop):
+        """
+        collect the properties of all the VMs, with one invocation of the props script,
+        and a single connection to the vcenter
+
+        Args:
+                vm_list     (list)  - list of VMs
+
+                prop        (str)   - Basic or All
+
+        Return:
+                snapshot    (dict)  - properties of each VM like {vm_name: {'GUID': '...'}}
         """
         try:
-            headers = self._headers
-
-            if method == 'POST':
-                response = requests.post(url, headers=headers, verify=True, auth=payload)
-            elif method == 'GET':
-                response = requests.get(url, headers=headers, verify=True)
-            elif method == 'PUT':
-                response = requests.put(url, headers=headers, verify=True, json=payload)
-            elif method == 'DELETE':
-                response = requests.delete(url, headers=headers, verify=True)
-            else:
-                raise Exception('HTTP method {} not supported'.format(method))
+            _ps_path = os.path.join(self.utils_path, self.operation_ps_file)
+            _prop_dict = dict(self.prop_dict)
+            _prop_dict["vm_name"] = ",".join(vm_list)
+            _prop_dict["property"] = "Bulk"
+            _prop_dict["extra_args"] = prop
+            output = self.machine._execute_script(_ps_path, _prop_dict)
+            return self._parse_vm_snapshot(output.output)
 
-            if response.status_code == 401 and headers['vmware-api-session-id'] is not None:
-                if attempts < 3:
-                    self._headers['vmware-api-session-id'] = self._vmware_login()
-                    return self._make_request(method, url, attempts + 1)
-                else:
-                    # Raise max attempts exception, if attempts exceeds 3
-                    raise Exception('Error', '103')
+        except Exception as err:
+            self.log.exception("An exception occurred while collecting the VM properties")
+            raise Exception(err)
 
-            elif response.status_code == 200:
-                return (True, response)
-            else:
-                return (False, response)
-        except requests.exceptions.ConnectionError as con_err:
-            raise Exception(con_err)
+    def get_vm_placement(self, vm_name):
+        """
+        returns the ESX host and datastore of the VM
+
+        Args:
+                vm_name     (str)   - name of the VM
+
+        Return:
+                placement   (tuple) - ESX host and datastore of the VM, None if not known
+        """
+        _vm = self.VMs.get(vm_name)
+        return getattr(_vm, "ESXHost", None), getattr(_vm, "Datastore", None)
 
     def _vmware_get_vms(self):
         """
@@ -1757,6 +2097,9 @@ class FusionComputeHelper(Hypervisor):
             'Accept-Language': 'en_US',
             'X-Auth-Token': None
             }
+        # REST calls to the VRM, refreshing the token on 401
+        self.http_client = HypervisorHttpClient(
+            self._session, self._headers, 'X-Auth-Token', self._compute_login)
 
         self.version = self.get_version()
 
@@ -1800,7 +2143,8 @@ class FusionComputeHelper(Hypervisor):
             self._headers['X-Auth-Key'] = hash_object.hexdigest()
             self._headers['X-Auth-AuthType'] = '0'
             self._headers['X-Auth-UserType'] = '0'
-            flag, response = self._make_request('POST', self._services['LOGIN'])
+            flag, response = self.http_client.request(
+                'POST', self._services['LOGIN'], authenticate=False)
             if flag:
                 self._headers['X-Auth-Token'] = response.headers['x-auth-token']
                 self._headers.pop('X-Auth-User', None)
@@ -1812,7 +2156,7 @@ class FusionComputeHelper(Hypervisor):
             self.log.exception("An exception occurred while logging in to the VRM")
             raise Exception(err)
 
-    def _make_request(self, method, url, payload=None, attempts=0):
+    def _make_request(self, method, url, payload=None):
         """Makes the request of the type specified in the argument 'method'
 
         Args:
@@ -1823,9 +2167,6 @@ class FusionComputeHelper(Hypervisor):
             payload   (dict / str)  --  data to be passed along with the request
                 default: None
 
-            attempts  (int)         --  number of attempts made with the same request
-                default: 0
-
         Returns:
             tuple:
                 (True, response) - in case of success
@@ -1836,40 +2177,12 @@ class FusionComputeHelper(Hypervisor):
             Fusion Compute SDK Exception:
                 if the method passed is incorrect/not supported
 
-            requests Connection Error   --  requests.exceptions.ConnectionError
-
-        """
-        try:
-            headers = self._headers
-
-            if method == 'POST':
-                response = requests.post(url, headers=headers, 
-                                         verify=True, auth=payload)
-            elif method == 'GET':
-                response = requests.get(url, headers=headers, verify=True)
-            elif method == 'PUT':
-                response = requests.put(url, headers=headers, 
-                                        verify=True, json=payload)
-            elif method == 'DELETE':
-                response = requests.delete(url, headers=headers, verify=True)
-            else:
-                raise Exception('HTTP method {} not supported'.format(method))
-
-            if response.status_code == 401 and headers['X-Auth-Token'] is not None:
-                if attempts < 3:
-                    self._compute_login()
-                    return self._make_request(method, url, attempts + 1)
-                else:
-                    # Raise max attempts exception, if attempts exceeds 3
-                    raise Exception('Error', '103')
+                if the login did not succeed after 3 attempts
 
-            elif response.status_code == 200:
-                return True, response
-            else:
-                return False, response
+                if the VRM is not reachable after the retries
 
-        except requests.exceptions.ConnectionError as con_err:
-            raise Exception(con_err)
+        """
+        return self.http_client.request(method, url, payload)
 
     def _get_site_url(self):
         """
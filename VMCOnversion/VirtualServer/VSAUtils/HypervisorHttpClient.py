@@ -0,0 +1,322 @@
+"""Main file for the REST calls to the hypervisors, shared by the hypervisor helpers
+
+HypervisorHttpClient is the transport of the VmwareHelper and FusionComputeHelper REST calls
+
+    #.  requests are sent over a pooled keep-alive session of the hypervisor helper, so the
+        connections to the hypervisor are reused across the calls. The session is not the
+        session of the commcell, whose adapter also retries the read errors and the retry
+        status codes, for PUT and DELETE as well
+
+    #.  on 401 the session token is refreshed once, even when many threads get the 401
+        together, and the same request is sent again, with its payload
+
+    #.  idempotent requests (GET, HEAD) are retried on the retry status codes, with
+        exponential backoff. POST, PUT and DELETE are not sent again, as a power on, create
+        or delete which reached the hypervisor would run twice. Connections which failed
+        before the request was sent are retried by the Retry of the session adapter, which
+        retries nothing else, so the requests are retried in one place only
+
+    #.  latency of the requests is recorded in a histogram per endpoint
+
+classes defined:
+    LatencyHistogram        - latency histogram of the requests to an endpoint
+
+    HypervisorHttpClient    - makes the REST calls to the hypervisor
+
+Methods:
+
+    create_session()        - returns the pooled session for the REST calls to the hypervisor
+
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.util.retry import Retry
+
+try:
+    from urllib.parse import urlparse
+except ImportError:
+    from urlparse import urlparse
+
+from AutomationUtils import logger
+
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_POOL_SIZE = 20
+DEFAULT_BACKOFF_FACTOR = 0.5
+DEFAULT_RETRY_STATUSES = (502, 503, 504)
+IDEMPOTENT_METHODS = ('GET', 'HEAD')
+MAX_AUTH_ATTEMPTS = 3
+
+LATENCY_BUCKETS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+"""tuple:   upper bounds of the latency histogram buckets, in milliseconds."""
+
+
+def create_session(pool_size=DEFAULT_POOL_SIZE, max_retries=DEFAULT_MAX_RETRIES):
+    """
+    returns the pooled keep-alive session for the REST calls to the hypervisor, whose
+    adapter retries only the connections which failed before the request was sent
+
+    Args:
+            pool_size       (int)   - number of connections to keep alive, per host
+
+            max_retries     (int)   - number of times a failed connection is retried
+
+    Return:
+            session         (obj)   - requests session
+    """
+    # read errors and the retry status codes are not retried by the adapter, the
+    # idempotent requests are retried by HypervisorHttpClient.request()
+    retry = Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=0,
+        status=0,
+        raise_on_status=False
+    )
+
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['Connection'] = 'keep-alive'
+
+    return session
+
+
+class LatencyHistogram(object):
+    """
+    Latency histogram of the requests to an endpoint
+
+    Methods:
+            record()    - records the latency of a request
+
+            as_dict()   - returns the count, average, min, max and buckets of the histogram
+
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        """
+        Args:
+                buckets     (tuple) - upper bounds of the buckets, in milliseconds
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def record(self, latency):
+        """
+        records the latency of a request
+
+        Args:
+                latency     (float) - latency of the request, in milliseconds
+        """
+        index = 0
+        while index < len(self.buckets) and latency > self.buckets[index]:
+            index += 1
+
+        self.counts[index] += 1
+        self.count += 1
+        self.total += latency
+        self.min = latency if self.min is None else min(self.min, latency)
+        self.max = latency if self.max is None else max(self.max, latency)
+
+    def as_dict(self):
+        """
+        returns the histogram as a dict
+
+        Return:
+                histogram   (dict)  - like {'count': 10, 'avg': 12.5, 'min': 8.1, 'max': 30.2,
+                                            'buckets': {'<=10': 4, '<=25': 5, '<=50': 1}}
+        """
+        labels = ["<={0}".format(bound) for bound in self.buckets]
+        labels.append(">{0}".format(self.buckets[-1]))
+
+        return {
+            'count': self.count,
+            'avg': round(self.total / self.count, 2) if self.count else 0,
+            'min': self.min,
+            'max': self.max,
+            'buckets': OrderedDict(
+                (label, count) for label, count in zip(labels, self.counts) if count)
+        }
+
+
+class HypervisorHttpClient(object):
+    """
+    Makes the REST calls to the hypervisor, over the pooled session
+
+    Methods:
+            request()           - makes the request, retrying and refreshing the token
+
+            reset_stats()       - clears the latency histograms
+
+    Attributes:
+            latency_stats       - latency histogram of each endpoint
+
+    """
+
+    def __init__(self, session, headers, token_header, login,
+                 max_retries=DEFAULT_MAX_RETRIES,
+                 backoff_factor=DEFAULT_BACKOFF_FACTOR,
+                 retry_statuses=DEFAULT_RETRY_STATUSES):
+        """
+        Args:
+                session         (obj)       - pooled requests session, from create_session()
+
+                headers         (dict)      - headers of the hypervisor helper, sent with
+                                                each request, including the token
+
+                token_header    (str)       - name of the header with the session token
+
+                login           (callable)  - logs in to the hypervisor, and sets the new
+                                                token in the headers
+
+                max_retries     (int)       - number of times an idempotent request is
+                                                    retried on the retry status codes
+
+                backoff_factor  (float)     - retry i waits backoff_factor * 2 ** (i - 1) secs
+
+                retry_statuses  (tuple)     - status codes on which an idempotent request
+                                                    is retried
+        """
+        self.log = logger.get_log()
+        self._session = session
+        self._headers = headers
+        self._token_header = token_header
+        self._login = login
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.retry_statuses = tuple(retry_statuses)
+
+        self._token_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._latency = {}
+
+    @property
+    def latency_stats(self):
+        """returns the latency histogram of each endpoint like {'GET /rest/vcenter/vm': {}}"""
+        with self._stats_lock:
+            return dict(
+                (endpoint, histogram.as_dict()) for endpoint, histogram in self._latency.items())
+
+    def reset_stats(self):
+        """clears the latency histograms of all the endpoints"""
+        with self._stats_lock:
+            self._latency.clear()
+
+    @staticmethod
+    def _endpoint(method, url):
+        """returns the endpoint of the url, with the path segments having digits as {id}"""
+        path = re.sub(r"/[^/]*\d[^/]*(?=/|$)", "/{id}", urlparse(url).path)
+        return "{0} {1}".format(method, path)
+
+    def _record(self, method, url, start_time):
+        """records the latency of the request in the histogram of the endpoint"""
+        latency = (time.time() - start_time) * 1000
+        endpoint = self._endpoint(method, url)
+
+        with self._stats_lock:
+            if endpoint not in self._latency:
+                self._latency[endpoint] = LatencyHistogram()
+            self._latency[endpoint].record(latency)
+
+    def _refresh_token(self, stale_token):
+        """
+        logs in again, unless another thread has already refreshed the stale token
+
+        Args:
+                stale_token     (str)   - token with which the request got 401
+        """
+        with self._token_lock:
+            if self._headers.get(self._token_header) != stale_token:
+                return
+
+            self.log.info("Session token expired, logging in to the hypervisor again")
+            self._login()
+
+    def _send(self, method, url, headers, payload):
+        """sends the request, once"""
+        if method == 'POST':
+            return self._session.post(url, headers=headers, verify=True, auth=payload)
+        elif method == 'GET':
+            return self._session.get(url, headers=headers, verify=True)
+        elif method == 'PUT':
+            return self._session.put(url, headers=headers, verify=True, json=payload)
+        elif method == 'DELETE':
+            return self._session.delete(url, headers=headers, verify=True)
+
+        raise Exception('HTTP method {} not supported'.format(method))
+
+    def request(self, method, url, payload=None, authenticate=True):
+        """
+        Makes the request of the type specified in the argument 'method'
+
+        Args:
+                method          (str)           - http operation to perform, e.g.; GET, POST,
+                                                    PUT, DELETE
+
+                url             (str)           - the web url or service to run the request on
+
+                payload         (dict / tuple)  - auth of the POST, json of the PUT request
+
+                authenticate    (bool)          - refresh the token and send the request
+                                                    again on 401, False for the login request
+
+        Return:
+                tuple:
+                    (True, response) - in case of success
+
+                    (False, response) - in case of failure
+
+        Exception:
+                if the method passed is not supported
+
+                if the token refresh did not succeed after the maximum attempts
+
+                if the hypervisor is not reachable, or did not respond
+
+        """
+        auth_attempts = 0
+        retries = 0
+
+        while True:
+            headers = dict(self._headers)
+            token = headers.get(self._token_header)
+            start_time = time.time()
+
+            try:
+                # connections which failed before the request was sent are retried by the
+                # session adapter, a timeout is not retried, as the request may have run
+                response = self._send(method, url, headers, payload)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as err:
+                raise Exception(err)
+
+            self._record(method, url, start_time)
+
+            if response.status_code == 401 and authenticate and token is not None:
+                if auth_attempts >= MAX_AUTH_ATTEMPTS:
+                    # Raise max attempts exception, if attempts exceeds 3
+                    raise Exception('Error', '103')
+
+                auth_attempts += 1
+                self._refresh_token(token)
+                continue
+
+            if (method in IDEMPOTENT_METHODS and response.status_code in self.retry_statuses
+                    and retries < self.max_retries):
+                retries += 1
+                self.log.warning("Request {0} {1} returned {2}, retry {3}".format(
+                    method, url, response.status_code, retries))
+                time.sleep(self.backoff_factor * 2 ** (retries - 1))
+                continue
+
+            return response.status_code == 200, response
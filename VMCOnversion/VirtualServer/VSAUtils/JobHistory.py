@@ -0,0 +1,210 @@
+"""Main file for the backup job history of a VSA subclient
+
+JobHistory keeps the unaged backup jobs of the subclient, and their aux copy jobs, indexed by
+the full cycle, the backup level and the job id
+
+    #.  the history is built in one pass over the rows of JMBkpStats and JMJobDataStats
+
+    #.  refresh() fetches only the rows of the backup jobs completed since the last backup
+        job seen, or of the aux copy jobs since the last aux copy job seen, so a long running
+        cycle is not scanned again on every check. refresh(full=True) fetches all the unaged
+        jobs, to drop the jobs aged since the last refresh
+
+    #.  backup jobs are tracked by their completion time, not their job id, as a job with a
+        lower id may complete after a job with a higher id
+
+classes defined:
+    BackupJobRecord - backup job of the subclient, with its aux copy jobs
+
+    JobHistory      - indexed history of the backup jobs of the subclient
+
+"""
+
+from collections import OrderedDict
+
+from AutomationUtils import logger
+
+
+class BackupJobRecord(object):
+    """
+    Backup job of the subclient, with its aux copy jobs
+
+    Attributes:
+            job_id      (str)   - backup job id
+
+            level       (str)   - backup level like 1 (full), 2 (incremental), 64 (synth full)
+
+            cycle       (str)   - full cycle number of the job
+
+            aux_jobs    (set)   - aux copy job ids of the backup job
+
+    """
+    __slots__ = ('job_id', 'level', 'cycle', 'aux_jobs')
+
+    def __init__(self, job_id, level, cycle):
+        self.job_id = job_id
+        self.level = level
+        self.cycle = cycle
+        self.aux_jobs = set()
+
+    def __repr__(self):
+        return "BackupJobRecord(job_id={0}, level={1}, cycle={2}, aux_jobs={3})".format(
+            self.job_id, self.level, self.cycle, sorted(self.aux_jobs))
+
+    @property
+    def aux_job_list(self):
+        """returns the aux copy jobs as a list, ['0'] if the job has no aux copy job"""
+        aux_jobs = sorted(self.aux_jobs - {'0'}, key=int)
+        return aux_jobs or ['0']
+
+
+class JobHistory(object):
+    """
+    Indexed history of the backup jobs of a subclient
+
+    Methods:
+            refresh()       - fetches the backup and aux copy jobs completed since the last
+                                seen, or all the unaged jobs if full
+
+            cycles()        - returns the full cycles of the history
+
+            levels()        - returns the backup levels in the cycle
+
+            jobs()          - returns the jobs of the cycle and / or level
+
+            get()           - returns the record of the job
+
+            aux_jobs()      - returns the aux copy jobs of the job
+
+            as_dict()       - returns the history as {cycle: {level: {job: [aux jobs]}}}
+
+    """
+
+    _QUERY = "select distinct BS.jobID, BS.bkpLevel, BS.fullCycleNum, DS.auxCopyJobId, " \
+             "BS.servEndDate " \
+             "from JMBkpStats as BS join JMJobDataStats as DS ON BS.jobId = DS.jobId " \
+             "where BS.agedTime = 0 and BS.appId = ? and " \
+             "(BS.servEndDate >= ? or DS.auxCopyJobId >= ?)"
+
+    def __init__(self, csdb_access, subclient_id):
+        """
+        Args:
+                csdb_access     (obj)   - CSDBAccess object of the commcell
+
+                subclient_id    (str)   - id of the subclient
+        """
+        self.log = logger.get_log()
+        self.csdb_access = csdb_access
+        self.subclient_id = subclient_id
+
+        self._jobs = {}
+        # {cycle: {level: [job ids]}}
+        self._index = OrderedDict()
+        # backup jobs are tracked by the completion time, and aux copy jobs by the job id,
+        # both are fetched again from the last seen, as more jobs may complete in the same
+        # second, and the last aux copy job may still be copying the rows of other jobs
+        self._last_end_time = 0
+        self._last_aux_job_id = 0
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def __contains__(self, job_id):
+        return str(job_id) in self._jobs
+
+    def _add_row(self, job_id, level, cycle, aux_job, end_time):
+        """adds the row of the query to the history"""
+        record = self._jobs.get(job_id)
+        if record is None:
+            record = BackupJobRecord(job_id, level, cycle)
+            self._jobs[job_id] = record
+            self._index.setdefault(cycle, OrderedDict()).setdefault(level, []).append(job_id)
+
+        if aux_job:
+            record.aux_jobs.add(aux_job)
+        self._last_end_time = max(self._last_end_time, int(end_time or 0))
+        self._last_aux_job_id = max(self._last_aux_job_id, int(aux_job or 0))
+
+    def refresh(self, full=False):
+        """
+        fetches the backup jobs completed since the last backup job seen, and the aux copy
+        jobs since the last aux copy job seen
+
+        Args:
+                full    (bool)  - discard the history and fetch all the unaged jobs,
+                                    to drop the jobs aged since the last refresh
+
+        Return:
+                rows    (int)   - number of rows fetched
+        """
+        if full:
+            self._jobs.clear()
+            self._index.clear()
+            self._last_end_time = 0
+            self._last_aux_job_id = 0
+
+        # rows without an aux copy job have the id 0, fetched by the completion time only
+        _results = self.csdb_access.fetch_all(
+            self._QUERY,
+            (int(self.subclient_id), self._last_end_time, self._last_aux_job_id or 1),
+            use_cache=False)
+
+        for result in _results:
+            self._add_row(result[0].strip(), result[1].strip(), result[2].strip(),
+                          result[3].strip(), result[4].strip())
+
+        self.log.info("Fetched {0} job history rows for subclient {1}, {2} jobs".format(
+            len(_results), self.subclient_id, len(self._jobs)))
+        return len(_results)
+
+    def cycles(self):
+        """returns the full cycles of the history"""
+        return list(self._index.keys())
+
+    def levels(self, cycle):
+        """returns the backup levels of the jobs in the full cycle"""
+        return list(self._index.get(str(cycle), {}).keys())
+
+    def jobs(self, cycle=None, level=None):
+        """
+        returns the jobs of the full cycle and / or backup level
+
+        Args:
+                cycle   (str)   - full cycle number, all the cycles if None
+
+                level   (str)   - backup level like 1, 2, 64, all the levels if None
+
+        Return:
+                jobs    (list)  - BackupJobRecord of the jobs
+        """
+        if cycle is None:
+            cycles = self._index.values()
+        else:
+            cycles = [self._index.get(str(cycle), {})]
+
+        return [self._jobs[job_id]
+                for levels in cycles
+                for job_level, job_ids in levels.items()
+                if level is None or job_level == str(level)
+                for job_id in job_ids]
+
+    def get(self, job_id):
+        """returns the BackupJobRecord of the job, None if not in the history"""
+        return self._jobs.get(str(job_id))
+
+    def aux_jobs(self, job_id):
+        """returns the aux copy jobs of the job, ['0'] if the job has no aux copy job"""
+        return self._jobs[str(job_id)].aux_job_list
+
+    def as_dict(self):
+        """
+        returns the history as a dict
+
+        Return:
+                job_history     (dict)  - like {'cycle': {'level': {'job_id': ['aux1', 'aux2']}}}
+        """
+        return dict(
+            (cycle, dict(
+                (level, dict((job_id, self._jobs[job_id].aux_job_list) for job_id in job_ids))
+                for level, job_ids in levels.items()))
+            for cycle, levels in self._index.items())
@@ -3,6 +3,7 @@ import os,sys,win32file,re,subprocess,win32com,win32wnet,time,shutil
 from win32com.client import GetObject
 import time, hashlib 
 from abc import ABCMeta, abstractmethod
+from ChecksumEngine import ChecksumEngine
 
 class OsHelper(object):
 	__metaclass__ = ABCMeta
@@ -199,7 +200,14 @@ class WindowsOShelper(OsHelper):
 			self.log.exception("An error occurred while copying tewstdata to volume")
 			return False
 	
-	def CalculateChecksum(self,ChecksumPath,FolderName = None):
+	def CalculateChecksum(self,ChecksumPath,FolderName = None,HashName = "md5",UseCache = False):
+		"""
+		Calculates the checksum of each file of the folder, with the ChecksumEngine
+
+		HashName - hashlib algorithm, or "fast" for the fastest available hash
+		UseCache - reuse the checksums of the files not changed since they were last hashed,
+		           only for the source test data, and never for the restored data
+		"""
 		try:
 			Checksumdict = {}
 			
@@ -210,22 +218,13 @@ class WindowsOShelper(OsHelper):
 					ChecksumPath = FolderResPath
 				
 			self.log.info("Going to check checksum for %s"%ChecksumPath)
-			for dirpath, dirnames, filenames in os.walk(ChecksumPath):
-					for eachfile in filenames:
-							filepath = os.path.join(dirpath,eachfile)
-							f = open(filepath,'rb')
-							m = hashlib.md5()
-							while True:
-									data = f.read(10240)
-									if len(data) == 0:
-											break
-									m.update(data)
-							f.close()
-							file_chksum =  m.hexdigest()
-							filekey = filepath.split(ChecksumPath)[1]
-							filekey = filekey.replace("\\","/")
-							Checksumdict[filekey] = file_chksum
-							
+			Engine = ChecksumEngine(hash_name=HashName,use_cache=UseCache)
+			for filepath, file_chksum in Engine.checksum_tree(ChecksumPath).items():
+					filekey = filepath.split(ChecksumPath)[1]
+					filekey = filekey.replace("\\","/")
+					Checksumdict[filekey] = file_chksum
+			
+			self.log.info("Checksum stats for %s are %s"%(ChecksumPath,Engine.stats))
 			self.log.info("Source chekcsum is %s"%Checksumdict)
 			return Checksumdict
 		
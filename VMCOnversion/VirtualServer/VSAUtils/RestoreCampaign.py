@@ -0,0 +1,615 @@
+"""Main file for running a campaign of restores of VSA subclients concurrently
+
+Full VM, disk and guest file restores of many backup jobs are submitted as soon as their proxy
+and destination have a free slot, instead of submitting a restore, waiting for it, and
+validating it before the next one
+
+    #.  the number of restores running at a time is limited per proxy and per destination,
+        and the slot is held till the restore is validated, so a restore does not overwrite
+        the VMs or files of another restore to the same destination before they are validated
+
+    #.  all the restore jobs are waited on by a single JobTracker, which gets the status of
+        all the running jobs with one request per poll
+
+    #.  each restore is validated as soon as its job finishes, on a bounded pool of workers,
+        while the other restores are still running
+
+    #.  failures of the restores do not stop the campaign, and are reported together
+        once all the restores are processed
+
+    #.  report() gives the time taken by the jobs and the validations of each kind of
+        restore, and the time saved over running them one after another
+
+    >>> campaign = RestoreCampaign(commcell)
+    >>> for job_id in jobs_to_restore:
+    ...     vm_restore_options = OptionsHelper.FullVMRestoreOptions(auto_subclient, testcase)
+    ...     vm_restore_options.restore_backup_job = job_id
+    ...     campaign.add_full_vm_restore(auto_subclient, vm_restore_options)
+    >>> campaign.run()
+    >>> campaign.report()['speedup']
+
+classes defined:
+    RestoreTask             - restore to be run by the campaign
+
+    RestoreResult           - result of a single restore of the campaign
+
+    RestoreCampaignError    - exception with the failures of all the restores
+
+    RestoreCampaign         - runs the restores concurrently, and validates them as they finish
+
+"""
+
+import functools
+import threading
+import time
+from collections import namedtuple, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from AutomationUtils import logger
+
+DEFAULT_PROXY_LIMIT = 2
+DEFAULT_DESTINATION_LIMIT = 1
+DEFAULT_MAX_VALIDATIONS = 4
+
+FULL_VM_RESTORE = "Full VM restore"
+DISK_RESTORE = "Disk restore"
+GUEST_FILE_RESTORE = "Guest file restore"
+
+
+class RestoreTask(namedtuple('RestoreTask',
+                             ('name', 'kind', 'submit', 'validate', 'proxy', 'destination'))):
+    """
+    Restore to be run by the campaign
+
+    Attributes:
+            name        (str)       - unique name of the restore
+
+            kind        (str)       - kind of the restore, like Full VM restore
+
+            submit      (callable)  - function submitting the restore, and returning its Job
+
+            validate    (callable)  - function validating the restore, called with the Job
+                                        once it completes, None to skip the validation
+
+            proxy       (str)       - proxy running the restore, not limited if None
+
+            destination (str)       - destination host / client of the restore,
+                                        not limited if None
+
+    """
+    __slots__ = ()
+
+
+class RestoreResult(namedtuple('RestoreResult',
+                               ('name', 'kind', 'job_id', 'status', 'error', 'queue_time',
+                                'job_time', 'validation_time'))):
+    """
+    Result of a single restore of the campaign
+
+    Attributes:
+            name            (str)   - name of the restore
+
+            kind            (str)   - kind of the restore
+
+            job_id          (str)   - id of the restore job, None if the submit failed
+
+            status          (str)   - final status of the restore job
+
+            error           (obj)   - exception raised by the submit, the job or the validation,
+                                        None if succeeded
+
+            queue_time      (float) - seconds the restore waited for a slot of its proxy
+                                        and destination, from the start of the campaign
+
+            job_time        (float) - seconds from the submit till the job finished
+
+            validation_time (float) - seconds taken by the validation
+
+    """
+    __slots__ = ()
+
+    @property
+    def succeeded(self):
+        """returns True if the restore job and its validation succeeded"""
+        return self.error is None
+
+    @property
+    def time_taken(self):
+        """returns the seconds taken by the restore job and its validation"""
+        return self.job_time + self.validation_time
+
+
+class RestoreCampaignError(Exception):
+    """
+    Exception raised when one or more restores of the campaign failed
+
+    Attributes:
+            failures    (dict)  - RestoreResult of each failed restore like {name: result}
+
+            results     (dict)  - RestoreResult of all the restores
+
+    """
+
+    def __init__(self, results):
+        self.results = results
+        self.failures = OrderedDict(
+            (name, result) for name, result in results.items() if not result.succeeded)
+
+        super(RestoreCampaignError, self).__init__(
+            "{0} of {1} restores failed: {2}".format(
+                len(self.failures), len(results),
+                "; ".join("{0} - {1}".format(name, result.error)
+                          for name, result in self.failures.items())))
+
+
+class RestoreCampaign(object):
+    """
+    Runs many restores of VSA subclients concurrently, limiting the number of restores running
+    at a time per proxy and per destination, and validates each restore as its job finishes
+
+    Methods:
+            add()                       - adds a restore with its own submit and validate
+                                            functions
+
+            add_full_vm_restore()       - adds a Full VM restore of the subclient
+
+            add_disk_restore()          - adds disk restores of the VMs of the subclient
+
+            add_guest_file_restore()    - adds guest file restores of the drives of the VMs
+                                            of the subclient
+
+            run()                       - runs all the restores, and returns their results
+
+            report()                    - returns the aggregate timing report of the run
+
+    """
+
+    def __init__(self, commcell, proxy_limit=DEFAULT_PROXY_LIMIT,
+                 destination_limit=DEFAULT_DESTINATION_LIMIT,
+                 max_validations=DEFAULT_MAX_VALIDATIONS, job_timeout=30, min_interval=15,
+                 max_interval=60):
+        """
+        Args:
+                commcell            (obj)   - Commcell object of SDK
+
+                proxy_limit         (int)   - number of restores of the same proxy running
+                                                at a time, no limit if None
+
+                destination_limit   (int)   - number of restores to the same destination
+                                                running at a time, no limit if None
+
+                max_validations     (int)   - number of restores validated at a time
+
+                job_timeout         (int)   - minutes after which a job is killed, if it is
+                                                in Pending / Waiting state
+
+                min_interval        (int)   - minimum seconds between the polls of the jobs
+
+                max_interval        (int)   - maximum seconds between the polls of the jobs
+        """
+        self.log = logger.get_log()
+        self.commcell = commcell
+        self.proxy_limit = proxy_limit
+        self.destination_limit = destination_limit
+        self.max_validations = max_validations
+        self.job_timeout = job_timeout
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+
+        self._tasks = OrderedDict()
+        self._results = OrderedDict()
+        self._running = {}
+        self._condition = threading.Condition()
+        self._time_taken = None
+
+    def __repr__(self):
+        return "RestoreCampaign of {0} restores, {1} finished".format(
+            len(self._tasks), len(self._results))
+
+    def add(self, name, kind, submit, validate=None, proxy=None, destination=None):
+        """
+        adds a restore to the campaign
+
+        Args:
+                name        (str)       - unique name of the restore
+
+                kind        (str)       - kind of the restore, for the report
+
+                submit      (callable)  - function taking no arguments, submitting the
+                                            restore, and returning its Job
+
+                validate    (callable)  - function taking the Job, validating the restore
+                                            once the job completes
+
+                proxy       (str)       - proxy running the restore
+
+                destination (str)       - destination host / client of the restore
+
+        Return:
+                task    (obj)   - RestoreTask of the restore
+
+        Exception:
+                if a restore with the same name is already added
+
+        """
+        if name in self._tasks:
+            raise Exception("Restore {0} is already added to the campaign".format(name))
+
+        task = RestoreTask(name, kind, submit, validate, proxy, destination)
+        self._tasks[name] = task
+        return task
+
+    def add_full_vm_restore(self, auto_subclient, vm_restore_options, name=None,
+                            proxy=None, destination=None):
+        """
+        adds a Full VM restore of the subclient
+
+        Args:
+                auto_subclient      (obj)   - AutoVSASubclient object
+
+                vm_restore_options  (obj)   - FullVMRestoreOptions of the restore, a separate
+                                                object for each restore, as the submit updates
+                                                its destination path
+
+                name                (str)   - name of the restore
+                                                default: restore backup job and subclient
+
+                proxy               (str)   - proxy running the restore
+                                                default: destination client of the options
+
+                destination         (str)   - destination of the restore
+                                                default: the destination hypervisor client,
+                                                the source client for in place restores
+
+        Return:
+                task    (obj)   - RestoreTask of the restore
+
+        """
+        if name is None:
+            name = "{0} of {1} from job {2}".format(
+                FULL_VM_RESTORE, auto_subclient.subclient_name,
+                vm_restore_options.restore_backup_job or "latest")
+
+        if destination is None:
+            # out of place restores create the VMs as Delete<vm> in the destination client,
+            # whichever ESX host they are restored to
+            if vm_restore_options.in_place_overwrite:
+                destination = auto_subclient.auto_vsaclient.vsa_client_name
+            else:
+                destination = vm_restore_options._destination_pseudo_client
+
+        return self.add(
+            name, FULL_VM_RESTORE,
+            functools.partial(auto_subclient.submit_virtual_machine_restore, vm_restore_options),
+            lambda job: auto_subclient.validate_virtual_machine_restore(vm_restore_options),
+            proxy or vm_restore_options._dest_client_name, destination)
+
+    def add_disk_restore(self, auto_subclient, disk_restore_options, vm_list=None):
+        """
+        adds a disk restore of each VM of the subclient
+
+        Args:
+                auto_subclient          (obj)   - AutoVSASubclient object
+
+                disk_restore_options    (obj)   - DiskRestoreOptions of the restores
+
+                vm_list                 (list)  - VMs to restore, all the VMs of the subclient
+                                                    if None
+
+        Return:
+                tasks   (list)  - RestoreTask of each VM
+
+        """
+        tasks = []
+        for vm in vm_list or auto_subclient.vm_list:
+            tasks.append(self.add(
+                "{0} of {1}".format(DISK_RESTORE, vm), DISK_RESTORE,
+                functools.partial(auto_subclient.submit_disk_restore, disk_restore_options, vm),
+                functools.partial(self._validate_vm, auto_subclient.validate_disk_restore,
+                                  disk_restore_options, vm),
+                disk_restore_options._dest_client_name,
+                disk_restore_options._destination_pseudo_client))
+
+        return tasks
+
+    def add_guest_file_restore(self, auto_subclient, fs_restore_options, vm_list=None):
+        """
+        adds a guest file restore of the test data of each drive of the VMs of the subclient
+
+        Live browse restores are validated by the test data only, as the block level
+        validation counts the disks mounted on the browse MA, which is not possible while
+        other restores use the MA
+
+        Args:
+                auto_subclient      (obj)   - AutoVSASubclient object
+
+                fs_restore_options  (obj)   - FileLevelRestoreOptions of the restores
+
+                vm_list             (list)  - VMs to restore, all the VMs of the subclient
+                                                if None
+
+        Return:
+                tasks   (list)  - RestoreTask of each drive of the VMs
+
+        """
+        proxy = fs_restore_options.fbr_ma or getattr(
+            fs_restore_options, "_browse_ma_client_name", None)
+
+        tasks = []
+        for vm in vm_list or auto_subclient.vm_list:
+            for drive in auto_subclient.hvobj.VMs[vm].drive_list:
+                tasks.append(self.add(
+                    "{0} of {1} {2}".format(GUEST_FILE_RESTORE, vm, drive), GUEST_FILE_RESTORE,
+                    functools.partial(auto_subclient.submit_guest_file_restore,
+                                      fs_restore_options, vm, drive),
+                    functools.partial(self._validate_vm,
+                                      auto_subclient.validate_guest_file_restore,
+                                      fs_restore_options, vm, drive),
+                    proxy, fs_restore_options.destination_client))
+
+        return tasks
+
+    @staticmethod
+    def _validate_vm(validation, *args):
+        """
+        calls the validation of the VM with the arguments, ignoring the Job passed last
+        by the campaign
+
+        """
+        return validation(*args[:-1])
+
+    def _slots(self, task):
+        """
+        returns the keys and limits of the slots needed by the restore
+
+        Args:
+                task    (obj)   - RestoreTask of the restore
+
+        """
+        slots = [(("proxy", task.proxy), self.proxy_limit),
+                 (("destination", task.destination), self.destination_limit)]
+        return [key for key, limit in slots if key[1] is not None and limit]
+
+    def _next_task(self, pending):
+        """
+        returns the first pending restore whose proxy and destination have a free slot,
+        None if all of them have to wait
+
+        Args:
+                pending     (list)  - pending RestoreTasks, in the order they were added
+
+        """
+        for task in pending:
+            if all(self._running.get(key, 0) <
+                   (self.proxy_limit if key[0] == "proxy" else self.destination_limit)
+                   for key in self._slots(task)):
+                return task
+
+        return None
+
+    def _finish(self, task, result):
+        """
+        records the result of the restore, and frees the slots of its proxy and destination
+
+        Args:
+                task    (obj)   - RestoreTask of the restore
+
+                result  (obj)   - RestoreResult of the restore
+
+        """
+        if result.succeeded:
+            self.log.info("{0} completed with job {1}, job took {2:.2f} seconds, "
+                          "validation took {3:.2f} seconds".format(
+                              task.name, result.job_id, result.job_time, result.validation_time))
+        else:
+            self.log.error("{0} failed with job {1}: {2}".format(
+                task.name, result.job_id, result.error))
+
+        with self._condition:
+            for key in self._slots(task):
+                self._running[key] -= 1
+
+            self._results[task.name] = result
+            self._condition.notify_all()
+
+    def _complete(self, task, job, queue_time, submit_time, job_future):
+        """
+        validates the restore once its job finished, and records the result
+
+        Args:
+                task        (obj)   - RestoreTask of the restore
+
+                job         (obj)   - Job of the restore
+
+                queue_time  (float) - seconds the restore waited for a slot
+
+                submit_time (float) - time the restore job was submitted
+
+                job_future  (obj)   - future of the job, resolved with its final status
+
+        """
+        status = None
+        error = None
+        validation_time = 0.0
+
+        try:
+            status = job_future.result()
+            if "failed" in status or "killed" in status:
+                error = Exception("Restore job {0} {1} with error: {2}".format(
+                    job.job_id, status, job.delay_reason))
+        except Exception as err:
+            error = err
+
+        job_time = time.time() - submit_time
+
+        if error is None and task.validate is not None:
+            validation_start = time.time()
+            try:
+                task.validate(job)
+            except Exception as err:
+                error = err
+
+            validation_time = time.time() - validation_start
+
+        self._finish(task, RestoreResult(task.name, task.kind, job.job_id, status, error,
+                                         queue_time, job_time, validation_time))
+
+    def run(self, raise_error=True):
+        """
+        runs all the restores added to the campaign, and validates each of them as its job
+        finishes
+
+        Args:
+                raise_error     (bool)  - raise RestoreCampaignError if any restore failed
+
+        Return:
+                results     (dict)  - RestoreResult of each restore like {name: result},
+                                        in the order the restores were added
+
+        Exception:
+                RestoreCampaignError, if any restore failed and raise_error is set
+
+        """
+        pending = list(self._tasks.values())
+        self._results = OrderedDict()
+        self._running = {}
+        start_time = time.time()
+
+        self.log.info("Running {0} restores, with {1} restores per proxy and {2} per "
+                      "destination".format(len(pending), self.proxy_limit,
+                                           self.destination_limit))
+
+        tracker = self.commcell.job_controller.track_jobs(
+            timeout=self.job_timeout, min_interval=self.min_interval,
+            max_interval=self.max_interval)
+        validator = ThreadPoolExecutor(max_workers=max(1, self.max_validations))
+
+        try:
+            while True:
+                with self._condition:
+                    task = self._next_task(pending)
+                    while task is None and len(self._results) < len(self._tasks):
+                        self._condition.wait()
+                        task = self._next_task(pending)
+
+                    if task is None:
+                        break
+
+                    pending.remove(task)
+                    for key in self._slots(task):
+                        self._running[key] = self._running.get(key, 0) + 1
+
+                queue_time = time.time() - start_time
+                submit_time = time.time()
+
+                try:
+                    job = task.submit()
+                    job_future = tracker.add(job)
+                except Exception as err:
+                    self._finish(task, RestoreResult(task.name, task.kind, None, None, err,
+                                                     queue_time, 0.0, 0.0))
+                    continue
+
+                self.log.info("Submitted {0} with job {1}".format(task.name, job.job_id))
+
+                # validation runs on the pool, and not on the poller of the jobs
+                job_future.add_done_callback(functools.partial(
+                    self._on_job_done, validator, task, job, queue_time, submit_time))
+
+        finally:
+            tracker.close(wait=False)
+            validator.shutdown(wait=True)
+
+        self._time_taken = time.time() - start_time
+        results = OrderedDict((name, self._results[name]) for name in self._tasks)
+        self._results = results
+
+        report = self.report()
+        self.log.info("Ran {0} restores in {1:.2f} seconds, {2:.2f} seconds one after another, "
+                      "{3} failed".format(report['restores'], report['time_taken'],
+                                          report['serial_time'], len(report['failed'])))
+
+        if raise_error and report['failed']:
+            raise RestoreCampaignError(results)
+
+        return results
+
+    def _on_job_done(self, validator, task, job, queue_time, submit_time, job_future):
+        """
+        submits the validation of the restore to the pool, once its job finishes
+
+        """
+        validator.submit(self._complete, task, job, queue_time, submit_time, job_future)
+
+    def report(self):
+        """
+        returns the aggregate timing report of the last run
+
+        Return:
+                report  (dict)  - timing report of the campaign
+
+                    {
+                        'restores': 24,
+
+                        'succeeded': 23,
+
+                        'failed': ['Disk restore of vm1'],
+
+                        'time_taken': 5400.2,
+
+                        'serial_time': 31220.7,
+
+                        'speedup': 5.78,
+
+                        'slowest': ('Full VM restore of sc1 from job 1234', 3120.4),
+
+                        'kinds': {
+                            'Full VM restore': {
+                                'restores': 8,
+
+                                'failed': 0,
+
+                                'job_time': 14200.1,
+
+                                'validation_time': 5100.3,
+
+                                'average_time': 2412.6
+                            }
+                        }
+                    }
+
+                    where, time_taken is the wall clock time of the run, and serial_time is
+                    the sum of the time taken by the jobs and validations of all the restores
+
+        """
+        results = list(self._results.values())
+        serial_time = sum(result.time_taken for result in results)
+        time_taken = self._time_taken or 0.0
+
+        kinds = OrderedDict()
+        for result in results:
+            kind = kinds.setdefault(result.kind, {
+                'restores': 0, 'failed': 0, 'job_time': 0.0, 'validation_time': 0.0})
+            kind['restores'] += 1
+            kind['failed'] += 0 if result.succeeded else 1
+            kind['job_time'] += result.job_time
+            kind['validation_time'] += result.validation_time
+
+        for kind in kinds.values():
+            kind['average_time'] = round(
+                (kind['job_time'] + kind['validation_time']) / kind['restores'], 3)
+            kind['job_time'] = round(kind['job_time'], 3)
+            kind['validation_time'] = round(kind['validation_time'], 3)
+
+        slowest = max(results, key=lambda result: result.time_taken) if results else None
+
+        return {
+            'restores': len(results),
+            'succeeded': sum(1 for result in results if result.succeeded),
+            'failed': [result.name for result in results if not result.succeeded],
+            'time_taken': round(time_taken, 3),
+            'serial_time': round(serial_time, 3),
+            'speedup': round(serial_time / time_taken, 2) if time_taken else 0,
+            'slowest': (slowest.name, round(slowest.time_taken, 3)) if slowest else None,
+            'kinds': kinds
+        }
@@ -0,0 +1,314 @@
+"""Main file for validating the test data restored from the guest files of the VMs
+
+TestdataValidator compares the source and the restored test data by the content hash of
+each file, instead of comparing the full metadata listing of each side one after the other
+
+    #.  the files of the source and the destination are hashed on their machines at the
+        same time, and only the manifest of (relative path, hash) is returned
+
+    #.  the sorted manifests are compared in a single merge pass, and the files missing,
+        extra, or with different content are reported together. Paths are compared case
+        insensitive if either machine is windows, with the same rule for both manifests
+
+    #.  manifest of the source can be cached when the test data is backed up, so each
+        restore validation only hashes the destination
+
+classes defined:
+    ManifestDiff        - files missing, extra, or with different content at the destination
+
+    TestdataValidator   - hashes and compares the source and the destination test data
+
+Methods:
+
+    build_local_manifest()  - manifest of the folder on the controller
+
+    diff_manifests()        - compares the sorted manifests of the source and destination
+
+"""
+
+import os
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from AutomationUtils import logger
+from .ChecksumEngine import ChecksumEngine
+
+# manifest of the source test data, {(machine name, path): manifest}
+_SOURCE_MANIFESTS = {}
+_MANIFEST_LOCK = threading.Lock()
+
+_WINDOWS_HASH_COMMAND = (
+    "$root = (Resolve-Path -LiteralPath '{0}').ProviderPath.TrimEnd('\\'); "
+    "Get-ChildItem -LiteralPath $root -Recurse -Force | "
+    "Where-Object {{ -not $_.PSIsContainer }} | ForEach-Object {{ "
+    "'{{0}}|{{1}}' -f (Get-FileHash -LiteralPath $_.FullName -Algorithm MD5).Hash, "
+    "$_.FullName.Substring($root.Length + 1) }}"
+)
+
+_UNIX_HASH_COMMAND = "cd '{0}' && find . -type f -exec md5sum {{}} +"
+
+
+class ManifestDiff(namedtuple('ManifestDiff', ('missing', 'extra', 'mismatched'))):
+    """
+    Files missing, extra, or with different content at the destination
+
+    Attributes:
+            missing     (list)  - files of the source not at the destination
+
+            extra       (list)  - files of the destination not at the source
+
+            mismatched  (list)  - files with different content at the destination
+
+    """
+    __slots__ = ()
+
+    def __bool__(self):
+        return bool(self.missing or self.extra or self.mismatched)
+
+    __nonzero__ = __bool__
+
+
+def _normalize_path(relative_path):
+    """returns the relative path with / separators"""
+    relative_path = relative_path.strip().replace("\\", "/")
+    if relative_path.startswith("./"):
+        relative_path = relative_path[2:]
+    return relative_path
+
+
+def _is_case_sensitive(machine):
+    """returns True if the paths of the machine, None for the controller, are case sensitive"""
+    if machine is None:
+        return os.name != "nt"
+    return "windows" not in str(machine.os_info).lower()
+
+
+def build_local_manifest(path, use_cache=False):
+    """
+    manifest of the folder on the controller
+
+    Args:
+            path            (str)   - folder on the controller
+
+            use_cache       (bool)  - reuse the checksums of the files not changed since
+                                        they were last hashed, only for the source test data
+
+    Return:
+            manifest        (list)  - sorted (relative path, md5 hash) of each file
+    """
+    checksums = ChecksumEngine(hash_name="md5", use_cache=use_cache).checksum_tree(path)
+    manifest = [(_normalize_path(os.path.relpath(file_path, path)), checksum)
+                for file_path, checksum in checksums.items()]
+
+    manifest.sort()
+    return manifest
+
+
+def diff_manifests(source_manifest, dest_manifest, case_sensitive=True):
+    """
+    compares the sorted manifests of the source and the destination in a single pass
+
+    Args:
+            source_manifest     (list)  - sorted (relative path, hash) of the source
+
+            dest_manifest       (list)  - sorted (relative path, hash) of the destination
+
+            case_sensitive      (bool)  - compare the paths of both manifests case sensitive
+
+    Return:
+            diff                (obj)   - ManifestDiff of the destination
+    """
+    if not case_sensitive:
+        source_manifest = sorted((path.lower(), file_hash) for path, file_hash in source_manifest)
+        dest_manifest = sorted((path.lower(), file_hash) for path, file_hash in dest_manifest)
+
+    missing, extra, mismatched = [], [], []
+    source_index, dest_index = 0, 0
+
+    while source_index < len(source_manifest) and dest_index < len(dest_manifest):
+        source_path, source_hash = source_manifest[source_index]
+        dest_path, dest_hash = dest_manifest[dest_index]
+
+        if source_path == dest_path:
+            if source_hash != dest_hash:
+                mismatched.append(source_path)
+            source_index += 1
+            dest_index += 1
+        elif source_path < dest_path:
+            missing.append(source_path)
+            source_index += 1
+        else:
+            extra.append(dest_path)
+            dest_index += 1
+
+    missing.extend(path for path, _ in source_manifest[source_index:])
+    extra.extend(path for path, _ in dest_manifest[dest_index:])
+
+    return ManifestDiff(missing, extra, mismatched)
+
+
+class TestdataValidator(object):
+    """
+    Hashes and compares the source and the destination test data
+
+    Methods:
+            build_manifest()        - manifest of the folder on the machine
+
+            cache_source_manifest() - hashes and caches the manifest of the source
+
+            get_source_manifest()   - returns the cached manifest of the source
+
+            validate()              - compares the source and destination test data
+
+    """
+
+    def __init__(self, max_workers=2):
+        """
+        Args:
+                max_workers     (int)   - number of machines hashed at the same time
+        """
+        self.log = logger.get_log()
+        self.max_workers = max_workers
+
+    @staticmethod
+    def _cache_key(machine, path):
+        """returns the key of the manifest in the source cache"""
+        machine_name = machine.machine_name if machine is not None else "localhost"
+        return machine_name.lower(), path.rstrip("\\/").lower()
+
+    def build_manifest(self, machine, path, use_cache=False):
+        """
+        manifest of the folder, hashed on the machine
+
+        Args:
+                machine     (obj)   - Machine class object, None for the controller
+
+                path        (str)   - folder on the machine
+
+                use_cache   (bool)  - reuse the checksums of the files of the controller not
+                                        changed since they were last hashed, only for the
+                                        source test data, never for the restored data
+
+        Return:
+                manifest    (list)  - sorted (relative path, md5 hash) of each file
+
+        Exception:
+                if hashing the files fails on the machine
+        """
+        if machine is None:
+            return build_local_manifest(path, use_cache=use_cache)
+
+        is_windows = not _is_case_sensitive(machine)
+        if is_windows:
+            command = _WINDOWS_HASH_COMMAND.format(path.replace("'", "''"))
+        else:
+            command = _UNIX_HASH_COMMAND.format(path.replace("'", "'\\''"))
+
+        output = machine.execute_command(command)
+        if output.exit_code:
+            raise Exception("Failed to hash the files of {0} on {1}: {2}".format(
+                path, machine.machine_name, output.exception_message or output.output))
+
+        manifest = []
+        for line in output.output.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+
+            if is_windows:
+                file_hash, _, relative_path = line.partition("|")
+            else:
+                file_hash, _, relative_path = line.partition("  ")
+
+            if relative_path:
+                manifest.append((_normalize_path(relative_path), file_hash.lower()))
+
+        manifest.sort()
+        return manifest
+
+    def cache_source_manifest(self, machine, path):
+        """
+        hashes the source test data, and caches the manifest for the restore validations
+
+        Args:
+                machine     (obj)   - Machine class object, None for the controller
+
+                path        (str)   - folder of the source test data
+
+        Return:
+                manifest    (list)  - sorted (relative path, md5 hash) of each file
+        """
+        manifest = self.build_manifest(machine, path, use_cache=True)
+        with _MANIFEST_LOCK:
+            _SOURCE_MANIFESTS[self._cache_key(machine, path)] = manifest
+
+        self.log.info("Cached the manifest of {0} files of {1}".format(len(manifest), path))
+        return manifest
+
+    def get_source_manifest(self, machine, path):
+        """returns the cached manifest of the source test data, None if not cached"""
+        with _MANIFEST_LOCK:
+            return _SOURCE_MANIFESTS.get(self._cache_key(machine, path))
+
+    def validate(self, source_machine, source_path, dest_machine, dest_path,
+                 use_cache=True, allow_extra=True):
+        """
+        compares the source and the destination test data by the content hash of the files
+
+        Args:
+                source_machine  (obj)   - Machine class object of the source,
+                                            None for the controller
+
+                source_path     (str)   - folder of the source test data
+
+                dest_machine    (obj)   - Machine class object of the destination,
+                                            None for the controller
+
+                dest_path       (str)   - folder of the restored test data
+
+                use_cache       (bool)  - use the manifest of the source cached at backup
+
+                allow_extra     (bool)  - do not fail for the files only at the destination
+
+        Return:
+                diff            (obj)   - ManifestDiff of the destination
+
+        Exception:
+                if there are no files at the source
+
+                if the files are missing, or their content differs at the destination
+        """
+        source_manifest = self.get_source_manifest(source_machine, source_path) \
+            if use_cache else None
+
+        if source_manifest is not None:
+            self.log.info("Using the cached manifest of {0}".format(source_path))
+            dest_manifest = self.build_manifest(dest_machine, dest_path)
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                source_future = executor.submit(
+                    self.build_manifest, source_machine, source_path, True)
+                dest_future = executor.submit(self.build_manifest, dest_machine, dest_path)
+                source_manifest = source_future.result()
+                dest_manifest = dest_future.result()
+
+        if not source_manifest:
+            raise Exception("No files found at the source {0}".format(source_path))
+
+        # one case rule for both sides, so a file is not both missing and extra
+        case_sensitive = _is_case_sensitive(source_machine) and _is_case_sensitive(dest_machine)
+        diff = diff_manifests(source_manifest, dest_manifest, case_sensitive)
+        self.log.info("Compared {0} source files with {1} destination files".format(
+            len(source_manifest), len(dest_manifest)))
+
+        if diff.extra:
+            self.log.info("Files only at the destination {0}".format(diff.extra))
+
+        if diff.missing or diff.mismatched or (diff.extra and not allow_extra):
+            self.log.info("Files missing at the destination {0}".format(diff.missing))
+            self.log.info("checksum mismatched for files {0}".format(diff.mismatched))
+            raise Exception("Test data comparison failed for Source:{0} and destination {1}"
+                            .format(source_path, dest_path))
+
+        return diff
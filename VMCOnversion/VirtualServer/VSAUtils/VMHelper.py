@@ -63,7 +63,8 @@ class HypervisorVM(object):
         self.log = logger.get_log()
         self.instance_type = Hvobj.instance_type
         self.utils_path = VirtualServerUtils.UTILS_PATH
-        self.host_machine = self.Hvobj.machine
+        # None uses the machine of the Hypervisor for the calling thread
+        self._host_machine = None
         self.GuestOS = None
         self._DriveList = None
         self._user_name = None
@@ -76,6 +77,18 @@ class HypervisorVM(object):
         self.DiskType = None
         self.DiskList = []
 
+    @property
+    def host_machine(self):
+        """gets the Machine object on which the scripts of the VM run"""
+        if self._host_machine is None:
+            return self.Hvobj.machine
+
+        return self._host_machine
+
+    @host_machine.setter
+    def host_machine(self, value):
+        self._host_machine = value
+
     @property
     def drive_list(self):
         """
@@ -238,6 +251,29 @@ class HypervisorVM(object):
         """
         self.log.info("Update the VMinfo of the VM")
 
+    def _apply_vm_snapshot(self, prop):
+        """
+        set the properties of the VM from the bulk snapshot of the Hypervisor, if the
+        properties were collected along with the other VMs
+
+        Args:
+                prop    (str)   - Basic or All
+
+        Return:
+                True    - if the properties were set from the snapshot
+
+                False   - if the VM is not in the snapshot
+        """
+        _vm_props = self.Hvobj.pop_vm_snapshot(self.vm_name, prop)
+        if not _vm_props:
+            return False
+
+        self.log.info("Setting the VM properties of VM %s from the bulk snapshot" % self.vm_name)
+        for key, val in _vm_props.items():
+            setattr(self, key, val)
+
+        return True
+
 
 class HyperVVM(HypervisorVM):
     """
@@ -378,6 +414,10 @@ class HyperVVM(HypervisorVM):
         from the list of
         """
         try:
+            _vm_host = self.Hvobj.get_vm_host(self.vm_name)
+            if _vm_host:
+                return _vm_host
+
             server_name = server_list[0]
             for _each_server in server_list:
                 client = self.commcell.clients.get(_each_server)
@@ -423,6 +463,8 @@ class HyperVVM(HypervisorVM):
 
         """
         try:
+            if extra_args == "$null" and self._apply_vm_snapshot(prop):
+                return
 
             self.log.info(
                 "Collecting all the VM properties for VM %s" % self.vm_name)
@@ -898,6 +940,8 @@ class VmwareVM(HypervisorVM):
 
         """
         try:
+            if extra_args == "$null" and self._apply_vm_snapshot(prop):
+                return
 
             self.log.info(
                 "Collecting all the VM properties for VM %s" % self.vm_name)
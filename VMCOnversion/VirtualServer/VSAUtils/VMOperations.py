@@ -0,0 +1,243 @@
+"""Main file for running the per VM operations of a Hypervisor concurrently
+
+Operations like power on / off, delete, updating the VM info, or restore validation are run
+on a bounded pool of workers, instead of one VM at a time.
+
+    #.  the number of operations running at a time is limited globally, per host
+        and per datastore of the VM, so the VMs are processed as fast as the hypervisor
+        can handle, without overloading a single host or datastore
+
+    #.  failures of the VMs do not stop the operation for the other VMs, and are reported
+        together once all the VMs are processed
+
+    #.  time taken by the operation is recorded for each VM
+
+classes defined:
+    VMOperationResult   - result of the operation on a single VM
+
+    VMOperationError    - exception with the failures of all the VMs
+
+    VMOperationExecutor - runs an operation on a list of VMs concurrently
+
+"""
+
+import threading
+import time
+from collections import namedtuple, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from AutomationUtils import logger
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_HOST_LIMIT = 4
+DEFAULT_DATASTORE_LIMIT = 2
+
+
+class VMOperationResult(namedtuple('VMOperationResult',
+                                   ('vm_name', 'operation', 'result', 'error', 'time_taken'))):
+    """
+    Result of an operation on a single VM
+
+    Attributes:
+            vm_name     (str)   - name of the VM
+
+            operation   (str)   - name of the operation
+
+            result      (obj)   - value returned by the operation
+
+            error       (obj)   - exception raised by the operation, None if succeeded
+
+            time_taken  (float) - time taken by the operation in seconds
+
+    """
+    __slots__ = ()
+
+    @property
+    def succeeded(self):
+        """returns True if the operation did not raise any exception"""
+        return self.error is None
+
+
+class VMOperationError(Exception):
+    """
+    Exception raised when the operation failed for one or more VMs
+
+    Attributes:
+            operation   (str)   - name of the operation
+
+            failures    (dict)  - VMOperationResult of each failed VM like {vm_name: result}
+
+            results     (dict)  - VMOperationResult of all the VMs
+
+    """
+
+    def __init__(self, operation, results):
+        self.operation = operation
+        self.results = results
+        self.failures = OrderedDict(
+            (vm_name, result) for vm_name, result in results.items() if not result.succeeded)
+
+        super(VMOperationError, self).__init__(
+            "{0} failed for {1} of {2} VMs: {3}".format(
+                operation, len(self.failures), len(results),
+                "; ".join("{0} - {1}".format(vm_name, result.error)
+                          for vm_name, result in self.failures.items())))
+
+
+class VMOperationExecutor(object):
+    """
+    Runs an operation on a list of VMs concurrently, limiting the number of operations
+    running at a time per host and per datastore
+
+    Methods:
+            run()   - runs the operation on all the VMs, and returns the result of each VM
+
+    """
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, host_limit=DEFAULT_HOST_LIMIT,
+                 datastore_limit=DEFAULT_DATASTORE_LIMIT):
+        """
+        Args:
+                max_workers     (int)   - number of VMs processed at a time
+
+                host_limit      (int)   - number of VMs of the same host processed at a time,
+                                            no limit if None
+
+                datastore_limit (int)   - number of VMs of the same datastore processed
+                                            at a time, no limit if None
+        """
+        self.log = logger.get_log()
+        self.max_workers = max_workers
+        self.host_limit = host_limit
+        self.datastore_limit = datastore_limit
+
+        self._limits = {}
+        self._lock = threading.Lock()
+
+    def _get_limit(self, kind, key):
+        """
+        returns the semaphore limiting the operations on the host / datastore
+
+        Args:
+                kind    (str)   - host or datastore
+
+                key     (str)   - name of the host / datastore
+
+        Return:
+                semaphore   (obj)   - semaphore of the host / datastore,
+                                        None if the operations are not limited
+        """
+        limit = self.host_limit if kind == "host" else self.datastore_limit
+        if key is None or not limit:
+            return None
+
+        with self._lock:
+            if (kind, key) not in self._limits:
+                self._limits[(kind, key)] = threading.BoundedSemaphore(limit)
+
+            return self._limits[(kind, key)]
+
+    def _run_one(self, operation, operation_name, vm_name, placement):
+        """
+        runs the operation on the VM, once the host and datastore of the VM have
+        a free slot
+
+        Args:
+                operation       (callable)  - function taking the VM name
+
+                operation_name  (str)       - name of the operation
+
+                vm_name         (str)       - name of the VM
+
+                placement       (tuple)     - host and datastore of the VM
+
+        Return:
+                result  (obj)   - VMOperationResult of the VM
+        """
+        # always acquired in the same order, host and then datastore
+        limits = [self._get_limit("host", placement[0]),
+                  self._get_limit("datastore", placement[1])]
+        limits = [limit for limit in limits if limit is not None]
+
+        for limit in limits:
+            limit.acquire()
+
+        start_time = time.time()
+        try:
+            result = VMOperationResult(vm_name, operation_name, operation(vm_name), None,
+                                       time.time() - start_time)
+            self.log.info("{0} completed for VM {1} in {2:.2f} seconds".format(
+                operation_name, vm_name, result.time_taken))
+
+        except Exception as err:
+            result = VMOperationResult(vm_name, operation_name, None, err,
+                                       time.time() - start_time)
+            self.log.exception("{0} failed for VM {1}: {2}".format(operation_name, vm_name, err))
+
+        finally:
+            for limit in reversed(limits):
+                limit.release()
+
+        return result
+
+    def run(self, operation, vm_list, placement=None, operation_name=None, raise_error=True):
+        """
+        runs the operation on all the VMs concurrently
+
+        Args:
+                operation       (callable)  - function taking the VM name
+
+                vm_list         (list)      - list of VMs
+
+                placement       (callable)  - function taking the VM name, and returning
+                                                the host and datastore of the VM
+
+                operation_name  (str)       - name of the operation, for logging
+
+                raise_error     (bool)      - raise VMOperationError if the operation failed
+                                                for any VM
+
+        Return:
+                results     (dict)  - VMOperationResult of each VM like {vm_name: result}
+
+        Exception:
+                VMOperationError, if the operation failed for any VM and raise_error is set
+
+        """
+        operation_name = operation_name or getattr(operation, "__name__", "VM operation")
+        vm_list = list(vm_list)
+        start_time = time.time()
+
+        # placement is resolved upfront, as it may need the VM properties
+        placements = dict(
+            (vm_name, placement(vm_name) if placement else (None, None)) for vm_name in vm_list)
+
+        # VMs are submitted round robin across the placements, so the workers are not all
+        # waiting on the same host / datastore, while the others are idle
+        groups = OrderedDict()
+        for vm_name in vm_list:
+            groups.setdefault(placements[vm_name], []).append(vm_name)
+
+        submit_order = []
+        while groups:
+            for key in list(groups):
+                submit_order.append(groups[key].pop(0))
+                if not groups[key]:
+                    del groups[key]
+
+        executor = ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(vm_list))))
+        try:
+            futures = dict((vm_name, executor.submit(
+                self._run_one, operation, operation_name, vm_name, placements[vm_name]))
+                           for vm_name in submit_order)
+            results = OrderedDict((vm_name, futures[vm_name].result()) for vm_name in vm_list)
+        finally:
+            executor.shutdown(wait=True)
+
+        self.log.info("{0} completed for {1} VMs in {2:.2f} seconds".format(
+            operation_name, len(vm_list), time.time() - start_time))
+
+        if raise_error and any(not result.succeeded for result in results.values()):
+            raise VMOperationError(operation_name, results)
+
+        return results
@@ -20,11 +20,19 @@ classes defined:
 import os
 import re
 import socket
+import threading
 import time
+from collections import OrderedDict
 from AutomationUtils.machine import Machine
 from .HypervisorHelper import Hypervisor
 from . import VirtualServerConstants
 from . import VirtualServerUtils
+from .ContentRules import ContentRuleSet, compile_pattern
+from .ExtentProbe import ExtentProbe
+from .CSDBAccess import CSDBAccess
+from .JobHistory import JobHistory
+from .CBTLedger import CBTLedger, LEDGER_FILE, extract_change_ids, parse_cbt_stat_files
+from .TestdataValidation import TestdataValidator
 from cvpysdk.job import Job
 from AutomationUtils import cvhelper
 from AutomationUtils import logger
@@ -54,6 +62,18 @@ class AutoVSACommcell(object):
             get_job_results_dir()                   - get the job results directory of the client
                                         (default: commserv client)
 
+            execute()                   - executes the query and returns the first value
+
+            find_primary_copy_ids()     - primary copy id of many storage policies at once
+
+            find_snap_copy_ids()        - snap copy id of many storage policies at once
+
+            find_aux_copy_ids()         - aux copy id of many storage policies at once
+
+            find_app_aware_jobs_bulk()  - IDA and workflow jobs of many VSA jobs at once
+
+            csdb_stats                  - number of CSDB queries run, and served from cache
+
     """
 
     def __init__(self, commcell, csdb):
@@ -70,6 +90,8 @@ class AutoVSACommcell(object):
         self.log = logger.get_log()
         self.commcell = commcell
         self.csdb = csdb
+        # prepared, batched and cached lookups, shared by all the subclients of the testcase
+        self.csdb_access = CSDBAccess(csdb)
         self.commserv_name = self.commcell.commserv_name
         self.base_dir = self.get_base_dir()
 
@@ -178,11 +200,8 @@ class AutoVSACommcell(object):
         try:
 
             self.log.info("Getting client name for Client for %s " % host_name)
-            _query = "select name from APP_Client where net_hostname = '%s'" % host_name
-
-            self.csdb.execute(_query)
-            _results = self.csdb.fetch_one_row()
-            return _results[0]
+            _query = "select name from APP_Client where net_hostname = ?"
+            return self.execute(_query, (host_name,))
 
         except Exception as err:
             self.log.exception(
@@ -333,6 +352,88 @@ class AutoVSACommcell(object):
             self.log.info("Failed to compute Job results Directory")
             raise err
 
+    @property
+    def csdb_stats(self):
+        """returns the number of CSDB queries run, and served from the cache"""
+        return self.csdb_access.stats
+
+    def _find_copy_ids(self, sp_ids, copy_filter=""):
+        """
+        find the copy id of the storage policies, matching the filter, in one query
+
+        Args:
+                sp_ids      (list)  : storage policy ids
+
+                copy_filter (str)   : condition on the copy like AGC.isSnapCopy = 1
+
+        Return:
+                copy_ids    (dict)  : copy id of each storage policy like {'12': '1'}
+        """
+        _query = "select AGC.archGroupId, AGC.copy from archgroup AG, archGroupCopy AGC " \
+                 "where AG.id = AGC.archGroupId and AGC.archGroupId in ?"
+        if copy_filter:
+            _query = _query + " and " + copy_filter
+
+        _results = self.csdb_access.fetch_in(_query, [str(sp_id) for sp_id in sp_ids])
+        return dict((sp_id, rows[0][1]) for sp_id, rows in _results.items())
+
+    def find_primary_copy_ids(self, sp_ids):
+        """
+        find the primary copy id of the storage policies, in one query
+
+        Args:
+                sp_ids  (list)  : storage policy ids
+
+        Return:
+                primary copy id of each storage policy like {'12': '1'}
+        """
+        return self._find_copy_ids(sp_ids, "AGC.type = 1 and AGC.isSnapCopy = 0")
+
+    def find_snap_copy_ids(self, sp_ids):
+        """
+        find the snap copy id of the storage policies, in one query
+
+        Args:
+                sp_ids  (list)  : storage policy ids
+
+        Return:
+                snap copy id of each storage policy like {'12': '2'}
+        """
+        return self._find_copy_ids(sp_ids, "AGC.isSnapCopy = 1")
+
+    def find_aux_copy_ids(self, sp_ids):
+        """
+        find the aux copy id of the storage policies, in one query
+
+        Args:
+                sp_ids  (list)  : storage policy ids
+
+        Return:
+                aux copy id of each storage policy like {'12': '3'}
+        """
+        return self._find_copy_ids(sp_ids)
+
+    def _find_copy_id(self, sp_id, copy_filter=""):
+        """
+        find the copy id of the storage policy, matching the filter
+
+        Args:
+                sp_id       (int)   : storage policy id
+
+                copy_filter (str)   : condition on the copy like AGC.isSnapCopy = 1
+
+        Return:
+                copy id of that storage policy
+
+        Raise:
+                if the storage policy has no such copy
+        """
+        _copy_ids = self._find_copy_ids([sp_id], copy_filter)
+        if str(sp_id) not in _copy_ids:
+            raise Exception("An exception occurred getting Sp details details")
+
+        return _copy_ids[str(sp_id)]
+
     def find_primary_copy_id(self, sp_id):
         """
         find the primary copy id of the specified storage policy
@@ -345,35 +446,27 @@ class AutoVSACommcell(object):
         """
 
         try:
-            _query = "select copy from archgroup AG,archGroupCopy AGC where AGC.type = 1 and \
-            AGC.isSnapCopy = 0 and  ag.id = AGC.archGroupId and AGC.archGroupId = '%s'" % sp_id
-
-            self.csdb.execute(_query)
-            _results = self.csdb.fetch_one_row()
-            if not _results:
-                raise Exception(
-                    "An exception occurred getting Sp details details")
-
-            return _results[0]
+            return self._find_copy_id(sp_id, "AGC.type = 1 and AGC.isSnapCopy = 0")
 
         except Exception as err:
             self.log.exception("An Aerror occurred in find_primary_copy_id ")
             raise err
 
-    def execute(self, query):
+    def execute(self, query, params=(), use_cache=True):
         """
         Executes the query passed and return the first row of value
-        :param query: Query to be executed against CSDB
+        :param query: Query to be executed against CSDB, with ? placeholders for params
+        :param params: value of each placeholder
+        :param use_cache: return the result cached by the same query, if not expired
         :return:
             value : first row of query executed
         """
 
         try:
-            self.csdb.execute(query)
-            _results = self.csdb.fetch_one_row()
+            _results = self.csdb_access.fetch_one(query, params, use_cache)
             if not _results:
                 raise Exception(
-                    "An exception {0} occurred in executing the query {0}".format(_results, query))
+                    "An exception {0} occurred in executing the query {1}".format(_results, query))
 
             return _results[0]
 
@@ -392,10 +485,7 @@ class AutoVSACommcell(object):
                 snap copy id of that storage policy
         """
 
-        _query = "select copy from archgroup AG,archGroupCopy AGC where AGC.isSnapCopy = 1 and \
-                                    ag.id = AGC.archGroupId and AGC.archGroupId = '%s'" % sp_id
-
-        return self.execute(_query)
+        return self._find_copy_id(sp_id, "AGC.isSnapCopy = 1")
 
     def find_aux_copy_id(self, sp_id):
         """
@@ -408,10 +498,21 @@ class AutoVSACommcell(object):
                 aux copy id of that storage policy
         """
 
-        _query = "select copy from archgroup AG,archGroupCopy AGC where \
-                            ag.id = AGC.archGroupId and AGC.archGroupId = '%s'" % sp_id
+        return self._find_copy_id(sp_id)
+
+    def find_app_aware_jobs_bulk(self, vsa_backup_jobs):
+        """
+        Get the workflow Job and IDA backup job id of many VSA backup jobs, in one query
+        :param vsa_backup_jobs:  VSA Backup Job IDs
+        :return:
+            app_aware_jobs : IDA and workflow job of each VSA job like {'10': ('11', '12')}
+        """
+        _query = "select Parentjobid, childjobId, workFlowjobId from jmVSAAppJobLink " \
+                 "where Parentjobid in ?"
+        _results = self.csdb_access.fetch_in(
+            _query, [str(job_id) for job_id in vsa_backup_jobs])
 
-        return self.execute(_query)
+        return dict((job_id, (rows[0][1], rows[0][2])) for job_id, rows in _results.items())
 
     def find_app_aware_jobs(self, vsa_backup_job):
         """
@@ -423,14 +524,11 @@ class AutoVSACommcell(object):
         """
 
         try:
-            _query = "select childjobId  from jmVSAAppJobLink \
-                            where Parentjobid = %s" % vsa_backup_job
-            ida_job_id = self.execute(_query)
-
-            _query1 = "select workFlowjobId  from jmVSAAppJobLink\
-                            where Parentjobid = %s" % vsa_backup_job
-            workflow_job = self.execute(_query1)
+            _app_aware_jobs = self.find_app_aware_jobs_bulk([vsa_backup_job])
+            if str(vsa_backup_job) not in _app_aware_jobs:
+                raise Exception("No app aware jobs found for the job {0}".format(vsa_backup_job))
 
+            ida_job_id, workflow_job = _app_aware_jobs[str(vsa_backup_job)]
             return ida_job_id, workflow_job
 
         except Exception as err:
@@ -447,9 +545,8 @@ class AutoVSACommcell(object):
 
         try:
 
-            _query = "select jobid from JMBkpJobInfo \
-            where applicationId = {0}".format(subclient_id)
-            backupcopy_job_id = self.execute(_query)
+            _query = "select jobid from JMBkpJobInfo where applicationId = ?"
+            backupcopy_job_id = self.execute(_query, (subclient_id,), use_cache=False)
 
             return backupcopy_job_id
 
@@ -478,10 +575,8 @@ class AutoVSACommcell(object):
             else:
                 cbt_status = r'Used'
             _query = "SELECT attrVal from APP_VMProp where attrName = 'vmCBTStatus' " \
-                     " and jobId ={0}".format(job_id._job_id)
-            self.csdb.execute(_query)
-
-            _results = self.csdb.fetch_all_rows()
+                     " and jobId = ?"
+            _results = self.csdb_access.fetch_all(_query, (int(job_id._job_id),))
 
             for result in _results:
                 if result[0] != cbt_status:
@@ -838,7 +933,9 @@ class AutoVSASubclient(object):
         self.disk_restore_dest = None
         self._is_live_browse = False
         self.ma_machine = None
-        self.build_folder_path = None
+        self._extent_probe = None
+        self._job_history = None
+        self._cbt_ledger = None
         self._is_windows_live_browse = False
         self.set_content_details()
         self.prepare_disk_filter_list()
@@ -1289,21 +1386,46 @@ class AutoVSASubclient(object):
 
     def _compute_vm_list_from_dynamic_content(self, content_list):
         """
-    Phase I of dynamic content evaluation - Get all VM records in dictionary based on option given
+    Phase I of dynamic content evaluation - Get the records of all the VMs in dictionary,
+    with only the attributes needed by the content, each fetched once for all the VMs
 
         Args:
                 content_list    (list)  - list of dynamic content string like [VM]=startswith=test*
         """
         try:
+            rule_set = ContentRuleSet.from_content(content_list)
+
+            # VMs of the hosts in [HN] content, with the host as the attribute to match
+            _vm_hosts = {}
+            for rule in rule_set.rules:
+                if rule.option == "[HN]":
+                    for _each_vm in self.hvobj.get_all_vms_in_hypervisor(rule.pattern):
+                        _vm_hosts[_each_vm] = rule.pattern
 
-            for content in content_list:
-                option, equality, pattern = self.split_content_string(content)
-                self.get_vm_record_based_on_pattern(option, pattern, equality)
-            if not self.hvobj.VMs:
+            _vm_list = set(_vm_hosts) | set(self.hvobj.VMs.keys())
+            _other_rules = [rule for rule in rule_set.rules if rule.option != "[HN]"]
+
+            if all(rule.option == "[VM]" and rule.equality == "Equals" for rule in _other_rules):
+                _vm_list.update(rule.pattern for rule in _other_rules)
+            else:
+                _vm_list.update(self.hvobj.get_all_vms_in_hypervisor())
+
+            _attributes = rule_set.attributes - {'vm_name', 'server_clientname'}
+            _vm_attributes = {}
+            if _attributes:
+                _vm_attributes = self.hvobj.get_vm_attributes(list(_vm_list), _attributes)
+
+            self._vm_record = {}
+            for _each_vm in _vm_list:
+                _record = {'vm_name': _each_vm, 'server_clientname': _vm_hosts.get(_each_vm)}
+                _record.update(_vm_attributes.get(_each_vm, {}))
+                self._vm_record[_each_vm] = _record
+
+            if not self._vm_record:
                 self.log.error("Error while retrieving VMs and their records")
                 raise Exception("Error while retrieving VMs and their records")
 
-            self.log.info("Records for all VMs are created successfully")
+            self.log.info("Records for %d VMs are created successfully" % len(self._vm_record))
 
         except Exception as err:
             self.log.exception(
@@ -1331,35 +1453,7 @@ class AutoVSASubclient(object):
         """
 
         try:
-            if (equality == "Equals") | (equality == "Does Not Equals"):
-                match = re.search(pattern, vm, flags=re.I)
-                if match:
-                    return True
-            elif (equality == "Contains") | (equality == "Does Not Contains"):
-                pattern = ".*" + pattern + ".*"
-
-            elif equality == "Starts with":
-                pattern = pattern + ".*"
-
-            elif equality == "Ends with":
-                pattern = ".*" + pattern
-
-            # pattern of the form ab*cd
-            if (((pattern[len(pattern) - 1] != '*') & (pattern[len(pattern) - 1] != '+'))
-                    & (pattern[0] != '.')):
-                pattern = pattern + '$'
-                match = re.match(pattern, vm, flags=re.I)
-
-            elif pattern[0] != '.':  # pattern of the form abc*
-                match = re.match(pattern, vm, flags=re.I)
-
-            # pattern of the form *abc
-            elif (pattern[len(pattern) - 1] != '*') & (pattern[len(pattern) - 1] != '+'):
-                pattern = pattern + '$'
-                match = re.search(pattern, vm, flags=re.I)
-
-            else:  # pattern of the form *abc*
-                match = re.search(pattern, vm, flags=re.I)
+            match = re.search(compile_pattern(equality, pattern), vm, flags=re.I)
 
             if not match:
                 self.log.info("Does not match")
@@ -1417,36 +1511,10 @@ class AutoVSASubclient(object):
 
         """
         try:
-            _qualified_list = []
-            _disqualified_list = []
-            vm_list = self.hvobj.VMs.keys()
-
-            def process_content(prop):
-                for vm in vm_list:
-                    _vm_prop_value = getattr(self.hvobj.VMs[vm], prop)
-                    _retcode = self._match_pattern_in_input(
-                        _vm_prop_value, equality, pattern)
-
-                    if (((equality == "Does Not Equals") | (equality == "Does Not Contains"))
-                            & (_retcode is True)):
-                        _disqualified_list.append(vm)
-
-                    elif _retcode:
-                        _qualified_list.append(vm)
-
-                return _qualified_list, _disqualified_list
-
-            process_filter_dict = VirtualServerConstants.vm_pattern_names
-
-            for content in dynamic_content:
-                option, equality, pattern = self.split_content_string(content)
-                _qualified_list, _disqualified_list = process_content(
-                    process_filter_dict[option])
+            rule_set = ContentRuleSet.from_content(dynamic_content)
+            _qualified_list = rule_set.evaluate(self._vm_record)
 
             self.log.info("Qualified list is made successfully.")
-
-            _qualified_list = list(
-                set(_qualified_list) - set(_disqualified_list))
             return _qualified_list
 
         except Exception as err:
@@ -1548,6 +1616,12 @@ class AutoVSASubclient(object):
                        list(non_dynamic_content_list)
             self.vm_list = list(set(_vm_list))
 
+            # VM objects are created only for the final list of VMs, and not the whole inventory
+            _missing_vms = [_each_vm for _each_vm in self.vm_list
+                            if _each_vm not in self.hvobj.VMs.keys()]
+            if _missing_vms:
+                self.hvobj.VMs = _missing_vms
+
         except Exception as err:
             self.log.exception(
                 "An exception occurred in Updating the Subclient Property")
@@ -1718,13 +1792,22 @@ class AutoVSASubclient(object):
             if not generate:
                 raise Exception(generate)
             #"""
-            for _vm in self.vm_list:
-                self.hvobj.VMs[_vm].update_vm_info('All', True, False)
+            if len(self.vm_list) > 1:
+                try:
+                    self.hvobj.take_vm_snapshot(self.vm_list, 'All')
+                except Exception as err:
+                    self.log.warning(
+                        "Bulk snapshot of the VMs failed, collecting per VM: {0}".format(err))
+
+            def discover_vm(_vm):
+                self.hvobj.VMs[_vm].update_vm_info('All', os_info=True)
                 for _drive in self.hvobj.VMs[_vm].drive_list:
                     self.log.info("COpying Testdata to Drive %s" % _drive)
                     # self.hvobj.copy_test_data_to_each_volume(
                        # _vm, _drive, self.backup_folder_name, self.testdata_path)
 
+            self.hvobj.run_vm_operation(discover_vm, self.vm_list)
+
         except Exception as err:
             self.log.exception(
                 "Exception while doing VSA Discovery  :" + str(err))
@@ -1752,6 +1835,12 @@ class AutoVSASubclient(object):
 
             self.vsa_discovery()
 
+            try:
+                TestdataValidator().cache_source_manifest(None, self.testdata_path)
+            except Exception as err:
+                self.log.warning(
+                    "Failed to cache the test data manifest, will hash at restore: {0}".format(err))
+
             """
             _backup_job = self.subclient.backup(backup_option.backup_type,
                                                 backup_option.run_incr_before_synth,
@@ -1817,19 +1906,11 @@ class AutoVSASubclient(object):
             for _vm in self.vm_list:
                 for _drive in self.hvobj.VMs[_vm].drive_list:
 
-                    if "root" in _drive:
-                        _preserve_level = int(fs_restore_options.preserve_level)+\
-                                            self.hvobj.VMs[_vm].preserve_level
-                    else:
-                        _preserve_level = fs_restore_options.preserve_level
-
                     self.log.info("Restore dest path " +
                                   fs_restore_options.restore_path)
-                    _fs_path_to_browse = _drive + "\\"+self.backup_folder_name+"\\TestData"
 
-                    self.fs_restore_dest = fs_restore_options.restore_path+"\\"+\
-                                           self.backup_folder_name + \
-                                            "\\"+_vm+"\\"+_drive.split(":")[0]
+                    self.fs_restore_dest = self._guest_file_restore_destination(
+                        fs_restore_options, _vm, _drive)
 
                     # """
                     self._is_windows_live_browse = self._check_if_windows_live_browse(
@@ -1855,11 +1936,7 @@ class AutoVSASubclient(object):
                         disk_count_before_restore = self.ma_machine.get_disk_count()
 
                     #"""
-                    fs_restore_job = self.subclient.guest_file_restore(_vm,
-                        _fs_path_to_browse, fs_restore_options.destination_client,
-                        self.fs_restore_dest, fs_restore_options.copy_precedence,
-                        _preserve_level, fs_restore_options.unconditional_overwrite,
-                        fbr_ma=fs_restore_options.fbr_ma)
+                    fs_restore_job = self.submit_guest_file_restore(fs_restore_options, _vm, _drive)
 
                     if not fs_restore_job.wait_for_completion():
                         raise Exception(
@@ -1873,10 +1950,7 @@ class AutoVSASubclient(object):
                     # """
 
                     # File level Validation
-                    dest_client = Machine(fs_restore_options.destination_client,
-                                          self.auto_commcell.commcell)
-                    self.fs_testdata_validation(
-                        dest_client, self.fs_restore_dest+"\\TestData")
+                    self.validate_guest_file_restore(fs_restore_options, _vm, _drive)
 
                     # """
                     if not fs_restore_options.metadata_collected:
@@ -1892,68 +1966,123 @@ class AutoVSASubclient(object):
             self.log.info("Restore: FAIL - File level files Restore Failed")
             raise err
 
-    def get_extent_count(self, db_path, db_name):
+    def _guest_file_restore_destination(self, fs_restore_options, vm, drive):
         """
-        Get the extent number of extetnts in live browse DB
-        :param db_path: db path of the livebrowse db
-        :return:
-            extent_count    (int)   - Number of extents in DB currently
+        returns the restore path of the drive of the VM, for the guest file restore
+
+        Args:
+                fs_restore_options  (obj)   - options of the guest file restore
+
+                vm                  (str)   - name of the source VM
+
+                drive               (str)   - drive of the VM
+
         """
+        return fs_restore_options.restore_path + "\\" + self.backup_folder_name + \
+            "\\" + vm + "\\" + drive.split(":")[0]
 
-        try:
+    def submit_guest_file_restore(self, fs_restore_options, vm, drive):
+        """
+        submits the guest file restore of the test data of the drive of the VM, without
+        waiting for the job
 
-            utils_path = VirtualServerUtils.UTILS_PATH
+        Args:
+                fs_restore_options  (obj)   - options of the guest file restore
 
-            if not self.build_folder_path:
-                extent_count_file = os.path.join(utils_path, "Extentcount.py")
+                vm                  (str)   - name of the source VM
 
-                extent_setup_file = os.path.join(utils_path, "setup.py")
+                drive               (str)   - drive of the VM
 
-                db_file_path = os.path.join(db_path, db_name)
-                with open(extent_count_file, 'r') as f_obj:
-                    _script = f_obj.read()
-                    _script = _script.replace('\xef\xbb\xbf', '')
+        Return:
+                job     (obj)   - Job of the guest file restore
 
-                db_argument_list = re.findall(r'##Automation--([\w_]*)--##', _script)
+        """
+        if "root" in drive:
+            _preserve_level = int(fs_restore_options.preserve_level) + \
+                              self.hvobj.VMs[vm].preserve_level
+        else:
+            _preserve_level = fs_restore_options.preserve_level
 
-                for argument in db_argument_list:
-                    value = "{0}".format(db_file_path.strip())
-                    _script = _script.replace('##Automation--{0}--##'.format(argument), value)
+        _fs_path_to_browse = drive + "\\" + self.backup_folder_name + "\\TestData"
 
-                extent_count_temp_file  = os.path.join(utils_path, "Extentcounttemp.py")
-                with open(extent_count_temp_file,'w') as f_obj:
-                    f_obj.write(_script)
-                    f_obj.close()
+        return self.subclient.guest_file_restore(
+            vm, _fs_path_to_browse, fs_restore_options.destination_client,
+            self._guest_file_restore_destination(fs_restore_options, vm, drive),
+            fs_restore_options.copy_precedence, _preserve_level,
+            fs_restore_options.unconditional_overwrite, fbr_ma=fs_restore_options.fbr_ma)
 
-                exe_command = "python \""+extent_setup_file+"\""+" build"
-                controller_client_name = self.auto_commcell.get_client_name_from_hostname(socket.getfqdn())
-                controller_machine = self.auto_commcell.commcell.clients.get(controller_client_name)
-                output = controller_machine.execute_command(exe_command)
+    def validate_guest_file_restore(self, fs_restore_options, vm, drive):
+        """
+        validates the test data restored by the guest file restore of the drive of the VM
 
-                build_path = os.path.join(utils_path, "build")
-                if not os.path.exists(build_path):
-                    raise Exception(output)
-                self.ma_client_name.upload_folder(build_path, db_path)
-                controller_machine.remove_directory(build_path)
+        Args:
+                fs_restore_options  (obj)   - options of the guest file restore
 
-                _build_folder = os.path.join(db_path, "build")
-                if self.ma_machine.check_directory_exists(_build_folder):
-                    self.build_folder_path = _build_folder
+                vm                  (str)   - name of the source VM
 
-                else:
-                    raise Exception("Failed to copy the extent exe folder")
+                drive               (str)   - drive of the VM
+
+        Exception:
+                if validation fails
 
-            extent_count_exe_path = os.path.join(self.build_folder_path,
-                                                 "Extentcounttemp.exe")
-            cmd = "iex " + "\"" + "& " + "\'" + extent_count_exe_path + "\'\""
-            output = self.ma_machine.execute_command(cmd)
-            return int(output.formatted_output.strip())
+        """
+        dest_client = Machine(fs_restore_options.destination_client,
+                              self.auto_commcell.commcell)
+        self.fs_testdata_validation(
+            dest_client,
+            self._guest_file_restore_destination(fs_restore_options, vm, drive) + "\\TestData")
 
+    def _get_extent_probe(self):
+        """
+        Get the extent probe of the live browse MA, deployed once per MA
+
+        return:
+            probe    (obj)   - ExtentProbe object of the MA
+        """
+        ma_name = self.ma_client_name.client_name
+        if self._extent_probe is None or self._extent_probe.ma_name != ma_name:
+            self._extent_probe = ExtentProbe(
+                self.auto_commcell.commcell, ma_name,
+                self.auto_commcell.get_job_results_dir(ma_name))
+
+        return self._extent_probe
+
+    def get_extent_count(self, db_path, db_name):
+        """
+        Get the extent number of extetnts in live browse DB
+        :param db_path: db path of the livebrowse db
+        :return:
+            extent_count    (int)   - Number of extents in DB currently
+        """
+
+        try:
+            db_file_path = os.path.join(db_path, db_name)
+            return int(self._get_extent_probe().get_stats(db_file_path)["extents"])
 
         except Exception as e:
             self.log.exception("An exception occurred in getting extent count {0}".format(e))
             raise e
 
+    def _wait_for_disk_unmount(self, disk_count_before_restore, timeout, interval=15):
+        """
+        Waits till the disks mounted for live browse are unmounted from the MA
+        :param disk_count_before_restore: disk count of Ma before performing guest file restore
+        :param timeout: maximum seconds to wait
+        :param interval: seconds between the checks
+        :return:
+            disk_count  (int)   - disk count of the MA after the wait
+        """
+        wait_time = 0
+        while True:
+            disk_count = int(self.ma_machine.get_disk_count())
+            if disk_count <= int(disk_count_before_restore) or wait_time >= timeout:
+                self.log.info("Disk count of the MA is {0} after {1} secs".format(
+                    disk_count, wait_time))
+                return disk_count
+
+            time.sleep(interval)
+            wait_time = wait_time + interval
+
     def block_level_validation(self, disk_count_before_restore, _vm, browse_ma):
         """
         Perfoms Windows Block level validation
@@ -1967,39 +2096,29 @@ class AutoVSASubclient(object):
 
         try:
 
-            wait_time = 0
-            error_count = 0
-            pre_extent_count = 0
-
             print(self.hvobj.VMs[_vm].GuestOS)
             self.log.info("performing pruning validation on Browse MA {0}".format(browse_ma))
             _browse_ma_jr_dir = self.auto_commcell.get_job_results_dir(browse_ma)
 
             if self.hvobj.VMs[_vm].GuestOS == "Windows":
-                while wait_time <= 500:
-                    db_path = VirtualServerConstants.get_live_browse_db_path(_browse_ma_jr_dir)
-                    db_name = VirtualServerUtils.find_live_browse_db_file(self.ma_machine, db_path)
-                    current_extent_count = self.get_extent_count(db_path, db_name)
-
-                    if current_extent_count > pre_extent_count:
-                        self.log.info("Extentshould have reduced butincreasedwill waitfor 3 error")
-                        error_count = error_count + 1
-                        if error_count > 4:
-                            raise Exception("pruning is not happening , please check logs")
-
-                    pre_extent_count = current_extent_count
-                    self.log.info("Waiting for 2 mins for next check")
-                    time.sleep(120)
-                    wait_time = wait_time + 120
-
-                time.sleep(200)
+                db_path = VirtualServerConstants.get_live_browse_db_path(_browse_ma_jr_dir)
+                db_name = VirtualServerUtils.find_live_browse_db_file(self.ma_machine, db_path)
+
+                # polled on the MA, returns as soon as the extents are pruned
+                samples = self._get_extent_probe().watch(
+                    os.path.join(db_path, db_name), interval=15, timeout=620, max_increases=4)
+                if samples[-1]["status"] == "increasing":
+                    raise Exception("pruning is not happening , please check logs")
+
+                unmount_timeout = 200
             else:
-                time.sleep(700)
+                unmount_timeout = 700
 
             self.log.info("performing Post un-mount validation")
             # disk Un-mount validation
             self.log.info("Calculating the disk-count of the MA after restore")
-            disk_count_after_restore = self.ma_machine.get_disk_count()
+            disk_count_after_restore = self._wait_for_disk_unmount(
+                disk_count_before_restore, unmount_timeout)
             self.log.info("Performing Live Browse Un-mount Validation")
             if (int(disk_count_before_restore)) >= (int(disk_count_after_restore)):
                 self.log.info("Disk Unmounted Successfully")
@@ -2037,22 +2156,15 @@ class AutoVSASubclient(object):
 
 
         Exception
-                if folder comparison fails
+                if the files are missing, or their content differs at the destination
 
 
         """
         try:
 
             self.log.info("Validating the testdata")
-            controller_machine = Machine(socket.getfqdn(), self.auto_commcell.commcell)
-            difference = controller_machine.compare_folders(dest_client, self.testdata_path,
-                                                                         dest_location)
-
-            if difference:
-                self.log.info("checksum mismatched for files  {0}".format(difference))
-
-                raise Exception("Folder Comparison Failed for Source:{0} and destination {0}".format(
-                                self.testdata_path, dest_location))
+            # test data is generated on the controller, the source is hashed locally
+            TestdataValidator().validate(None, self.testdata_path, dest_client, dest_location)
 
             self.log.info("Validation completed successfully")
 
@@ -2077,14 +2189,10 @@ class AutoVSASubclient(object):
         try:
             for _vm in self.vm_list:
 
-                self.disk_restore_dest = os.path.join(
-                    disk_restore_options.restore_path, self.backup_folder_name, _vm)
+                self.disk_restore_dest = self._disk_restore_destination(disk_restore_options, _vm)
 
                 #"""
-                disk_restore_job = self.subclient.disk_restore(
-                        _vm, disk_restore_options.destination_client,
-                        self.disk_restore_dest, disk_restore_options.unconditional_overwrite,
-                        disk_restore_options.copy_precedence)
+                disk_restore_job = self.submit_disk_restore(disk_restore_options, _vm)
 
                 if not disk_restore_job.wait_for_completion():
                     raise Exception(
@@ -2093,23 +2201,71 @@ class AutoVSASubclient(object):
                     )
                 self.log.info("Disk restore job completed successfully with job id {0}".format(disk_restore_job.job_id))
                 # """
-                if self.hvobj.VMs[_vm].GuestOS == "Windows":
-                    # Commenting out validation for vmware disk level restore for now
-                    if not self.hvobj.instance_type == "vmware":
-                        self.disk_validation(
-                            self.hvobj.VMs[_vm],
-                            disk_restore_options._destination_pseudo_client,
-                            self.disk_restore_dest,
-                            disk_restore_options.client_machine)
-
-                dest_client_hypervisor = self.auto_vsainstance._create_hypervisor_object(
-                    disk_restore_options._destination_pseudo_client)
-                dest_client_hypervisor.machine.remove_directory(self.disk_restore_dest)
+                self.validate_disk_restore(disk_restore_options, _vm)
 
         except Exception as err:
             self.log.exception("Exception occurred please check logs")
             raise Exception("Disk Restore Job failed, please check agent logs {0}".format(err))
 
+    def _disk_restore_destination(self, disk_restore_options, vm):
+        """
+        returns the restore path of the disks of the VM, for the disk restore
+
+        Args:
+                disk_restore_options    (obj)   - options of the disk restore
+
+                vm                      (str)   - name of the source VM
+
+        """
+        return os.path.join(disk_restore_options.restore_path, self.backup_folder_name, vm)
+
+    def submit_disk_restore(self, disk_restore_options, vm):
+        """
+        submits the disk restore of the VM, without waiting for the job
+
+        Args:
+                disk_restore_options    (obj)   - options of the disk restore
+
+                vm                      (str)   - name of the source VM
+
+        Return:
+                job     (obj)   - Job of the disk restore
+
+        """
+        return self.subclient.disk_restore(
+            vm, disk_restore_options.destination_client,
+            self._disk_restore_destination(disk_restore_options, vm),
+            disk_restore_options.unconditional_overwrite,
+            disk_restore_options.copy_precedence)
+
+    def validate_disk_restore(self, disk_restore_options, vm):
+        """
+        validates the disks restored for the VM, and removes them from the destination
+
+        Args:
+                disk_restore_options    (obj)   - options of the disk restore
+
+                vm                      (str)   - name of the source VM
+
+        Exception:
+                if validation fails
+
+        """
+        disk_restore_dest = self._disk_restore_destination(disk_restore_options, vm)
+
+        if self.hvobj.VMs[vm].GuestOS == "Windows":
+            # Commenting out validation for vmware disk level restore for now
+            if not self.hvobj.instance_type == "vmware":
+                self.disk_validation(
+                    self.hvobj.VMs[vm],
+                    disk_restore_options._destination_pseudo_client,
+                    disk_restore_dest,
+                    disk_restore_options.client_machine)
+
+        dest_client_hypervisor = self.auto_vsainstance._create_hypervisor_object(
+            disk_restore_options._destination_pseudo_client)
+        dest_client_hypervisor.machine.remove_directory(disk_restore_dest)
+
     def disk_validation(self, vm_obj, destination_client_name, disk_restore_destination, dest_machine):
         """
         Performs Disk Validation by mounting the restored disk on the Host
@@ -2199,88 +2355,126 @@ class AutoVSASubclient(object):
         """
         try:
 
-            #"""
-            if vm_restore_options.in_place_overwrite:
-                vm_restore_job = self.subclient.full_vm_restore_in_place(
-                    overwrite=vm_restore_options.unconditional_overwrite,
-                    power_on=vm_restore_options.power_on_after_restore,
-                    copy_precedence=vm_restore_options.copy_precedence,
-                    add_to_failover=vm_restore_options.register_with_failover)
+            vm_restore_job = self.submit_virtual_machine_restore(vm_restore_options)
 
-            else:
-                def hyperv():
-                    if self.backup_folder_name:
-                        vm_restore_dest = os.path.join(vm_restore_options.destination_path,
-                                                       self.backup_folder_name)
-                    else:
-                        vm_restore_dest = vm_restore_options.destination_path
-                    vm_restore_options.destination_path = vm_restore_dest
-                    vm_restore_job = self.subclient.full_vm_restore_out_of_place(
-                        destination_client=vm_restore_options._destination_pseudo_client,
-                        proxy_client=vm_restore_options._dest_client_name,
-                        destination_path=vm_restore_options.destination_path,
-                        overwrite=vm_restore_options.unconditional_overwrite,
-                        power_on=vm_restore_options.power_on_after_restore,
-                        copy_precedence=vm_restore_options.copy_precedence,
-                        add_to_failover=vm_restore_options.register_with_failover,
-                        restore_option=vm_restore_options.advanced_restore_options)
-                    return vm_restore_job
-
-                def fusion_compute():
-                    vm_restore_job = self.subclient.full_vm_restore_out_of_place(
-                        destination_client=vm_restore_options._destination_pseudo_client,
-                        proxy_client=vm_restore_options._dest_client_name,
-                        datastore=vm_restore_options.datastore,
-                        host=vm_restore_options.host,
-                        overwrite=vm_restore_options.unconditional_overwrite,
-                        power_on=vm_restore_options.power_on_after_restore,
-                        copy_precedence=vm_restore_options.copy_precedence)
-                    return vm_restore_job
-
-                def vmware():
-                    if self.backup_folder_name:
-                        vm_restore_dest = os.path.join(vm_restore_options.destination_path,
-                                                       self.backup_folder_name)
-                    else:
-                        vm_restore_dest = vm_restore_options.destination_path
-                    vm_restore_options.destination_path = vm_restore_dest
-                    vm_restore_job = self.subclient.full_vm_restore_out_of_place(
-                        overwrite=vm_restore_options.unconditional_overwrite,
-                        power_on=vm_restore_options.power_on_after_restore,
-                        proxy_client=vm_restore_options._dest_client_name,
-                        copy_precedence=vm_restore_options.copy_precedence,
-                        vcenter_client=vm_restore_options._dest_client_name,
-                        datastore=vm_restore_options._datastore,
-                        esx_host=vm_restore_options._host[0]
-                    )
-                    return vm_restore_job
-
-                hv_dict = {"hyper-v": hyperv, "fusioncompute": fusion_compute, "vmware": vmware}
-                vm_restore_job = (hv_dict[vm_restore_options.dest_auto_vsa_instance.vsa_instance_name.lower()])()
-
-      
             if not vm_restore_job.wait_for_completion():
                 raise Exception(
                     "Failed to run VM  restore  job with error: " +
                     str(vm_restore_job.delay_reason)
                 )
 
-            # """
-
-            for vm in self.vm_list:
-                if vm_restore_options.in_place_overwrite:
-                    restore_vm_name = vm
-                else:
-                    restore_vm_name = "Delete" + vm
-                if vm_restore_options.restore_backup_job is not None:
-                    self.vm_restore_validation(vm, restore_vm_name, vm_restore_options, 'Basic')
-                else:
-                    self.vm_restore_validation(vm, restore_vm_name, vm_restore_options)
+            self.validate_virtual_machine_restore(vm_restore_options)
 
         except Exception as err:
             self.log.error("Exception while submitting Restore job:" + str(err))
             raise err
 
+    def submit_virtual_machine_restore(self, vm_restore_options):
+        """
+        submits the Full VM restore of the subclient, without waiting for the job
+
+        Args:
+                vm_restore_options  (obj)   - options of the VM restore, the destination path
+                                                of the options is updated with the backup folder
+
+        Return:
+                job     (obj)   - Job of the VM restore
+
+        """
+        if vm_restore_options.in_place_overwrite:
+            vm_restore_job = self.subclient.full_vm_restore_in_place(
+                overwrite=vm_restore_options.unconditional_overwrite,
+                power_on=vm_restore_options.power_on_after_restore,
+                copy_precedence=vm_restore_options.copy_precedence,
+                add_to_failover=vm_restore_options.register_with_failover)
+
+        else:
+            def hyperv():
+                if self.backup_folder_name:
+                    vm_restore_dest = os.path.join(vm_restore_options.destination_path,
+                                                   self.backup_folder_name)
+                else:
+                    vm_restore_dest = vm_restore_options.destination_path
+                vm_restore_options.destination_path = vm_restore_dest
+                vm_restore_job = self.subclient.full_vm_restore_out_of_place(
+                    destination_client=vm_restore_options._destination_pseudo_client,
+                    proxy_client=vm_restore_options._dest_client_name,
+                    destination_path=vm_restore_options.destination_path,
+                    overwrite=vm_restore_options.unconditional_overwrite,
+                    power_on=vm_restore_options.power_on_after_restore,
+                    copy_precedence=vm_restore_options.copy_precedence,
+                    add_to_failover=vm_restore_options.register_with_failover,
+                    restore_option=vm_restore_options.advanced_restore_options)
+                return vm_restore_job
+
+            def fusion_compute():
+                vm_restore_job = self.subclient.full_vm_restore_out_of_place(
+                    destination_client=vm_restore_options._destination_pseudo_client,
+                    proxy_client=vm_restore_options._dest_client_name,
+                    datastore=vm_restore_options.datastore,
+                    host=vm_restore_options.host,
+                    overwrite=vm_restore_options.unconditional_overwrite,
+                    power_on=vm_restore_options.power_on_after_restore,
+                    copy_precedence=vm_restore_options.copy_precedence)
+                return vm_restore_job
+
+            def vmware():
+                if self.backup_folder_name:
+                    vm_restore_dest = os.path.join(vm_restore_options.destination_path,
+                                                   self.backup_folder_name)
+                else:
+                    vm_restore_dest = vm_restore_options.destination_path
+                vm_restore_options.destination_path = vm_restore_dest
+                vm_restore_job = self.subclient.full_vm_restore_out_of_place(
+                    overwrite=vm_restore_options.unconditional_overwrite,
+                    power_on=vm_restore_options.power_on_after_restore,
+                    proxy_client=vm_restore_options._dest_client_name,
+                    copy_precedence=vm_restore_options.copy_precedence,
+                    vcenter_client=vm_restore_options._dest_client_name,
+                    datastore=vm_restore_options._datastore,
+                    esx_host=vm_restore_options._host[0]
+                )
+                return vm_restore_job
+
+            hv_dict = {"hyper-v": hyperv, "fusioncompute": fusion_compute, "vmware": vmware}
+            vm_restore_job = (hv_dict[vm_restore_options.dest_auto_vsa_instance.vsa_instance_name.lower()])()
+
+        return vm_restore_job
+
+    def validate_virtual_machine_restore(self, vm_restore_options):
+        """
+        validates the VMs restored by the Full VM restore
+
+        Args:
+                vm_restore_options  (obj)   - options of the VM restore
+
+        Exception:
+                if validation fails
+
+        """
+        if vm_restore_options.in_place_overwrite:
+            restore_vms = OrderedDict((vm, vm) for vm in self.vm_list)
+        else:
+            restore_vms = OrderedDict(("Delete" + vm, vm) for vm in self.vm_list)
+
+        if vm_restore_options.restore_backup_job is not None:
+            prop = 'Basic'
+        else:
+            prop = 'Advanced'
+
+        dest_client_hypervisor = vm_restore_options.dest_client_hypervisor
+        if vm_restore_options.power_on_after_restore:
+            # VM objects of all the restored VMs are created at once
+            dest_client_hypervisor.VMs = [restore_vm for restore_vm in restore_vms
+                                          if restore_vm not in dest_client_hypervisor.VMs]
+
+        def validate_restored_vm(restore_vm_name):
+            self.vm_restore_validation(
+                restore_vms[restore_vm_name], restore_vm_name, vm_restore_options, prop)
+
+        # validation of the restored VMs is limited by the destination hypervisor
+        dest_client_hypervisor.run_vm_operation(validate_restored_vm, list(restore_vms))
+
     def vm_restore_validation(self, vm, restore_vm, vm_restore_options, prop='Advanced'):
         """
         Param:
@@ -2294,25 +2488,27 @@ class AutoVSASubclient(object):
         """
         try:
             # self.hvobj.VMs[vm].update_vm_info('All')
+            # VMs are validated concurrently, source object is local to the validation
             if vm_restore_options.in_place_overwrite:
                 self.log.info("it is Inplace restore")
-                self.source_obj = self.__deepcopy__((self.hvobj.VMs[vm]))
+                source_obj = self.__deepcopy__((self.hvobj.VMs[vm]))
             else:
-                self.source_obj = self.hvobj.VMs[vm]
+                source_obj = self.hvobj.VMs[vm]
 
             on_premise = VirtualServerConstants.on_premise_hypervisor(
                                         vm_restore_options.dest_client_hypervisor.instance_type)
             if vm_restore_options.power_on_after_restore :
-                vm_restore_options.dest_client_hypervisor.VMs = restore_vm
+                if restore_vm not in vm_restore_options.dest_client_hypervisor.VMs:
+                    vm_restore_options.dest_client_hypervisor.VMs = restore_vm
                 vm_restore_options.dest_client_hypervisor.VMs[restore_vm].update_vm_info('All')
                 restore_obj = vm_restore_options.dest_client_hypervisor.VMs[restore_vm]
 
                 if vm_restore_options.in_place_overwrite and on_premise:
-                    if not restore_obj.GUID == self.source_obj.GUID:
+                    if not restore_obj.GUID == source_obj.GUID:
                         raise Exception("The GUID id of the in place restored VM does not match the source VM")
-                if not restore_obj.NoofCPU == self.source_obj.NoofCPU:
+                if not restore_obj.NoofCPU == source_obj.NoofCPU:
                     raise Exception("The CPU count does not match for the source and restored VM")
-                if not restore_obj.Diskcount == self.source_obj.Diskcount:
+                if not restore_obj.Diskcount == source_obj.Diskcount:
                     raise Exception("The disk count does not match for the source and restored VM")
 
                 if prop == 'Basic':
@@ -2322,7 +2518,7 @@ class AutoVSASubclient(object):
                 else:
                     if ((not (re.match(VirtualServerConstants.Ip_regex, "%s" % restore_obj.IP))) and (
                                                                              not (restore_obj.IP is None))):
-                        for each_drive in self.source_obj.drive_list:
+                        for each_drive in source_obj.drive_list:
                             dest_location = os.path.join(each_drive, "\\", self.backup_folder_name, "TestData")
                             self.fs_testdata_validation(restore_obj.machine, dest_location)
                     else:
@@ -2332,7 +2528,7 @@ class AutoVSASubclient(object):
 
             elif ((self.hvobj.VMs[vm].GuestOS == "Windows") and (
                         not vm_restore_options.in_place_overwrite) and (on_premise)):
-                    self.disk_validation(self.source_obj, vm_restore_options._destination_pseudo_client,
+                    self.disk_validation(source_obj, vm_restore_options._destination_pseudo_client,
                                          vm_restore_options.destination_path)
             else:
                     self.log.info(
@@ -2344,6 +2540,18 @@ class AutoVSASubclient(object):
             self.log.exception("Exception occurred in VM restore validation " + str(err))
             raise Exception("Exception in VM restore validation")
 
+    @property
+    def job_history(self):
+        """
+        Returns the indexed history of the backup jobs of the subclient, refreshed with the
+        jobs newer than the last job seen
+        """
+        if self._job_history is None:
+            self._job_history = JobHistory(self.auto_commcell.csdb_access, self.subclient_id)
+
+        self._job_history.refresh()
+        return self._job_history
+
     def _get_all_backup_jobs(self):
         """
         Get all the backup jobs for the subclient
@@ -2358,44 +2566,16 @@ class AutoVSASubclient(object):
                                     }
                     }
         """
-        job_history ={}
-
-        _query = "select distinct BS.jobID, BS.bkpLevel, BS.fullCycleNum, DS.auxCopyJobId " \
-                 "from JMBkpStats as BS join JMJobDataStats as DS ON BS.jobId = DS.jobId " \
-                 "where BS.agedTime = 0 and BS.appId={0}".format(self.subclient_id)
-        self.csdb.execute(_query)
-
-        _results = self.csdb.fetch_all_rows()
-
-        for result in _results:
-            cycle_num = result[2].strip()
-            job_id = result[0].strip()
-            level = result[1].strip()
-            aux_copy = result[3].strip()
-            if cycle_num in job_history.keys():
-                if level in job_history[cycle_num].keys():
-                    if job_id in job_history[cycle_num][level].keys():
-                        aux_jobs = job_history[cycle_num][level][job_id]
-                        aux_jobs.append(aux_copy)
-                        aux_jobs = list(set(aux_jobs))
-                        try:
-                            aux_jobs.remove('0')
-                        except ValueError:
-                            pass
-                        job_history[cycle_num][level][job_id] = aux_jobs
-                    else:
-                        job_history[cycle_num][level][job_id] = [aux_copy]
-                else:
-                    job_history[cycle_num][level] = {job_id: [aux_copy]}
-            else:
-                job_history[cycle_num] = {level: {}}
-                job_history[cycle_num][level] = {job_id: [aux_copy]}
+        if self._job_history is None:
+            self._job_history = JobHistory(self.auto_commcell.csdb_access, self.subclient_id)
 
-        return job_history
+        # full refresh, so the jobs aged since the last refresh are dropped
+        self._job_history.refresh(full=True)
+        return self._job_history.as_dict()
 
     def create_ini_files(self):
         """
-        Create a temp folder and files for storing and verifying changeID
+        Create a temp folder for the run, and the CBT ledger for storing and verifying changeID
 
         Raise Exception:
                 If unable to create temp folder and files
@@ -2410,16 +2590,31 @@ class AutoVSASubclient(object):
 
             current_date = controller_machine.create_current_timestamp_folder(path_dir, "date")
             current_time = controller_machine.create_current_timestamp_folder(current_date, "time")
-            controller_machine.create_file(os.path.join(current_time, "cbtStats.ini"), "$null")
-            controller_machine.create_file(os.path.join(current_time, "usedChangeIDStatus.ini"), "$null")
+            self._cbt_ledger = CBTLedger(os.path.join(current_time, LEDGER_FILE))
         except Exception as err:
             self.log.exception(
                 "Exception while creating files" + str(err))
             raise err
 
+    @property
+    def cbt_ledger(self):
+        """
+        Returns the CBT ledger of the run, loading the ledger of the latest run folder
+        if it was not created by this object
+        """
+        if self._cbt_ledger is None:
+            _vserver_path = os.path.dirname(VirtualServerUtils.UTILS_PATH)
+            path_dir = os.path.join(_vserver_path, "TestCases", "CBT")
+            controller_machine = Machine(socket.getfqdn(), self.auto_commcell.commcell)
+            curfolder = controller_machine.get_latest_timestamp_file_or_folder(path_dir)
+            curfolder = controller_machine.get_latest_timestamp_file_or_folder(curfolder)
+            self._cbt_ledger = CBTLedger(os.path.join(curfolder, LEDGER_FILE))
+
+        return self._cbt_ledger
+
     def get_changeid_from_metadata(self, backup_type, backupjobid=None):
         """
-        Get changeID generated for given backup job
+        Get changeID generated for given backup job, for all the VMs
 
         Args:
                 backup_type    (String) - FULL/INCR/DIFF/SYNTH_FULL
@@ -2430,21 +2625,17 @@ class AutoVSASubclient(object):
 
         """
         try:
-            _vserver_path = os.path.dirname(VirtualServerUtils.UTILS_PATH)
-            path_dir = os.path.join(_vserver_path, "TestCases", "CBT")
-            controller_machine = Machine(socket.getfqdn(), self.auto_commcell.commcell)
-            curfolder = controller_machine.get_latest_timestamp_file_or_folder(path_dir)
-            curfolder = controller_machine.get_latest_timestamp_file_or_folder(curfolder)
-            for each_vm in self.vm_list:
+            if backupjobid is None:
+                backupjobid = self.subclient.find_latest_job(include_active=False)
+            cbt_ledger = self.cbt_ledger
+
+            def collect_changeid(each_vm):
                 vmguid = self.hvobj.VMs[each_vm].GUID
-                pathtoBrowse1 = "\\" + vmguid
-                fileToWriteTo = open(curfolder + "\\cbtStats.ini", "a")
-                fileToWriteTo.write("\n[" + backup_type + "_" + each_vm + "]\n")
-                fileToWriteTo.close()
-                if backupjobid is None:
-                    backupjobid = self.subclient.find_latest_job(include_active=False)
-                response_json = self.get_metadata(backupjobid._job_id, pathtoBrowse1)
-                self.write_changeid_tofile(response_json)
+                response_json = self.get_metadata(backupjobid._job_id, "\\" + vmguid)
+                cbt_ledger.record_generated(
+                    backup_type, each_vm, extract_change_ids(response_json))
+
+            self.hvobj.run_vm_operation(collect_changeid, self.vm_list)
         except Exception as err:
             self.log.exception(
                 "Exception while getting changeID from Metadata" + str(err))
@@ -2486,48 +2677,48 @@ class AutoVSASubclient(object):
                 "Exception while getting metadata using browse request" + str(err))
             raise err
 
-
-    def write_changeid_tofile(self, response_json):
+    def _copy_cbt_stats(self, each_vm, cbtstat_folder, proxy_machines):
         """
-        Find and write changeID generated for given backupjob to cbtStats.ini file
+        Find and copy cbt_stat folder of the VM from the proxy to controller machine
 
         Args:
-                response_json    (string) Browse response received for given VM
+                each_vm             (string) VM whose CBT stats are copied
+                cbtstat_folder      (string) Folder to which CBT stats are stored on HyperV
+                proxy_machines      (dict)   Machine object of each proxy, of the worker
 
-        Raise Exception:
-                If unable to find and write changeID 
-
-        """
-        try:
-            # Open the file to write to
-            _vserver_path = os.path.dirname(VirtualServerUtils.UTILS_PATH)
-            path_dir = os.path.join(_vserver_path, "TestCases", "CBT")
+        Return:
+                destvmcbt_stat      (string) local folder with the CBT stat files of the VM
+
+        """
+        vmguid = self.hvobj.VMs[each_vm].GUID
+        vmcbtstat_folder = os.path.join(cbtstat_folder, str(vmguid).upper())
+        for each_proxy, proxy_machine in proxy_machines.items():
+            if proxy_machine.check_directory_exists(vmcbtstat_folder):
+                break
+        _vserver_path = os.path.dirname(VirtualServerUtils.UTILS_PATH)
+        cbt_stat = os.path.join(_vserver_path, "TestCases", "CBTStats")
+        destvmcbt_stat = os.path.join(cbt_stat, str(vmguid).upper())
+        if proxy_machine.is_local_machine:
+            if not proxy_machine.check_directory_exists(destvmcbt_stat):
+                proxy_machine.create_directory(destvmcbt_stat)
+            proxy_machine.copy_folder(vmcbtstat_folder, destvmcbt_stat)
+        else:
             controller_machine = Machine(socket.getfqdn(), self.auto_commcell.commcell)
-            curfolder = controller_machine.get_latest_timestamp_file_or_folder(path_dir)
-            curfolder = controller_machine.get_latest_timestamp_file_or_folder(curfolder)
-            fileToWriteTo = open(curfolder + "\\cbtStats.ini", "a")
-            for key, value in response_json.items():
-                for key1, value1 in value.items():
-                    if 'name' in key1:
-                        path_name = value1
-                    if 'advanced_data' in key1:
-                        for key2, value2 in value1.items():
-                            if 'browseMetaData' in key2:
-                                for key3, value3 in value2.items():
-                                    if 'virtualServerMetaData' in key3:
-                                        for key4, value4 in value3.items():
-                                            if 'changeId' in key4:
-                                                fileToWriteTo.write(path_name + ":" + value4 + "\n")
-            fileToWriteTo.close()
-        except Exception as err:
-            self.log.exception(
-                "Exception while finding and writing changeID to file " + str(err))
-            raise err
+            _dest_base_path = os.path.splitdrive(vmcbtstat_folder)
+            host_name = self.auto_commcell.get_hostname_for_client(each_proxy)
+            remote_vmcbtstat_folder = "\\\\" + host_name + "\\" + _dest_base_path[0].replace(
+                        ":", "$") + _dest_base_path[-1]
+            if not controller_machine.check_directory_exists(destvmcbt_stat):
+                controller_machine.create_directory(destvmcbt_stat)
+            controller_machine.copy_files_from_network_share(destvmcbt_stat, remote_vmcbtstat_folder, self.auto_vsainstance.user_name, self.auto_vsainstance.password)
+        proxy_machine.remove_directory(vmcbtstat_folder)
+        self.log.info("Copied CBTstat folder at {0}".format(destvmcbt_stat))
+        return destvmcbt_stat
 
     def parse_diskcbt_stats(self, cbtstat_folder, backup_type):
         """
-        Find and copy cbt_stat file from hyperv to controller machine.
-        And write changedID used by given backup to usedChangeIDStatus.ini file
+        Find and copy cbt_stat file from hyperv to controller machine, for all the VMs
+        in parallel. And record changedID used by given backup in the CBT ledger
 
         Args:
                 cbtstat_folder    (string) Folder to which CBT stats are stored on HyperV
@@ -2538,63 +2729,22 @@ class AutoVSASubclient(object):
 
         """
         try:
-            for each_vm in self.vm_list:
-                #get CBTstat file and copy it on local system
-                vmguid = self.hvobj.VMs[each_vm].GUID
-                vmcbtstat_folder = os.path.join(cbtstat_folder, str(vmguid).upper())
-                for each_proxy in self.auto_vsainstance.proxy_list:
-                    proxy_machine = Machine(each_proxy, self.auto_commcell.commcell)
-                    if proxy_machine.check_directory_exists(vmcbtstat_folder):
-                        break
-                _vserver_path = os.path.dirname(VirtualServerUtils.UTILS_PATH)
-                cbt_folder = os.path.join(_vserver_path, "TestCases", "CBT")
-                cbt_stat = os.path.join(_vserver_path, "TestCases", "CBTStats")
-                destvmcbt_stat = os.path.join(cbt_stat, str(vmguid).upper())
-                if proxy_machine.is_local_machine:
-                    if not proxy_machine.check_directory_exists(destvmcbt_stat) :
-                        proxy_machine.create_directory(destvmcbt_stat)
-                    proxy_machine.copy_folder(vmcbtstat_folder, destvmcbt_stat)
-                else:
-                    controller_machine = Machine(socket.getfqdn(), self.auto_commcell.commcell)
-                    _dest_base_path = os.path.splitdrive(vmcbtstat_folder)
-                    host_name = self.auto_commcell.get_hostname_for_client(each_proxy)
-                    remote_vmcbtstat_folder = "\\\\" + host_name + "\\" + _dest_base_path[0].replace(
-                                ":", "$") + _dest_base_path[-1]
-                    if not controller_machine.check_directory_exists(destvmcbt_stat):
-                        controller_machine.create_directory(destvmcbt_stat)
-                    controller_machine.copy_files_from_network_share(destvmcbt_stat, remote_vmcbtstat_folder, self.auto_vsainstance.user_name, self.auto_vsainstance.password)
-                proxy_machine.remove_directory(vmcbtstat_folder)
-                self.log.info("Copied CBTstat folder at {0}".format(destvmcbt_stat))
-
-                #Find and write changeID used
-                curfolder = controller_machine.get_latest_timestamp_file_or_folder(cbt_folder)
-                curfolder = controller_machine.get_latest_timestamp_file_or_folder(curfolder)
-                fileToWriteTo = open(curfolder + "\\usedChangeIDStatus.ini", "a")
-                fileToWriteTo.write("\n[" + backup_type + "_" + each_vm + "]\n")
-                paths1 = [os.path.join(destvmcbt_stat, fn) for fn in next(os.walk(destvmcbt_stat))[2]]
-                paths = []
-                for element in paths1:
-                    if "avhdx.txt" not in element.lower() and (".vhd" in element.lower() or ".vhdx" in element.lower()):
-                        paths.append(element)
-                previousChangedIDUsed = {}
-                diskName = ""
-                for file in paths:
-                    statsFile = open(file, "r")
-                    lines = statsFile.readlines()
-                    for line in lines:
-                        if "ChangeId from previous job : " in line:
-                            changeIDLine = line
-                            subStrChangeID = changeIDLine.index("[")
-                            subStrChangeID2 = changeIDLine.index("]")
-                            lenLine = len(line)
-                            changeID = changeIDLine[subStrChangeID + 1:subStrChangeID2]
-                            indexDash = file.rfind("-")
-                            diskName = file[indexDash + 1:len(file) - 4]
-                            previousChangedIDUsed[diskName] = changeID
-                            fileToWriteTo.write(diskName + ":" + changeID + "\n")
-                    statsFile.close()
-                    os.remove(file)
-                fileToWriteTo.close()
+            cbt_ledger = self.cbt_ledger
+            # Machine objects are not thread safe, each worker creates its own proxy machines
+            worker = threading.local()
+
+            def collect_used_changeid(each_vm):
+                if not hasattr(worker, "proxy_machines"):
+                    worker.proxy_machines = OrderedDict(
+                        (each_proxy, Machine(each_proxy, self.auto_commcell.commcell))
+                        for each_proxy in self.auto_vsainstance.proxy_list)
+
+                destvmcbt_stat = self._copy_cbt_stats(
+                    each_vm, cbtstat_folder, worker.proxy_machines)
+                cbt_ledger.record_used(
+                    backup_type, each_vm, parse_cbt_stat_files(destvmcbt_stat))
+
+            self.hvobj.run_vm_operation(collect_used_changeid, self.vm_list)
         except Exception as err:
             self.log.exception(
                 "Exception while parsing and writing used changeID to file " + str(err))
@@ -2613,38 +2763,7 @@ class AutoVSASubclient(object):
 
         """
         try:
-            import configparser
-            _vserver_path = os.path.dirname(VirtualServerUtils.UTILS_PATH)
-            cbt_folder = os.path.join(_vserver_path, "TestCases", "CBT")
-            controller_machine = Machine(socket.getfqdn(), self.auto_commcell.commcell)
-            currentfolder = controller_machine.get_latest_timestamp_file_or_folder(cbt_folder)
-            currentfolder = controller_machine.get_latest_timestamp_file_or_folder(currentfolder)
-            changeid_generatedfile = os.path.join(currentfolder, "cbtStats.ini")
-            changeid_usedfile = os.path.join(currentfolder, "usedChangeIDStatus.ini")
-            Config_Curr = configparser.ConfigParser(strict=False)
-            Config_Curr.read(changeid_usedfile)
-            Config_Prev = configparser.ConfigParser(strict=False)
-            Config_Prev.read(changeid_generatedfile)
-            if backup_type is "DIFFERENTIAL":
-                cmp_bk_type = "FULL"
-            else:
-                cmp_bk_type = "INCREMENTAL"
-            for each_vm in self.vm_list:
-                if not Config_Prev.has_section(cmp_bk_type + "_" + each_vm):
-                    cmp_bk_type = "FULL"
-                currentDict = Config_Prev[cmp_bk_type + "_" + each_vm]
-                previousDict = Config_Curr[backup_type + "_" + each_vm]
-                for curKey in currentDict:
-                    if currentDict[curKey].strip() != previousDict[curKey].strip():
-                        self.log.info(
-                            "Used incorrect change IDs for {0} backup for Disk {1}".format(backup_type,
-                                                                                          curKey))
-                        return False
-                    else:
-                        self.log.info(
-                            "Used correct change IDs for {0} backup Disk {1}".format(backup_type, curKey))
-
-            return True
+            return not self.cbt_ledger.verify(backup_type, self.vm_list)
         except Exception as err:
             self.log.exception(
                 "Exception while verifying changeID used by job " + str(err))
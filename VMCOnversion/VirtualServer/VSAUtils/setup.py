@@ -3,7 +3,7 @@ import os
 
 base = None
 
-path = os.path.join(os.path.dirname(__file__),"Extentcounttemp.py")
+path = os.path.join(os.path.dirname(__file__),"Extentcount.py")
 build_path = os.path.join(os.path.dirname(__file__),"build")
 
 executables = [Executable(path, base=base)]
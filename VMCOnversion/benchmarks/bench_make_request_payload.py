@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------------
+# Copyright Commvault Systems, Inc.
+# See LICENSE.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+"""Benchmark for preparing the XML payloads of the POST requests of CVPySDK.make_request.
+
+Compares the CPU time spent before the request is sent, for large qcommand XML payloads, of:
+
+    #.  legacy      -   headers copied, payload encoded, and parsed by xmltodict to decide the
+    Content-type, as done by make_request before the typed payloads
+
+    #.  sniffed     -   untyped string payload, converted by as_payload(), which checks only
+    the first character of the payload
+
+    #.  typed       -   XmlPayload, as passed by the qcommand, and execute script requests
+
+The time taken to send the request is not included, as it is the same for all of them.
+
+Usage:
+
+    python bench_make_request_payload.py [--entries 1000 20000 100000] [--repeat 5]
+
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cvpysdk.payload import XmlPayload      # noqa: E402
+from cvpysdk.payload import as_payload      # noqa: E402
+
+try:
+    import xmltodict
+except ImportError:
+    xmltodict = None
+
+
+HEADERS = {
+    'Host': 'webconsole.example.com',
+    'Accept': 'application/json',
+    'Content-type': 'application/json',
+    'Authtoken': 'QSDK {0}'.format('0' * 512)
+}
+
+
+def qcommand_payload(entries):
+    """Returns the qcommand XML to update the content of a subclient, with the given entries."""
+    content = ''.join(
+        '<content><path val="C:\\\\Data\\\\Folder{0:06d}\\\\*"/></content>'.format(index)
+        for index in range(entries)
+    )
+
+    return (
+        '<App_UpdateSubClientPropertiesRequest>'
+        '<association><entity clientName="client01" appName="File System" '
+        'backupsetName="defaultBackupSet" subclientName="default"/></association>'
+        '<subClientProperties>{0}</subClientProperties>'
+        '</App_UpdateSubClientPropertiesRequest>'
+    ).format(content)
+
+
+def legacy(payload):
+    """Prepares the request as make_request did, before the typed payloads."""
+    headers = HEADERS.copy()
+    payload = payload.encode()
+
+    if 'Content-type' in headers:
+        try:
+            xmltodict.parse(payload)
+            headers['Content-type'] = 'application/xml'
+        except Exception:
+            headers['Content-type'] = 'text/plain'
+
+    return headers, payload
+
+
+def sniffed(payload):
+    """Prepares the request for an untyped string payload."""
+    payload = as_payload(payload)
+    return payload.headers(HEADERS), payload.body()
+
+
+def typed(payload):
+    """Prepares the request for an XmlPayload."""
+    payload = XmlPayload(payload)
+    return payload.headers(HEADERS), payload.body()
+
+
+def measure(function, payload, repeat):
+    """Returns the best CPU time of the function, for the given payload."""
+    timings = []
+
+    for _ in range(repeat):
+        start_time = time.process_time()
+        function(payload)
+        timings.append(time.process_time() - start_time)
+
+    return min(timings)
+
+
+def main():
+    """Runs the benchmark for the qcommand payloads, and prints the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--entries', type=int, nargs='+', default=[1000, 20000, 100000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    preparers = [('sniffed', sniffed), ('typed', typed)]
+
+    if xmltodict is not None:
+        preparers.insert(0, ('legacy', legacy))
+    else:
+        print('xmltodict is not installed, skipping the legacy preparer\n')
+
+    print('{:<12}{:>12}  {:<10}{:>14}'.format('Entries', 'Size (MB)', 'Preparer', 'CPU (ms)'))
+
+    for entries in args.entries:
+        payload = qcommand_payload(entries)
+
+        for name, preparer in preparers:
+            best = measure(preparer, payload, args.repeat)
+            print('{:<12}{:>12.2f}  {:<10}{:>14.3f}'.format(
+                entries, len(payload) / 1048576.0, name, best * 1000
+            ))
+
+
+if __name__ == '__main__':
+    main()
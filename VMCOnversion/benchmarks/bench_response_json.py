@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------------
+# Copyright Commvault Systems, Inc.
+# See LICENSE.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+"""Benchmark for decoding the large JSON responses of the SDK collections.
+
+Compares the parse time and the peak memory of:
+
+    #.  legacy      -   response.json() called 3 times on the same response, as done by the
+    collection loaders before the CVResponse wrapper
+
+    #.  cached      -   CVResponse, decoding the body only once
+
+    #.  streaming   -   CVResponse.iter_items(), parsing the items incrementally
+    (only if ijson is installed)
+
+for synthetic clients and jobs list payloads.
+
+Usage:
+
+    python bench_response_json.py [--clients 20000] [--jobs 50000] [--repeat 3]
+
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cvpysdk import response as cv_response     # noqa: E402
+from cvpysdk.response import CVResponse         # noqa: E402
+
+
+class _StaticResponse(object):
+    """Minimal stand-in for requests.Response, holding an already downloaded body."""
+
+    def __init__(self, content):
+        self.content = content
+
+    def json(self, **kwargs):
+        return json.loads(self.content.decode('utf-8'), **kwargs)
+
+
+def clients_payload(count):
+    """Returns the body of the GET_ALL_CLIENTS response, with the given number of clients."""
+    return json.dumps({
+        'clientProperties': [{
+            'client': {
+                'clientEntity': {
+                    'clientName': 'client{0:06d}'.format(index),
+                    'clientId': index,
+                    'hostName': 'client{0:06d}.example.com'.format(index),
+                    'displayName': 'Client {0}'.format(index),
+                    'clientGUID': '{0:032x}'.format(index)
+                },
+                'osInfo': {'Type': 'Windows', 'SubType': 'Server', 'Version': '10.0'}
+            }
+        } for index in range(count)]
+    }).encode('utf-8')
+
+
+def jobs_payload(count):
+    """Returns the body of the ALL_JOBS response, with the given number of jobs."""
+    return json.dumps({
+        'totalRecordsWithoutPaging': count,
+        'jobs': [{
+            'jobSummary': {
+                'jobId': index,
+                'isVisible': True,
+                'status': 'Completed',
+                'localizedOperationName': 'Backup',
+                'percentComplete': 100,
+                'appTypeName': 'Virtual Server',
+                'jobType': 'Backup',
+                'jobStartTime': 1500000000 + index,
+                'lastUpdateTime': 1500000600 + index,
+                'subclient': {'subclientId': index % 500, 'clientName': 'client{0}'.format(index)}
+            }
+        } for index in range(count)]
+    }).encode('utf-8')
+
+
+def legacy(content, key):
+    """Loader calling response.json() 3 times, as the collections did before."""
+    response = _StaticResponse(content)
+
+    if response.json() and key in response.json():
+        return sum(1 for _ in response.json()[key])
+
+
+def cached(content, key):
+    """Loader calling response.json() 3 times, on the caching wrapper."""
+    response = CVResponse(_StaticResponse(content))
+
+    if response.json() and key in response.json():
+        return sum(1 for _ in response.json()[key])
+
+
+def streaming(content, key):
+    """Loader parsing the items of the list incrementally."""
+    response = CVResponse(_StaticResponse(content))
+    return sum(1 for _ in response.iter_items(key))
+
+
+def measure(function, content, key, repeat):
+    """Returns the best time, and the peak memory of the function, for the given payload."""
+    timings = []
+
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        function(content, key)
+        timings.append(time.perf_counter() - start_time)
+
+    tracemalloc.start()
+    function(content, key)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return min(timings), peak
+
+
+def main():
+    """Runs the benchmark for the clients and jobs payloads, and prints the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, default=20000)
+    parser.add_argument('--jobs', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    decoder = getattr(cv_response.fast_json, '__name__', 'requests (json)')
+    print('JSON decoder: {0}, incremental parser: {1}\n'.format(
+        decoder, 'ijson' if cv_response.ijson else 'not installed'
+    ))
+
+    loaders = [('legacy', legacy), ('cached', cached)]
+
+    if cv_response.ijson is not None:
+        loaders.append(('streaming', streaming))
+
+    payloads = [
+        ('clients x {0}'.format(args.clients), clients_payload(args.clients), 'clientProperties'),
+        ('jobs x {0}'.format(args.jobs), jobs_payload(args.jobs), 'jobs')
+    ]
+
+    print('{:<20}{:>12}  {:<10}{:>12}{:>16}'.format(
+        'Payload', 'Size (MB)', 'Loader', 'Time (ms)', 'Peak (MB)'
+    ))
+
+    for name, content, key in payloads:
+        for loader_name, loader in loaders:
+            best, peak = measure(loader, content, key, args.repeat)
+            print('{:<20}{:>12.1f}  {:<10}{:>12.1f}{:>16.1f}'.format(
+                name, len(content) / 1048576.0, loader_name, best * 1000, peak / 1048576.0
+            ))
+
+
+if __name__ == '__main__':
+    main()
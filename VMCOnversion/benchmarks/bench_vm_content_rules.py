@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------------
+# Copyright Commvault Systems, Inc.
+# See LICENSE.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+"""Benchmark for evaluating the dynamic VM content rules of a VSA subclient.
+
+Compares, for a synthetic inventory of VMs:
+
+    #.  legacy      -   every rule evaluated against every VM, one regex at a time, as done by
+    AutoVSASubclient.process_sc_input_for_vm_list() before the ContentRuleSet
+
+    #.  bulk        -   ContentRuleSet, rules compiled into one matcher per attribute, and all
+    VMs evaluated in a single pass
+
+and verifies that both select the same VMs.
+
+Only the evaluation of the rules is timed, the attributes of the VMs are synthetic, and
+fetching them from the hypervisor is not measured.
+
+Usage:
+
+    python bench_vm_content_rules.py [--vms 50000] [--repeat 3]
+
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from VirtualServer.VSAUtils import VirtualServerConstants       # noqa: E402
+from VirtualServer.VSAUtils.ContentRules import ContentRuleSet  # noqa: E402
+
+
+CONTENT = [
+    '[VM]=Starts with=prod*',
+    '[VM]=Ends with=-db',
+    '[VM]=Contains=web',
+    '[VM]=Equals=test00042',
+    '[OS]=Contains=Windows',
+    '[DS]=Equals=datastore0[1-3]',
+    '[VM]=Does Not Contains=tmp',
+    '[OS]=Does Not Equals=Other'
+]
+
+GUEST_OS = ['Windows Server 2016', 'Windows 10', 'Red Hat Enterprise Linux 7', 'Ubuntu Linux',
+            'CentOS 7', 'Other']
+
+PREFIXES = ['prod', 'test', 'dev', 'web', 'app', 'tmp']
+SUFFIXES = ['', '-db', '-web', '-tmp', '-app']
+
+
+def inventory(count):
+    """Returns the attributes of the given number of synthetic VMs."""
+    random.seed(count)
+
+    return dict(
+        (name, {
+            'vm_name': name,
+            'GuestOS': random.choice(GUEST_OS),
+            'Datastore': 'datastore{0:02d}'.format(random.randint(0, 40))
+        })
+        for name in (
+            '{0}{1:05d}{2}'.format(random.choice(PREFIXES), index, random.choice(SUFFIXES))
+            for index in range(count)
+        )
+    )
+
+
+def legacy_match(vm, equality, pattern):
+    """Pattern matching of AutoVSASubclient._match_pattern_in_input(), before ContentRuleSet."""
+    if (equality == "Equals") | (equality == "Does Not Equals"):
+        match = re.search(pattern, vm, flags=re.I)
+        if match:
+            return True
+    elif (equality == "Contains") | (equality == "Does Not Contains"):
+        pattern = ".*" + pattern + ".*"
+
+    elif equality == "Starts with":
+        pattern = pattern + ".*"
+
+    elif equality == "Ends with":
+        pattern = ".*" + pattern
+
+    if (((pattern[len(pattern) - 1] != '*') & (pattern[len(pattern) - 1] != '+'))
+            & (pattern[0] != '.')):
+        pattern = pattern + '$'
+        match = re.match(pattern, vm, flags=re.I)
+
+    elif pattern[0] != '.':
+        match = re.match(pattern, vm, flags=re.I)
+
+    elif (pattern[len(pattern) - 1] != '*') & (pattern[len(pattern) - 1] != '+'):
+        pattern = pattern + '$'
+        match = re.search(pattern, vm, flags=re.I)
+
+    else:
+        match = re.search(pattern, vm, flags=re.I)
+
+    return bool(match)
+
+
+def legacy(vms, content):
+    """Evaluates each rule against each VM, as process_sc_input_for_vm_list() did."""
+    qualified, disqualified = [], []
+
+    for each_content in content:
+        option, equality, pattern = [value.strip() for value in each_content.split('=')]
+        prop = VirtualServerConstants.vm_pattern_names[option]
+
+        for vm in vms:
+            matched = legacy_match(vms[vm][prop], equality, pattern)
+
+            if equality in ("Does Not Equals", "Does Not Contains") and matched:
+                disqualified.append(vm)
+            elif matched:
+                qualified.append(vm)
+
+    return list(set(qualified) - set(disqualified))
+
+
+def bulk(vms, content):
+    """Evaluates all the rules against all the VMs in one pass."""
+    return ContentRuleSet.from_content(content).evaluate(vms)
+
+
+def measure(function, vms, repeat):
+    """Returns the best time, and the result of the function."""
+    timings = []
+
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        result = function(vms, CONTENT)
+        timings.append(time.perf_counter() - start_time)
+
+    return min(timings), result
+
+
+def main():
+    """Runs the benchmark for the synthetic inventory, and prints the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--vms', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    vms = inventory(args.vms)
+    attributes = ContentRuleSet.from_content(CONTENT).attributes
+
+    print('{0} VMs, {1} rules on {2} attributes\n'.format(len(vms), len(CONTENT), len(attributes)))
+    print('{:<10}{:>12}{:>12}'.format('Engine', 'Time (ms)', 'Selected'))
+
+    results = {}
+
+    for name, function in (('legacy', legacy), ('bulk', bulk)):
+        best, results[name] = measure(function, vms, args.repeat)
+        print('{:<10}{:>12.1f}{:>12}'.format(name, best * 1000, len(results[name])))
+
+    if set(results['legacy']) != set(results['bulk']):
+        sys.exit('Selected VMs differ between the legacy and bulk engines')
+
+
+if __name__ == '__main__':
+    main()
@@ -24,6 +24,13 @@ CVPySDK requires the following Python packages to run:
 
 And Commvault Software v11 SP7 or later release with WebConsole installed
 
+CVPySDK uses the following Python packages, if installed, to decode large responses faster:
+    "orjson" / "ujson"
+
+    "ijson"
+
+The optional asyncio layer, **cvpysdk.asynccommcell**, requires Python 3.5 or later
+
 """
 
 __author__ = 'Commvault Systems Inc.'
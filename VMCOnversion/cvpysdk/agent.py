@@ -151,7 +151,7 @@ class Agents(object):
 
                     if response is not success
         """
-        flag, response = self._cvpysdk_object.make_request('GET', self._AGENTS)
+        flag, response = self._cvpysdk_object.make_request('GET', self._AGENTS, cache=True)
 
         if flag:
             if response.json() and 'agentProperties' in response.json():
@@ -309,7 +309,7 @@ class Agent(object):
                     if response is not success
 
         """
-        flag, response = self._cvpysdk_object.make_request('GET', self.GET_AGENT)
+        flag, response = self._cvpysdk_object.make_request('GET', self.GET_AGENT, cache=True)
 
         if flag:
             if response.json() and 'agentProperties' in response.json():
@@ -0,0 +1,441 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------------
+# Copyright Commvault Systems, Inc.
+# See LICENSE.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+"""File for running the Commcell REST API calls concurrently using asyncio.
+
+**Python 3 only**, and is not imported by default with the CVPySDK package.
+
+AsyncCommcell is a thin asyncio layer on top of an already logged-in Commcell instance.
+Requests are run on a thread pool using the pooled HTTP session of the Commcell, and the number
+of requests in flight at any point of time is bounded by a semaphore.
+
+For the best throughput, initialize the Commcell with a **pool_size** at least equal to the
+**concurrency** of the AsyncCommcell, otherwise the extra connections are opened and discarded
+for every request.
+
+Example:
+
+    >>> commcell = Commcell('webconsole', 'admin', 'password', pool_size=50)
+
+    >>> async_commcell = AsyncCommcell(commcell, concurrency=50)
+
+    >>> loop = asyncio.get_event_loop()
+
+    >>> statuses = loop.run_until_complete(async_commcell.wait_for_jobs(job_ids))
+
+
+AsyncCommcell:
+
+    __init__(commcell_object, concurrency)  --  initialize the instance of the AsyncCommcell class,
+    for the given commcell
+
+    __repr__()                      --  returns the string representation of the instance
+
+    _run()                          --  runs the given blocking callable on the thread pool,
+    under the semaphore
+
+    make_request()                  --  awaitable version of the CVPySDK.make_request method
+
+    gather()                        --  runs the given coroutine function on all the inputs
+    concurrently, and returns the results in the same order
+
+    jobs()                          --  returns the dict of jobs on the commcell, for the category
+
+    job_summary()                   --  returns the summary of the job with the given id
+
+    job_status()                    --  returns the current status of the job with the given id
+
+    wait_for_job()                  --  waits for the job with the given id to finish
+
+    wait_for_jobs()                 --  waits for all the jobs with the given ids to finish
+
+    _get_client_id()                --  returns the id of the client with the given name
+
+    client_properties()             --  returns the properties of the client with the given name
+
+    subclient_properties()          --  returns the properties of the given subclient
+
+    browse()                        --  browses the content of the given subclient / backupset
+
+    close()                         --  shuts down the thread pool of the instance
+
+"""
+
+import asyncio
+import functools
+
+from concurrent.futures import ThreadPoolExecutor
+
+from .exception import SDKException
+
+
+JOB_FINISHED_STATUSES = ('completed', 'killed', 'failed')
+"""tuple:   Job status keywords, which specify that the job has finished."""
+
+
+class AsyncCommcell(object):
+    """Class for running the read operations on the Commcell concurrently using asyncio."""
+
+    def __init__(self, commcell_object, concurrency=20):
+        """Initialize the AsyncCommcell object for the given Commcell.
+
+            Args:
+                commcell_object     (object)    --  instance of the Commcell class
+
+                concurrency         (int)       --  maximum number of requests in flight at a time
+
+                    default: 20
+
+            Returns:
+                object  -   instance of the AsyncCommcell class
+
+        """
+        self._commcell_object = commcell_object
+
+        self._cvpysdk_object = commcell_object._cvpysdk_object
+        self._services = commcell_object._services
+        self._update_response_ = commcell_object._update_response_
+
+        self._concurrency = concurrency
+        self._executor = ThreadPoolExecutor(max_workers=concurrency)
+
+        # semaphore is created on first use, to bind to the loop running the coroutines
+        self._semaphore = None
+
+    def __repr__(self):
+        """Representation string for the instance of the AsyncCommcell class."""
+        return "AsyncCommcell class instance for Commcell: '{0}'".format(
+            self._commcell_object.commserv_name
+        )
+
+    async def _run(self, function, *args, **kwargs):
+        """Runs the blocking function on the thread pool, once a slot is available.
+
+            Args:
+                function    (callable)  --  blocking function to run
+
+                args        (tuple)     --  positional arguments to pass to the function
+
+                kwargs      (dict)      --  keyword arguments to pass to the function
+
+            Returns:
+                object  -   value returned by the function
+
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._concurrency)
+
+        async with self._semaphore:
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(
+                self._executor, functools.partial(function, *args, **kwargs)
+            )
+
+    async def make_request(self, method, url, payload=None, headers=None, stream=False):
+        """Awaitable version of the **CVPySDK.make_request** method.
+
+            Args:
+                method      (str)           --  HTTP operation to perform
+
+                url         (str)           --  the web url or service to run the request on
+
+                payload     (dict / str)    --  data to be passed along with the request
+
+                    default: None
+
+                headers     (dict)          --  dict of request headers for the request
+
+                    default: None
+
+                stream      (bool)          --  whether the response should be streamed
+
+                    default: False
+
+            Returns:
+                tuple:
+                    (True, response)    -   in case of success
+
+                    (False, response)   -   in case of failure
+
+        """
+        return await self._run(
+            self._cvpysdk_object.make_request,
+            method,
+            url,
+            payload,
+            headers=headers,
+            stream=stream
+        )
+
+    @staticmethod
+    async def gather(coroutine_function, inputs, return_exceptions=False):
+        """Runs the coroutine function for each of the inputs concurrently.
+
+            Concurrency is bounded by the semaphore of the instance, as long as the coroutine
+            function makes its requests through the instance.
+
+            Args:
+                coroutine_function  (callable)  --  coroutine function accepting a single input
+
+                inputs              (iterable)  --  inputs to run the coroutine function for
+
+                return_exceptions   (bool)      --  return the exceptions as results, instead of
+                raising the first one
+
+                    default: False
+
+            Returns:
+                list    -   results for each of the inputs, in the same order as the inputs
+
+        """
+        return await asyncio.gather(
+            *[coroutine_function(value) for value in inputs],
+            return_exceptions=return_exceptions
+        )
+
+    async def jobs(self, category='ALL', lookup_time=5, **options):
+        """Returns the dict of jobs on the commcell for the given category.
+
+            Args:
+                category        (str)   --  category of the jobs to get
+
+                    Valid Values:
+
+                        - ALL
+
+                        - ACTIVE
+
+                        - FINISHED
+
+                    default: ALL
+
+                lookup_time     (int)   --  get the jobs executed within the number of hours
+
+                    default: 5
+
+                options         (dict)  --  options supported by the JobController class
+
+            Returns:
+                dict    -   dictionary consisting of the job IDs as the key,
+                and their details as its value
+
+        """
+        options['category'] = category
+        options['lookup_time'] = lookup_time
+
+        return await self._run(self._commcell_object.job_controller._get_jobs_list, **options)
+
+    async def job_summary(self, job_id):
+        """Returns the summary of the job with the given id.
+
+            Args:
+                job_id  (str / int)     --  id of the job to get the summary of
+
+            Returns:
+                dict    -   summary of the job
+
+            Raises:
+                SDKException:
+                    if no record found for this job
+
+                    if response is empty
+
+                    if response is not success
+
+        """
+        flag, response = await self.make_request('GET', self._services['JOB'] % job_id)
+
+        if flag:
+            if response.json():
+                if response.json().get('totalRecordsWithoutPaging') == 0:
+                    raise SDKException('Job', '104')
+
+                for job in response.json().get('jobs', []):
+                    return job['jobSummary']
+
+                raise SDKException('Job', '104')
+            else:
+                raise SDKException('Response', '102')
+        else:
+            raise SDKException('Response', '101', self._update_response_(response.text))
+
+    async def job_status(self, job_id):
+        """Returns the current status of the job with the given id."""
+        summary = await self.job_summary(job_id)
+        return summary['status']
+
+    async def wait_for_job(self, job_id, poll_interval=10, timeout=30):
+        """Waits for the job with the given id to finish, without blocking the event loop.
+
+            Kills the job and exits, if the job has been in Pending / Waiting state for more than
+            the timeout value, same as **Job.wait_for_completion()**.
+
+            Args:
+                job_id          (str / int) --  id of the job to wait for
+
+                poll_interval   (int)       --  seconds to wait between the status checks
+
+                    default: 10
+
+                timeout         (int)       --  minutes after which the job should be killed,
+                if the job has been in Pending / Waiting state
+
+                    default: 30
+
+            Returns:
+                str     -   final status of the job
+
+        """
+        loop = asyncio.get_event_loop()
+        start_time = loop.time()
+        previous_status = None
+
+        status_list = ['pending', 'waiting']
+
+        while True:
+            status = (await self.job_status(job_id)).lower()
+
+            if any(finished in status for finished in JOB_FINISHED_STATUSES):
+                return status
+
+            if status in status_list and previous_status not in status_list:
+                start_time = loop.time()
+
+            if status in status_list and (loop.time() - start_time) / 60 > timeout:
+                await self.make_request('POST', self._services['KILL_JOB'] % job_id)
+                return 'killed'
+
+            previous_status = status
+
+            await asyncio.sleep(poll_interval)
+
+    async def wait_for_jobs(self, job_ids, poll_interval=10, timeout=30):
+        """Waits for all the jobs with the given ids to finish, concurrently.
+
+            Args:
+                job_ids         (list)  --  list of ids of the jobs to wait for
+
+                poll_interval   (int)   --  seconds to wait between the status checks of a job
+
+                    default: 10
+
+                timeout         (int)   --  minutes after which a job should be killed,
+                if the job has been in Pending / Waiting state
+
+                    default: 30
+
+            Returns:
+                dict    -   dictionary consisting of the job id as the key,
+                and its final status as the value
+
+        """
+        statuses = await self.gather(
+            lambda job_id: self.wait_for_job(job_id, poll_interval, timeout), job_ids
+        )
+
+        return dict(zip([str(job_id) for job_id in job_ids], statuses))
+
+    def _get_client_id(self, client_name):
+        """Returns the id of the client with the given name, from the clients of the commcell.
+
+            Blocking, as the clients of the commcell are fetched on the first access.
+
+            Args:
+                client_name     (str)   --  name of the client
+
+            Returns:
+                str     -   id of the client
+
+            Raises:
+                SDKException:
+                    if no client exists with the given name
+
+        """
+        clients = self._commcell_object.clients
+
+        if not clients.has_client(client_name):
+            raise SDKException(
+                'Client', '102', 'No client exists with name: {0}'.format(client_name)
+            )
+
+        return clients.all_clients[client_name.lower()]['id']
+
+    async def client_properties(self, client_name):
+        """Returns the properties of the client with the given name.
+
+            Args:
+                client_name     (str)   --  name of the client
+
+            Returns:
+                dict    -   properties of the client
+
+            Raises:
+                SDKException:
+                    if no client exists with the given name
+
+                    if response is empty
+
+                    if response is not success
+
+        """
+        client_id = await self._run(self._get_client_id, client_name)
+
+        flag, response = await self.make_request('GET', self._services['CLIENT'] % client_id)
+
+        if flag:
+            if response.json() and 'clientProperties' in response.json():
+                return response.json()['clientProperties'][0]
+            else:
+                raise SDKException('Response', '102')
+        else:
+            raise SDKException('Response', '101', self._update_response_(response.text))
+
+    async def subclient_properties(self, subclient_object):
+        """Returns the latest properties of the given subclient.
+
+            Args:
+                subclient_object    (object)    --  instance of the Subclient class
+
+            Returns:
+                dict    -   properties of the subclient
+
+            Raises:
+                SDKException:
+                    if response is empty
+
+                    if response is not success
+
+        """
+        flag, response = await self.make_request('GET', subclient_object._SUBCLIENT)
+
+        if flag:
+            if response.json() and 'subClientProperties' in response.json():
+                return response.json()['subClientProperties'][0]
+            else:
+                raise SDKException('Response', '102')
+        else:
+            raise SDKException('Response', '101', self._update_response_(response.text))
+
+    async def browse(self, entity_object, *args, **kwargs):
+        """Browses the content of the given subclient / backupset, without blocking the loop.
+
+            Args:
+                entity_object   (object)    --  instance of the Subclient / Backupset class
+
+                args / kwargs               --  browse options, same as the **browse()** method
+                of the entity
+
+            Returns:
+                (list, dict)    -   same as the **browse()** method of the entity
+
+        """
+        return await self._run(entity_object.browse, *args, **kwargs)
+
+    def close(self):
+        """Shuts down the thread pool of this instance, after the pending requests finish."""
+        self._executor.shutdown(wait=True)
@@ -8,13 +8,16 @@
 
 """Main file for performing backup set operations.
 
-Backupsets and Backupset are 2 classes defined in this file.
+Backupsets, Backupset, and BrowseItem are the 3 classes defined in this file.
 
 Backupsets: Class for representing all the backup sets associated with a specific agent
 
 Backupset:  Class for a single backup set selected for an agent,
 and to perform operations on that backup set
 
+BrowseItem: Class for a compact, read-only record of a single file / folder yielded by the
+iter_browse() and iter_find() methods
+
 
 Backupsets:
     __init__(class_object)          -- initialise object of Backupsets class associated with
@@ -68,12 +71,23 @@ Backupset:
 
     _prepare_browse_options()       -- prepares the options for the Browse/find operation
 
+    _prepare_find_options()         -- sets the find operation, and the filters of the find options
+
     _prepare_browse_json()          -- prepares the JSON object for the browse request
 
+    _get_browse_result()            -- validates the browse response, and returns its browse result
+
+    _get_browse_result_set()        -- validates the browse response, and returns its result set
+
     _process_browse_response()      -- retrieves the items from browse response
 
     _do_browse()                    -- performs a browse operation with the given options
 
+    _browse_page()                  -- browses a single page of the given path
+
+    _iter_browse()                  -- generator to page through the browse / find results,
+    walking the sub-folders concurrently
+
     set_default_backupset()         -- sets the backupset as the default backup set for the agent,
     if not already default
 
@@ -84,8 +98,26 @@ Backupset:
 
     find()                          -- find content in the backupset
 
+    iter_browse()                   -- generator to browse the content of the backupset page by
+    page, yielding a BrowseItem for each file / folder
+
+    iter_find()                     -- generator to find content in the backupset page by page,
+    yielding a BrowseItem for each file / folder
+
     refresh()                       -- refresh the properties of the backupset
 
+
+BrowseItem:
+    from_result()                   -- creates the BrowseItem from a browse result entry
+
+    as_dict()                       -- returns the item as a dict, in the same format as the
+    values of the dict returned by browse()
+
+    **is_file**                     -- returns whether the item is a file or not
+
+    **modified_time**               -- returns the modification time of the item, formatted
+    as %d/%m/%Y %H:%M:%S, computed on access
+
 """
 
 from __future__ import absolute_import
@@ -94,6 +126,9 @@ from __future__ import unicode_literals
 import threading
 import time
 
+from collections import deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
 from past.builtins import basestring
 
 from .subclient import Subclients
@@ -101,6 +136,76 @@ from .schedules import Schedules
 from .exception import SDKException
 
 
+_BROWSE_ERRORS = {
+    "browse": ('110', 'Failed to browse for subclient backup content\nError: "{0}"'),
+    "find": ('111', 'Failed to Search\nError: "{0}"'),
+    "all_versions": ('112', 'Failed to browse all version for specified content\nError: "{0}"')
+}
+"""dict:    Exception code, and message of each browse operation."""
+
+
+class BrowseItem(namedtuple('BrowseItem', (
+        'path', 'name', 'type', 'size', 'modification_time', 'version', 'advanced_data'))):
+    """Class for a compact, read-only record of a single file / folder from the browse results.
+
+        Timestamp is stored as the epoch time, and is formatted only on access of the
+        **modified_time** attribute.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_result(cls, result, parent_path, advanced_data=False):
+        """Creates the BrowseItem from an entry of the browse dataResultSet.
+
+            Args:
+                result          (dict)  --  entry of the dataResultSet of the browse response
+
+                parent_path     (str)   --  path which was browsed, to build the path of the
+                entry, if not present in the result
+
+                advanced_data   (bool)  --  whether to keep the advancedData of the entry
+
+            Returns:
+                object  -   instance of the BrowseItem class
+
+        """
+        name = result['displayName']
+
+        return cls(
+            result['path'] if 'path' in result else '\\'.join([parent_path, name]),
+            name,
+            'File' if result.get('flags', {}).get('file') is True else 'Folder',
+            result.get('size'),
+            result.get('modificationTime'),
+            result.get('version'),
+            result.get('advancedData') if advanced_data else None
+        )
+
+    @property
+    def is_file(self):
+        """Returns True if the item is a file, and False if it is a folder."""
+        return self.type == 'File'
+
+    @property
+    def modified_time(self):
+        """Returns the modification time of the item in the format %d/%m/%Y %H:%M:%S."""
+        if self.modification_time is None:
+            return None
+
+        return time.strftime('%d/%m/%Y %H:%M:%S', time.localtime(self.modification_time))
+
+    def as_dict(self):
+        """Returns the item as a dict, in the format of the values of the browse() dict."""
+        return {
+            'name': self.name,
+            'size': self.size,
+            'modified_time': self.modified_time,
+            'type': self.type,
+            'advanced_data': self.advanced_data
+        }
+
+
 class Backupsets(object):
     """Class for getting all the backupsets associated with a client."""
 
@@ -208,7 +313,7 @@ class Backupsets(object):
 
                     if response is not success
         """
-        flag, response = self._cvpysdk_object.make_request('GET', self._BACKUPSETS)
+        flag, response = self._cvpysdk_object.make_request('GET', self._BACKUPSETS, cache=True)
 
         if flag:
             if response.json() and 'backupsetProperties' in response.json():
@@ -620,7 +725,7 @@ class Backupset(object):
 
                     if response is not success
         """
-        flag, response = self._cvpysdk_object.make_request('GET', self._BACKUPSET)
+        flag, response = self._cvpysdk_object.make_request('GET', self._BACKUPSET, cache=True)
 
         if flag:
             if response.json() and "backupsetProperties" in response.json():
@@ -826,6 +931,38 @@ class Backupset(object):
         self._set_defaults(options, self._default_browse_options)
         return options
 
+    @staticmethod
+    def _prepare_find_options(options):
+        """Sets the find operation, the default path, and the filters for the find options.
+
+            Args:
+                options     (dict)  --  a dictionary of find options
+
+            Returns:
+                dict - The find options with the file name / size filters added to the filters
+        """
+        options['operation'] = 'find'
+
+        if 'path' not in options:
+            options['path'] = '\\**\\*'
+
+        filters = list(options.get('filters', []))
+
+        if 'file_name' in options:
+            filters.append(('FileName', options['file_name']))
+
+        if 'file_size_gt' in options:
+            filters.append(('FileSize', options['file_size_gt'], 'GTE'))
+
+        if 'file_size_lt' in options:
+            filters.append(('FileSize', options['file_size_lt'], 'LTE'))
+
+        if 'file_size_et' in options:
+            filters.append(('FileSize', options['file_size_et'], 'EQUALS'))
+
+        options['filters'] = filters
+        return options
+
     def _prepare_browse_json(self, options):
         """Prepares the JSON object for the browse request.
 
@@ -992,8 +1129,8 @@ class Backupset(object):
 
         return all_versions_dict
 
-    def _process_browse_response(self, flag, response, options):
-        """Retrieves the items from browse response.
+    def _get_browse_result(self, flag, response, options):
+        """Validates the browse response, and returns the browse result from the response.
 
         Args:
             flag        (bool)  --  boolean, whether the response was success or not
@@ -1003,9 +1140,8 @@ class Backupset(object):
             options     (dict)  --  The browse options dictionary
 
         Returns:
-            list - List of only the file / folder paths from the browse response
-
-            dict - Dictionary of all the paths with additional metadata retrieved from browse
+            dict - browseResult of the browse response, with the dataResultSet, and the
+            totalItemsFound, if there are any results
 
         Raises:
             SDKException:
@@ -1015,75 +1151,16 @@ class Backupset(object):
 
                 if response is not success
         """
-
-        operation_types = {
-            "browse": ('110', 'Failed to browse for subclient backup content\nError: "{0}"'),
-            "find": ('111', 'Failed to Search\nError: "{0}"'),
-            "all_versions": (
-                '112', 'Failed to browse all version for specified content\nError: "{0}"'
-            )
-        }
-
-        exception_code = operation_types[options['operation']][0]
-        exception_message = operation_types[options['operation']][1]
+        exception_code, exception_message = _BROWSE_ERRORS[options['operation']]
 
         if flag:
 
             response_json = response.json()
-            paths_dict = {}
-            paths = []
 
             if response_json and 'browseResponses' in response_json:
 
                 if 'browseResult' in response_json['browseResponses'][0]:
-                    browse_result = response_json['browseResponses'][0]['browseResult']
-
-                    if 'dataResultSet' in browse_result:
-                        result_set = browse_result['dataResultSet']
-
-                        if 'all_versions' in options['operation']:
-                            return self._process_browse_all_versions_response(result_set)
-
-                        for result in result_set:
-
-                            name = result['displayName']
-                            if 'path' in result:
-                                path = result['path']
-                            else:
-                                path = '\\'.join([options['path'], name])
-
-                            if 'modificationTime' in result:
-                                mod_time = time.localtime(result['modificationTime'])
-                                mod_time = time.strftime('%d/%m/%Y %H:%M:%S', mod_time)
-                            else:
-                                mod_time = None
-
-                            if 'file' in result['flags']:
-                                if result['flags']['file'] is True:
-                                    file_or_folder = 'File'
-                                else:
-                                    file_or_folder = 'Folder'
-                            else:
-                                file_or_folder = 'Folder'
-
-                            if 'size' in result:
-                                size = result['size']
-                            else:
-                                size = None
-
-                            paths_dict[path] = {
-                                'name': name,
-                                'size': size,
-                                'modified_time': mod_time,
-                                'type': file_or_folder,
-                                'advanced_data': result['advancedData']
-                            }
-
-                            paths.append(path)
-
-                        return paths, paths_dict
-                    else:
-                        raise SDKException('Subclient', exception_code)
+                    return response_json['browseResponses'][0]['browseResult']
 
                 elif 'messages' in response_json['browseResponses'][0]:
                     message = response_json['browseResponses'][0]['messages'][0]
@@ -1101,6 +1178,73 @@ class Backupset(object):
         else:
             raise SDKException('Response', '101', self._update_response_(response.text))
 
+    def _get_browse_result_set(self, flag, response, options):
+        """Validates the browse response, and returns the result set from the response.
+
+        Args:
+            flag        (bool)  --  boolean, whether the response was success or not
+
+            response    (dict)  --  JSON response received for the request from the Server
+
+            options     (dict)  --  The browse options dictionary
+
+        Returns:
+            list - list of the entries of the dataResultSet of the browse response
+
+        Raises:
+            SDKException:
+                if failed to browse/search for content
+
+                if response is empty
+
+                if response is not success
+        """
+        browse_result = self._get_browse_result(flag, response, options)
+
+        if 'dataResultSet' in browse_result:
+            return browse_result['dataResultSet']
+
+        raise SDKException('Subclient', _BROWSE_ERRORS[options['operation']][0])
+
+    def _process_browse_response(self, flag, response, options):
+        """Retrieves the items from browse response.
+
+        Args:
+            flag        (bool)  --  boolean, whether the response was success or not
+
+            response    (dict)  --  JSON response received for the request from the Server
+
+            options     (dict)  --  The browse options dictionary
+
+        Returns:
+            list - List of only the file / folder paths from the browse response
+
+            dict - Dictionary of all the paths with additional metadata retrieved from browse
+
+        Raises:
+            SDKException:
+                if failed to browse/search for content
+
+                if response is empty
+
+                if response is not success
+        """
+        result_set = self._get_browse_result_set(flag, response, options)
+
+        if 'all_versions' in options['operation']:
+            return self._process_browse_all_versions_response(result_set)
+
+        paths_dict = {}
+        paths = []
+
+        for result in result_set:
+            item = BrowseItem.from_result(result, options['path'], advanced_data=True)
+
+            paths_dict[item.path] = item.as_dict()
+            paths.append(item.path)
+
+        return paths, paths_dict
+
     def _do_browse(self, options=None):
         """Performs a browse operation with the given options.
 
@@ -1122,6 +1266,104 @@ class Backupset(object):
 
         return self._process_browse_response(flag, response, options)
 
+    def _browse_page(self, options, path, skip_node, advanced_data=False):
+        """Browses a single page of the results for the given path.
+
+        Args:
+            options         (dict)  --  dictionary of browse options, with the defaults set
+
+            path            (str)   --  path to browse
+
+            skip_node       (int)   --  number of results to skip, i.e., offset of the page
+
+            advanced_data   (bool)  --  whether to keep the advancedData of the results
+
+        Returns:
+            (list, int)
+                list    -   list of BrowseItem for the results in the page, empty if the path
+                has no results, or the page is after the last result
+
+                int     -   total number of results of the path, None if not returned
+        """
+        options = dict(options, path=path, skip_node=skip_node)
+        request_json = self._prepare_browse_json(options)
+
+        flag, response = self._cvpysdk_object.make_request('POST', self._BROWSE, request_json)
+
+        browse_result = self._get_browse_result(flag, response, options)
+        result_set = browse_result.get('dataResultSet', [])
+        total = browse_result.get('totalItemsFound')
+
+        return (
+            [BrowseItem.from_result(result, path, advanced_data) for result in result_set],
+            int(total) if total is not None else None
+        )
+
+    def _iter_browse(self, options, recursive=False, max_workers=4, advanced_data=False):
+        """Generator to page through the browse / find results, and walk the sub-folders.
+
+            Pages of the path, and of the sub-folders if recursive, are fetched concurrently by
+            up to **max_workers** requests in flight, and each page is released once its items
+            are yielded, so the memory used is bounded by the page size, and not the total
+            number of results.
+
+            Items are yielded in the order the pages are received, and not sorted by path.
+
+        Args:
+            options         (dict)  --  dictionary of browse options
+
+            recursive       (bool)  --  whether to browse the sub-folders as well
+
+            max_workers     (int)   --  maximum number of browse requests in flight
+
+            advanced_data   (bool)  --  whether to keep the advancedData of the results
+
+        Returns:
+            generator - generator yielding a BrowseItem for each result
+        """
+        options = self._prepare_browse_options(options)
+        page_size = int(options['page_size'])
+
+        # pages pending to be fetched, as (path, skip_node)
+        pending_pages = deque([(options['path'], int(options['skip_node']))])
+        running = {}
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+
+        try:
+            while pending_pages or running:
+                while pending_pages and len(running) < max_workers:
+                    path, skip_node = pending_pages.popleft()
+                    future = executor.submit(
+                        self._browse_page, options, path, skip_node, advanced_data
+                    )
+                    running[future] = (path, skip_node)
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    path, skip_node = running.pop(future)
+                    items, total = future.result()
+
+                    if total is not None:
+                        has_next_page = items and skip_node + len(items) < total
+                    else:
+                        has_next_page = len(items) >= page_size
+
+                    if has_next_page:
+                        pending_pages.append((path, skip_node + page_size))
+
+                    for item in items:
+                        if recursive and not item.is_file:
+                            pending_pages.append((item.path, 0))
+
+                        yield item
+        finally:
+            for future in running:
+                future.cancel()
+
+            executor.shutdown(wait=True)
+
     @property
     def backupset_id(self):
         """Treats the backupset id as a read-only attribute."""
@@ -1426,27 +1668,100 @@ class Backupset(object):
         else:
             options = kwargs
 
-        options['operation'] = 'find'
+        return self._do_browse(self._prepare_find_options(options))
 
-        if 'path' not in options:
-            options['path'] = '\\**\\*'
+    def iter_browse(self, path='\\', page_size=1000, recursive=True, max_workers=4, **options):
+        """Generator to browse the content of the Backupset, page by page.
 
-        if 'filters' not in options:
-            options['filters'] = []
+            Unlike browse(), the results are not collected in a list and a dict, and instead
+            a compact BrowseItem is yielded for each file / folder, as the pages are received.
 
-        if 'file_name' in options:
-            options['filters'].append(('FileName', options['file_name']))
+            Example:
 
-        if 'file_size_gt' in options:
-            options['filters'].append(('FileSize', options['file_size_gt'], 'GTE'))
+                for item in backupset.iter_browse('c:\\\\data', page_size=5000):
+                    if item.is_file:
+                        print(item.path, item.size, item.modified_time)
 
-        if 'file_size_lt' in options:
-            options['filters'].append(('FileSize', options['file_size_lt'], 'LTE'))
+            Args:
+                path            (str)   --  path to browse
 
-        if 'file_size_et' in options:
-            options['filters'].append(('FileSize', options['file_size_et'], 'EQUALSBLAH'))
+                    default: \\
 
-        return self._do_browse(options)
+                page_size       (int)   --  number of results to get in each browse request
+
+                    default: 1000
+
+                recursive       (bool)  --  whether to browse all the sub-folders as well
+
+                    default: True
+
+                max_workers     (int)   --  maximum number of browse requests in flight, while
+                walking the sub-folders
+
+                    default: 4
+
+                options         (dict)  --  other browse options, same as browse(), and
+
+                    advanced_data   (bool)  --  whether to keep the advancedData of the results
+
+                        default: False
+
+            Returns:
+                generator   -   generator yielding a BrowseItem for each file / folder
+
+            Raises:
+                SDKException:
+                    if failed to browse the content
+
+                    if response is empty
+
+                    if response is not success
+
+        """
+        advanced_data = options.pop('advanced_data', False)
+
+        options['operation'] = 'browse'
+        options['path'] = path
+        options['page_size'] = page_size
+
+        return self._iter_browse(options, recursive, max_workers, advanced_data)
+
+    def iter_find(self, page_size=1000, **options):
+        """Generator to search the content of the Backupset, page by page.
+
+            Accepts the same options as find(), and yields a compact BrowseItem for each of the
+            matching files / folders, as the pages are received.
+
+            Args:
+                page_size       (int)   --  number of results to get in each find request
+
+                    default: 1000
+
+                options         (dict)  --  find options, same as find(), and
+
+                    advanced_data   (bool)  --  whether to keep the advancedData of the results
+
+                        default: False
+
+            Returns:
+                generator   -   generator yielding a BrowseItem for each matching file / folder
+
+            Raises:
+                SDKException:
+                    if failed to search the content
+
+                    if response is empty
+
+                    if response is not success
+
+        """
+        advanced_data = options.pop('advanced_data', False)
+
+        options['page_size'] = page_size
+
+        return self._iter_browse(
+            self._prepare_find_options(options), advanced_data=advanced_data
+        )
 
     def refresh(self):
         """Refresh the properties of the Backupset."""
@@ -16,7 +16,7 @@ Client:     Class for a single client of the commcell
 
 
 Clients:
-    __init__(commcell_object)             --  initialize object of Clients class associated with
+    __init__(commcell_object, ttl)        --  initialize object of Clients class associated with
     the commcell
 
     __str__()                             --  returns all the clients associated with the commcell
@@ -32,6 +32,14 @@ Clients:
     _get_virtualization_clients()         --  gets all the virtualization clients associated with
     the commcell
 
+    _get_client_by_name()                 --  gets the details of a single client by its name,
+    without getting the list of all clients
+
+    _is_stale()                           --  checks if the given list of clients is not loaded,
+    or has expired
+
+    _load()                               --  loads the given list of clients, if it is stale
+
     _get_client_dict()                    --  returns the client dict for client to be added to
     member server
 
@@ -59,11 +67,17 @@ Clients:
     delete(client_name)                   --  deletes the client specified by the client name from
     the commcell
 
+    execute_on(clients, script)           --  executes the script, or command on the clients
+    concurrently, and returns the results as each client finishes
+
     refresh()                             --  refresh the clients associated with the commcell
 
 Attributes
 ==========
 
+    **ttl**                     --  seconds after which the lists of clients are loaded again
+    from the commcell, on the next access. Lists never expire, if set to None
+
     **all_clients**             --  returns the dictioanry consisting of all the clients that are
     associated with the commcell and their information such as id and hostname
 
@@ -118,7 +132,8 @@ Client:
 
     upload_file()                --  uploads the specified file on controller to the client machine
 
-    upload_folder()              --  uploads the specified folder on controller to client machine
+    upload_folder()              --  uploads the specified folder on controller to client machine,
+    uploading the files concurrently
 
     restart_services()           --  executes the command on the client to restart the services
 
@@ -192,6 +207,9 @@ Attributes
     **is_ready**                    --  returns boolean value specifying whether services on the
     client are running or not, and whether the CommServ is able to communicate with the client
 
+    **file_uploader**               --  returns the instance of the FileUploader class used to
+    upload the files / folders to the client, to configure the chunk size and workers
+
 
     set_encryption_prop ()       --    Set encryption properties on a client
 
@@ -204,6 +222,7 @@ from __future__ import unicode_literals
 
 import os
 import re
+import threading
 import time
 
 from base64 import b64encode
@@ -211,11 +230,18 @@ from past.builtins import basestring
 
 import requests
 
+from requests.utils import quote
+
 from .agent import Agents
 from .schedules import Schedules
 from .exception import SDKException
 
 from .network import Network
+from .upload import FileUploader
+from .payload import XmlPayload
+from .execution import FleetExecution
+from .execution import DEFAULT_CONCURRENCY
+from .execution import escaped_script_lines
 
 from .security.user import Users
 
@@ -223,12 +249,20 @@ from .security.user import Users
 class Clients(object):
     """Class for representing all the clients associated with the commcell."""
 
-    def __init__(self, commcell_object):
+    def __init__(self, commcell_object, ttl=None):
         """Initialize object of the Clients class.
 
+            Lists of the clients are not loaded during initialization, and are loaded
+            independently of each other, on their first access.
+
             Args:
                 commcell_object (object)  --  instance of the Commcell class
 
+                ttl             (int)     --  seconds after which the lists of clients are
+                loaded again on the next access
+
+                    default: None, lists are loaded only once, till refresh() is called
+
             Returns:
                 object - instance of the Clients class
         """
@@ -245,13 +279,16 @@ class Clients(object):
         self._ALL_CLIENTS = self._services['GET_ALL_CLIENTS_PLUS_HIDDEN']
         self._VIRTUALIZATION_CLIENTS = self._services['GET_VIRTUAL_CLIENTS']
         self._ADD_EXCHANGE_CLIENT = self._services['ADD_EXCHANGE']
+        self._CLIENT_BY_NAME = self._services['GET_CLIENT_BY_NAME']
+
+        self._ttl = ttl
+        self._lock = threading.RLock()
+        self._loaded_at = {}
 
         self._clients = None
         self._hidden_clients = None
         self._virtualization_clients = None
 
-        self.refresh()
-
     def __str__(self):
         """Representation string consisting of all clients of the commcell.
 
@@ -297,18 +334,19 @@ class Clients(object):
         flag, response = self._cvpysdk_object.make_request('GET', self._CLIENTS)
 
         if flag:
-            if response.json() and 'clientProperties' in response.json():
-                clients_dict = {}
-
-                for dictionary in response.json()['clientProperties']:
-                    temp_name = dictionary['client']['clientEntity']['clientName'].lower()
-                    temp_id = str(dictionary['client']['clientEntity']['clientId']).lower()
-                    temp_hostname = dictionary['client']['clientEntity']['hostName'].lower()
-                    clients_dict[temp_name] = {
-                        'id': temp_id,
-                        'hostname': temp_hostname
-                    }
+            clients_dict = {}
+
+            # parse the clients incrementally, to avoid building the complete response dict
+            for dictionary in response.iter_items('clientProperties'):
+                temp_name = dictionary['client']['clientEntity']['clientName'].lower()
+                temp_id = str(dictionary['client']['clientEntity']['clientId']).lower()
+                temp_hostname = dictionary['client']['clientEntity']['hostName'].lower()
+                clients_dict[temp_name] = {
+                    'id': temp_id,
+                    'hostname': temp_hostname
+                }
 
+            if clients_dict:
                 return clients_dict
             else:
                 raise SDKException('Response', '102')
@@ -340,29 +378,30 @@ class Clients(object):
         flag, response = self._cvpysdk_object.make_request('GET', self._ALL_CLIENTS)
 
         if flag:
-            if response.json() and 'clientProperties' in response.json():
-                all_clients_dict = {}
-                hidden_clients_dict = {}
-
-                for dictionary in response.json()['clientProperties']:
-                    temp_name = dictionary['client']['clientEntity']['clientName'].lower()
-                    temp_id = str(dictionary['client']['clientEntity']['clientId']).lower()
-                    temp_hostname = dictionary['client']['clientEntity']['hostName'].lower()
-                    all_clients_dict[temp_name] = {
-                        'id': temp_id,
-                        'hostname': temp_hostname
-                    }
-
-                # hidden clients = all clients - true clients
-                hidden_clients_dict = {
-                    client: all_clients_dict.get(
-                        client, client in all_clients_dict or self.all_clients[client]
-                    )
-                    for client in set(all_clients_dict) - set(self.all_clients)
+            all_clients_dict = {}
+            hidden_clients_dict = {}
+
+            # parse the clients incrementally, to avoid building the complete response dict
+            for dictionary in response.iter_items('clientProperties'):
+                temp_name = dictionary['client']['clientEntity']['clientName'].lower()
+                temp_id = str(dictionary['client']['clientEntity']['clientId']).lower()
+                temp_hostname = dictionary['client']['clientEntity']['hostName'].lower()
+                all_clients_dict[temp_name] = {
+                    'id': temp_id,
+                    'hostname': temp_hostname
                 }
-                return hidden_clients_dict
-            else:
+
+            if not all_clients_dict:
                 raise SDKException('Response', '102')
+
+            # hidden clients = all clients - true clients
+            hidden_clients_dict = {
+                client: all_clients_dict.get(
+                    client, client in all_clients_dict or self.all_clients[client]
+                )
+                for client in set(all_clients_dict) - set(self.all_clients)
+            }
+            return hidden_clients_dict
         else:
             raise SDKException('Response', '101', self._update_response_(response.text))
 
@@ -397,8 +436,10 @@ class Clients(object):
         flag, response = self._cvpysdk_object.make_request('GET', self._VIRTUALIZATION_CLIENTS)
 
         if flag:
-            if response.json() and 'VSPseudoClientsList' in response.json():
-                pseudo_clients = response.json()['VSPseudoClientsList']
+            response_json = response.json()
+
+            if response_json and 'VSPseudoClientsList' in response_json:
+                pseudo_clients = response_json['VSPseudoClientsList']
                 virtualization_clients = {}
 
                 for pseudo_client in pseudo_clients:
@@ -413,6 +454,91 @@ class Clients(object):
         else:
             raise SDKException('Response', '101', self._update_response_(response.text))
 
+    def _get_client_by_name(self, client_name):
+        """Gets the details of a single client by its name, with a single lightweight request,
+            without getting the list of all clients.
+
+            Args:
+                client_name     (str)   --  name of the client
+
+            Returns:
+                dict    -   name, id and hostname of the client
+
+                    {
+                        "name": client_name,
+
+                        "id": client_id,
+
+                        "hostname": client_hostname
+                    }
+
+                None    -   if no client exists with the given name,
+                or the API is not supported by the commcell
+
+        """
+        flag, response = self._cvpysdk_object.make_request(
+            'GET', self._CLIENT_BY_NAME % quote(client_name)
+        )
+
+        if not flag:
+            return None
+
+        try:
+            response_json = response.json()
+        except ValueError:
+            return None
+
+        if not response_json or not response_json.get('clientProperties'):
+            return None
+
+        client_entity = response_json['clientProperties'][0]['client']['clientEntity']
+
+        if client_entity.get('clientName', '').lower() != client_name.lower():
+            return None
+
+        return {
+            'name': client_entity['clientName'].lower(),
+            'id': str(client_entity['clientId']),
+            'hostname': client_entity.get('hostName', '').lower()
+        }
+
+    def _is_stale(self, attribute):
+        """Checks if the list of clients stored in the given attribute needs to be loaded.
+
+            Args:
+                attribute   (str)   --  name of the attribute storing the list of clients
+
+            Returns:
+                bool    -   True, if the list is not loaded yet, or has expired
+
+        """
+        if getattr(self, attribute) is None:
+            return True
+
+        if self._ttl is None:
+            return False
+
+        return time.time() - self._loaded_at[attribute] > self._ttl
+
+    def _load(self, attribute, loader):
+        """Loads the list of clients in the given attribute using the loader, if it is stale.
+
+            Args:
+                attribute   (str)       --  name of the attribute storing the list of clients
+
+                loader      (callable)  --  method to get the list of clients from the commcell
+
+            Returns:
+                dict    -   list of clients stored in the attribute
+
+        """
+        with self._lock:
+            if self._is_stale(attribute):
+                setattr(self, attribute, loader())
+                self._loaded_at[attribute] = time.time()
+
+            return getattr(self, attribute)
+
     @staticmethod
     def _get_client_dict(client_object):
         """Returns the client dict for the client object to be appended to member server.
@@ -521,7 +647,7 @@ class Clients(object):
                     }
 
         """
-        return self._clients
+        return self._load('_clients', self._get_clients)
 
     @property
     def hidden_clients(self):
@@ -540,7 +666,7 @@ class Clients(object):
                     }
 
         """
-        return self._hidden_clients
+        return self._load('_hidden_clients', self._get_hidden_clients)
 
     @property
     def virtualization_clients(self):
@@ -559,7 +685,30 @@ class Clients(object):
                     }
 
         """
-        return self._virtualization_clients
+        return self._load('_virtualization_clients', self._get_virtualization_clients)
+
+    @property
+    def ttl(self):
+        """Returns the seconds after which the lists of clients are loaded again."""
+        return self._ttl
+
+    @ttl.setter
+    def ttl(self, value):
+        """Sets the seconds after which the lists of clients are loaded again.
+
+            Args:
+                value   (int)   --  seconds after which the lists are loaded again,
+                or None to never expire the lists
+
+            Raises:
+                SDKException:
+                    if type of the value is not int
+
+        """
+        if value is not None and not isinstance(value, (int, float)):
+            raise SDKException('Client', '101')
+
+        self._ttl = value
 
     def has_client(self, client_name):
         """Checks if a client exists in the commcell with the input client name.
@@ -892,6 +1041,13 @@ class Clients(object):
             client_name = None
             client_id = None
 
+            # fast path, look up the single client by its name, if the lists are not loaded yet
+            if self._clients is None and self._hidden_clients is None:
+                client = self._get_client_by_name(name)
+
+                if client is not None:
+                    return Client(self._commcell_object, client['name'], client['id'])
+
             if self.has_client(name):
                 client_name = name
             elif self._get_client_from_hostname(name) is not None:
@@ -981,11 +1137,89 @@ class Clients(object):
                     'Client', '102', 'No client exists with name: {0}'.format(client_name)
                 )
 
+    def execute_on(self,
+                   clients,
+                   script,
+                   script_type=None,
+                   script_arguments=None,
+                   wait_for_completion=True,
+                   concurrency=DEFAULT_CONCURRENCY):
+        """Executes the script, or command on the clients concurrently.
+
+            Iterate over the returned FleetExecution to get the result of each client as it
+            finishes, or call its summary() method to wait for all the clients.
+
+            Args:
+                clients             (list)  --  names of the clients, or instances of the
+                Client class
+
+                script              (str)   --  path, or contents of the script, or the command
+                to execute, if the script type is None
+
+                script_type         (str)   --  type of the script, executes the script as a
+                command if None
+
+                    Script Types Supported:
+
+                        JAVA
+
+                        Python
+
+                        PowerShell
+
+                        WindowsBatch
+
+                        UnixShell
+
+                    default: None
+
+                script_arguments    (str)   --  arguments to the script
+
+                    default: None
+
+                wait_for_completion (bool)  --  boolean specifying whether to wait for the
+                script execution to finish or not
+
+                    default: True
+
+                concurrency         (int)   --  number of clients to execute on concurrently
+
+                    default: 8
+
+            Returns:
+                object  -   instance of the FleetExecution class
+
+            Raises:
+                SDKException:
+                    if clients argument is not a list
+
+                    if script argument is not of type string
+
+                    if concurrency is not a positive integer
+
+        """
+        if not isinstance(clients, (list, tuple, set)) or not isinstance(script, basestring):
+            raise SDKException('Client', '101')
+
+        if not isinstance(concurrency, int) or concurrency <= 0:
+            raise SDKException('Client', '101')
+
+        return FleetExecution(
+            self, clients, script, script_type, script_arguments, wait_for_completion,
+            concurrency
+        )
+
     def refresh(self):
-        """Refresh the clients associated with the Commcell."""
-        self._clients = self._get_clients()
-        self._hidden_clients = self._get_hidden_clients()
-        self._virtualization_clients = self._get_virtualization_clients()
+        """Refresh the clients associated with the Commcell.
+
+            Lists of the clients are loaded again on their next access.
+
+        """
+        with self._lock:
+            self._clients = None
+            self._hidden_clients = None
+            self._virtualization_clients = None
+            self._loaded_at = {}
 
 
 class Client(object):
@@ -1018,15 +1252,9 @@ class Client(object):
         else:
             self._client_id = self._get_client_id()
 
-        _client_type = {
-            'Client': 0,
-            'Hidden Client': 1
-        }
-
-        if self._commcell_object.clients.has_client(client_name):
-            self._client_type_id = _client_type['Client']
-        else:
-            self._client_type_id = _client_type['Hidden Client']
+        # type of the client (0 - Client, 1 - Hidden Client), is resolved on first use,
+        # to not load the list of all clients just to create a single client
+        self._client_type = None
 
         self._CLIENT = self._services['CLIENT'] % (self.client_id)
 
@@ -1036,6 +1264,7 @@ class Client(object):
         self._schedules = None
         self._users = None
         self._network = None
+        self._file_uploader = None
 
         self._association_object = None
 
@@ -1056,13 +1285,24 @@ class Client(object):
         self._job_results_directory = None
         self._log_directory = None
 
-        self.refresh()
+        self._get_client_properties()
 
     def __repr__(self):
         """String representation of the instance of this class."""
         representation_string = 'Client class instance for Client: "{0}"'
         return representation_string.format(self.client_name)
 
+    @property
+    def _client_type_id(self):
+        """Returns the type of the client, 0 for a Client, and 1 for a Hidden Client."""
+        if self._client_type is None:
+            if self._commcell_object.clients.has_client(self.client_name):
+                self._client_type = 0
+            else:
+                self._client_type = 1
+
+        return self._client_type
+
     def _get_client_id(self):
         """Gets the client id associated with this client.
 
@@ -1083,7 +1323,7 @@ class Client(object):
 
                     if response is not success
         """
-        flag, response = self._cvpysdk_object.make_request('GET', self._CLIENT)
+        flag, response = self._cvpysdk_object.make_request('GET', self._CLIENT, cache=True)
 
         if flag:
             if response.json() and 'clientProperties' in response.json():
@@ -1569,6 +1809,14 @@ class Client(object):
 
         return self._network
 
+    @property
+    def file_uploader(self):
+        """Returns the instance of the FileUploader class, for uploading to this client."""
+        if self._file_uploader is None:
+            self._file_uploader = FileUploader(self)
+
+        return self._file_uploader
+
     def enable_backup(self):
         """Enable Backup for this Client.
 
@@ -1985,15 +2233,9 @@ class Client(object):
 
         if os.path.isfile(script):
             with open(script, 'rb') as temp_file:
-                script = html.escape(temp_file.read().decode())
-        else:
-            script = html.escape(script)
-
-        script_lines = ""
-        script_lines_template = '<scriptLines val="{0}"/>'
+                script = temp_file.read().decode()
 
-        for line in script.split('\n'):
-            script_lines += script_lines_template.format(line)
+        script_lines = escaped_script_lines(script)
 
         script_arguments = '' if script_arguments is None else script_arguments
         script_arguments = html.escape(script_arguments)
@@ -2013,7 +2255,7 @@ class Client(object):
         )
 
         flag, response = self._cvpysdk_object.make_request(
-            'POST', self._services['EXECUTE_QCOMMAND'], xml_execute_script
+            'POST', self._services['EXECUTE_QCOMMAND'], XmlPayload(xml_execute_script)
         )
 
         if flag:
@@ -2229,12 +2471,20 @@ class Client(object):
     def upload_file(self, source_file_path, destination_folder):
         """Upload the specified source file to destination path on the client machine
 
+            Files larger than the chunk size of the **file_uploader** are uploaded in chunks,
+            and a failed chunked upload is resumed from the last acknowledged offset, when this
+            method is called again for the same file and destination.
+
             Args:
                 source_file_path    (str)   --  path on the controller machine
 
                 destination_folder  (str)   --  path on the client machine where the files
                                                     are to be copied
 
+            Returns:
+                dict    -   dictionary consisting of the size, number of chunks, time taken,
+                and throughput (MB/s) of the upload
+
             Raises:
                 SDKException:
                     if failed to upload the file
@@ -2244,52 +2494,26 @@ class Client(object):
                     if response is not success
 
         """
-        chunk_size = 1024 ** 2 * 2
-        request_id = None
-        chunk_offset = None
-
-        file_name = os.path.split(source_file_path)[-1]
-
-        file_size = os.path.getsize(source_file_path)
-        headers = {
-            'Authtoken': self._commcell_object._headers['Authtoken'],
-            'Accept': 'application/json',
-            'FileName': b64encode(file_name.encode('utf-8')),
-            'FileSize': None,
-            'ParentFolderPath': b64encode(destination_folder.encode('utf-8'))
-        }
-
-        file_stream = open(source_file_path, 'rb')
-
-        if file_size <= chunk_size:
-            upload_url = self._services['UPLOAD_FULL_FILE'] % (self.client_id)
-            headers['FileSize'] = str(file_size)
-            self._make_request(upload_url, file_stream.read(), headers)
-        else:
-            upload_url = self._services['UPLOAD_CHUNKED_FILE'] % (self.client_id)
-            while file_size > chunk_size:
-                file_size = file_size - chunk_size
-                headers['FileSize'] = str(chunk_size)
-                headers['FileEOF'] = str(0)
-                request_id, chunk_offset = self._make_request(
-                    upload_url, file_stream.read(chunk_size), headers, request_id, chunk_offset
-                )
+        return self.file_uploader.upload_file(source_file_path, destination_folder)
 
-            headers['FileSize'] = str(file_size)
-            headers['FileEOF'] = str(1)
-            self._make_request(
-                upload_url, file_stream.read(file_size), headers, request_id, chunk_offset
-            )
-
-    def upload_folder(self, source_dir, destination_dir):
+    def upload_folder(self, source_dir, destination_dir, max_workers=None):
         """Uploads the specified source dir to destination path on the client machine
 
+            Files of the folder, and all its sub-folders, are uploaded concurrently.
+
             Args:
                 source_dir          (str)   --  path on the controller machine
 
                 destination_dir     (str)   --  path on the client machine where the files
                                                     are to be copied
 
+                max_workers         (int)   --  number of files to upload concurrently
+
+                    default: None, uses the max_workers of the file_uploader
+
+            Returns:
+                list    -   list of the upload details of each file, same as upload_file()
+
             Raises:
                 SDKException:
                     if failed to upload the file
@@ -2298,32 +2522,15 @@ class Client(object):
 
                     if response is not success
         """
-        def _create_destination_path(base_path, *args):
-            """Returns the path obtained by joining the items in argument
-
-                The final path to be generated is done based on the operating system path
-            """
-            if 'windows' in self.os_info.lower():
-                delimiter = "\\"
-            else:
-                delimiter = "/"
-
-            if args:
-                for argv in args:
-                    base_path = "{0}{1}{2}".format(base_path, delimiter, argv)
-
-            return base_path
-
-        source_list = os.listdir(source_dir)
+        if 'windows' in self.os_info.lower():
+            delimiter = "\\"
+        else:
+            delimiter = "/"
 
-        destination_dir = _create_destination_path(destination_dir, os.path.split(source_dir)[-1])
+        if max_workers is not None:
+            self.file_uploader.max_workers = max_workers
 
-        for item in source_list:
-            item = os.path.join(source_dir, item)
-            if os.path.isfile(item):
-                self.upload_file(item, destination_dir)
-            else:
-                self.upload_folder(item, destination_dir)
+        return self.file_uploader.upload_folder(source_dir, destination_dir, delimiter)
 
     def restart_services(self, wait_for_service_restart=True, timeout=10):
         """Executes the command on the client machine to restart all services.
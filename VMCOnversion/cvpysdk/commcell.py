@@ -46,6 +46,8 @@ Commcell:
 
     get_saml_token()            --  returns the SAML token for the currently logged-in user
 
+    close()                     --  closes the pooled HTTP session, and all its open connections
+
 
 Commcell instance Attributes
 ============================
@@ -73,9 +75,18 @@ Commcell instance Attributes
 
     **device_id**               --  returns the id associated with the calling machine
 
+    **connection_stats**        --  returns the number of requests sent, and the number of
+    connections opened / re-used by the pooled HTTP session of the Commcell
+
+    **entity_cache**            --  returns the instance of the `EntityCache` class, caching the
+    properties of the clients, agents, instances, backupsets, and subclients for a TTL
+
     **clients**                 --  returns the instance of the `Clients` class,
     to interact with the clients added on the Commcell
 
+    **clients_ttl**             --  seconds after which the lists of clients are loaded again
+    from the Commcell, on their next access through the `Clients` class instance
+
     **media_agents**            --  returns the instance of the `MediaAgents` class,
     to interact with the media agents associated with the Commcell class instance
 
@@ -161,6 +172,9 @@ from requests.exceptions import ConnectionError as RequestsConnectionError
 
 from .services import get_services
 from .cvpysdk import CVPySDK
+from .cvpysdk import DEFAULT_POOL_SIZE
+from .cvpysdk import DEFAULT_MAX_RETRIES
+from .cvpysdk import DEFAULT_BACKOFF_FACTOR
 from .client import Clients
 from .alert import Alerts
 from .storage import MediaAgents
@@ -187,6 +201,7 @@ from .schedules import SchedulePattern
 from .activitycontrol import ActivityControl
 from .eventviewer import Events
 from .array_management import ArrayManagement
+from .payload import XmlPayload
 
 
 USER_LOGGED_OUT_MESSAGE = 'User Logged Out. Please initialize the Commcell object again.'
@@ -199,7 +214,13 @@ USER_LOGGED_OUT_MESSAGE = 'User Logged Out. Please initialize the Commcell objec
 class Commcell(object):
     """Class for establishing a session to the Commcell via Commvault REST API."""
 
-    def __init__(self, webconsole_hostname, commcell_username, commcell_password=None):
+    def __init__(self,
+                 webconsole_hostname,
+                 commcell_username,
+                 commcell_password=None,
+                 pool_size=DEFAULT_POOL_SIZE,
+                 max_retries=DEFAULT_MAX_RETRIES,
+                 backoff_factor=DEFAULT_BACKOFF_FACTOR):
         """Initialize the Commcell object with the values required for doing the api operations.
 
             Args:
@@ -211,6 +232,20 @@ class Commcell(object):
 
                     default: None
 
+                pool_size            (int)  --  number of keep-alive connections to maintain in
+                the pool of the HTTP session, per host
+
+                    default: 10
+
+                max_retries          (int)  --  number of retries for connection errors, and for
+                idempotent requests failing with a 502 / 503 / 504
+
+                    default: 3
+
+                backoff_factor     (float)  --  backoff factor to apply between the retries
+
+                    default: 0.5
+
             Returns:
                 object - instance of this class
 
@@ -246,7 +281,7 @@ class Commcell(object):
             # encodes the plain text password using base64 encoding
             self._password = b64encode(commcell_password.encode()).decode()
 
-        self._cvpysdk_object = CVPySDK(self)
+        self._cvpysdk_object = CVPySDK(self, pool_size, max_retries, backoff_factor)
 
         # Checks if the service is running or not
         for service in web_service:
@@ -283,6 +318,7 @@ class Commcell(object):
         self._commserv_version = None
 
         self._clients = None
+        self._clients_ttl = None
         self._media_agents = None
         self._workflows = None
         self._alerts = None
@@ -333,6 +369,7 @@ class Commcell(object):
     def __exit__(self, exception_type, exception_value, traceback):
         """Logs out the user associated with the current instance."""
         output = self._cvpysdk_object._logout()
+        self._cvpysdk_object.close()
         self._remove_attribs_()
         return output
 
@@ -442,7 +479,7 @@ class Commcell(object):
 
         """
         flag, response = self._cvpysdk_object.make_request(
-            'POST', self._services['EXECUTE_QCOMMAND'], request_xml
+            'POST', self._services['EXECUTE_QCOMMAND'], XmlPayload(request_xml)
         )
 
         if flag:
@@ -501,12 +538,37 @@ class Commcell(object):
         except AttributeError:
             return USER_LOGGED_OUT_MESSAGE
 
+    @property
+    def connection_stats(self):
+        """Returns the connection usage statistics of the pooled HTTP session."""
+        try:
+            return self._cvpysdk_object.connection_stats
+        except AttributeError:
+            return USER_LOGGED_OUT_MESSAGE
+
+    @property
+    def entity_cache(self):
+        """Returns the cache of the entity properties responses, for this session.
+
+            Cache is disabled by default, set the **ttl** of the cache to enable it:
+
+                >>> commcell.entity_cache.ttl = 300
+
+            Once enabled, the refresh() of the entities may return properties up to **ttl**
+            seconds old, unless they were modified via this session.
+
+        """
+        try:
+            return self._cvpysdk_object.entity_cache
+        except AttributeError:
+            return USER_LOGGED_OUT_MESSAGE
+
     @property
     def clients(self):
         """Returns the instance of the Clients class."""
         try:
             if self._clients is None:
-                self._clients = Clients(self)
+                self._clients = Clients(self, self._clients_ttl)
 
             return self._clients
         except AttributeError:
@@ -514,6 +576,26 @@ class Commcell(object):
         except SDKException:
             return None
 
+    @property
+    def clients_ttl(self):
+        """Returns the seconds after which the lists of clients are loaded again."""
+        return self._clients_ttl
+
+    @clients_ttl.setter
+    def clients_ttl(self, value):
+        """Sets the seconds after which the lists of clients are loaded again, on their next
+            access, for long running sessions.
+
+            Args:
+                value   (int)   --  seconds after which the lists are loaded again,
+                or None to never expire the lists
+
+        """
+        if self._clients is not None:
+            self._clients.ttl = value
+
+        self._clients_ttl = value
+
     @property
     def media_agents(self):
         """Returns the instance of the MediaAgents class."""
@@ -819,9 +901,19 @@ class Commcell(object):
             return 'User already logged out.'
 
         output = self._cvpysdk_object._logout()
+        self._cvpysdk_object.close()
         self._remove_attribs_()
         return output
 
+    def close(self):
+        """Closes the pooled HTTP session of the Commcell, and all the connections open in the
+            pool, without logging out the user.
+
+            Connections are opened again on demand, for any request made after this call.
+
+        """
+        self._cvpysdk_object.close()
+
     def request(self, request_type, request_url, request_body=None):
         """Runs the request of the type specified on the request URL, with the body passed
             in the arguments.
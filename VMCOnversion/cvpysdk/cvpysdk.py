@@ -25,11 +25,22 @@ This file is used to perform Authentication for the user on the Commcell.
 
     #.  Common method to be used in the entire SDK to perform REST API call on the Web Server
 
+    #.  Send the typed payloads (JsonPayload, XmlPayload, RawPayload, StreamPayload) with the
+        content type they declare, serialized only once, and streamed if large
+
+    #.  Maintain a pooled, keep-alive HTTP session, shared by all the API calls made for the
+        Commcell, to avoid a new TCP / TLS handshake for every request
+
+    #.  Cache the entity properties responses, if enabled, and invalidate them on the
+        POST / PUT / DELETE requests made on the same entities
+
 
 CVPySDK:
 
     __init__(commcell_object)   --  initialise object of the CVPySDK class and bind to the commcell
 
+    _create_session()           --  creates the pooled requests session used for all the requests
+
     _is_valid_service()         --  checks if the service is valid and running or not
 
     _login()                    --  sign in the user to the commcell with the credentials provided
@@ -42,15 +53,28 @@ CVPySDK:
     make_request()              --  run the http request specified on the URL/WebService provided,
     and return the flag specifying success/fail, and response
 
+    close()                     --  closes the pooled session, and all the open connections
+
+
+CVPySDK instance Attributes
+===========================
+
+    **session**                 --  returns the pooled `requests.Session` used for the requests
+
+    **connection_stats**        --  returns the number of requests sent, connections opened, and
+    connections re-used by the pooled session
+
+    **entity_cache**            --  returns the EntityCache of the GET responses for this session
+
 """
 
 from __future__ import absolute_import
 from __future__ import unicode_literals
 
-from xml.parsers.expat import ExpatError
-
 import requests
-import xmltodict
+
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.util.retry import Retry
 
 try:
     # Python 2 import
@@ -60,6 +84,24 @@ except ImportError:
     import http.client as httplib
 
 from .exception import SDKException
+from .entity_cache import EntityCache
+from .payload import Payload
+from .payload import as_payload
+from .response import CVResponse
+
+
+DEFAULT_POOL_SIZE = 10
+"""int:     Default number of connections kept alive in the pool, per host."""
+
+DEFAULT_MAX_RETRIES = 3
+"""int:     Default number of retries for connection errors, and idempotent requests failing
+                with one of the status codes in `RETRY_STATUS_CODES`."""
+
+DEFAULT_BACKOFF_FACTOR = 0.5
+"""float:   Default backoff factor, sleep between retries is: backoff * (2 ^ (retry - 1))."""
+
+RETRY_STATUS_CODES = (502, 503, 504)
+"""tuple:   HTTP status codes on which an idempotent request is retried."""
 
 
 class CVPySDK(object):
@@ -68,17 +110,132 @@ class CVPySDK(object):
         Also contains common method for running all HTTP requests.
     """
 
-    def __init__(self, commcell_object):
+    def __init__(self,
+                 commcell_object,
+                 pool_size=DEFAULT_POOL_SIZE,
+                 max_retries=DEFAULT_MAX_RETRIES,
+                 backoff_factor=DEFAULT_BACKOFF_FACTOR):
         """Initialize the CVPySDK object for running various operations.
 
             Args:
                 commcell_object     (object)    --  instance of the Commcell class
 
+                pool_size           (int)       --  number of connections to keep alive in the
+                pool, per host
+
+                    default: 10
+
+                max_retries         (int)       --  number of retries for connection errors,
+                and for idempotent requests failing with a 502 / 503 / 504
+
+                    default: 3
+
+                backoff_factor      (float)     --  backoff factor to apply between the retries
+
+                    default: 0.5
+
             Returns:
                 object  -   instance of the CVPySDK class
 
         """
         self._commcell_object = commcell_object
+        self._session = self._create_session(pool_size, max_retries, backoff_factor)
+        self._entity_cache = EntityCache()
+
+    def _create_session(self, pool_size, max_retries, backoff_factor):
+        """Creates the requests session, with a pooled keep-alive adapter mounted for both
+            http and https, to be used for all the requests made for this Commcell.
+
+            POST requests are not retried on a read error or a status code, as they are not
+            idempotent, and can trigger the same operation on the server twice.
+
+            Args:
+                pool_size       (int)       --  number of connections to keep alive, per host
+
+                max_retries     (int)       --  number of retries for the failed requests
+
+                backoff_factor  (float)     --  backoff factor to apply between the retries
+
+            Returns:
+                object  -   instance of the requests.Session class
+
+        """
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            raise_on_status=False
+        )
+
+        adapter = HTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+        )
+
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers['Connection'] = 'keep-alive'
+
+        return session
+
+    @property
+    def session(self):
+        """Returns the pooled requests session used for all the requests."""
+        return self._session
+
+    @property
+    def connection_stats(self):
+        """Returns the usage statistics of the connections in the pool of the session.
+
+            Returns:
+                dict    -   dictionary consisting of the connection usage statistics
+
+                    {
+                        "requests": 120,
+
+                        "connections": 2,
+
+                        "reused": 118,
+
+                        "reuse_ratio": 0.98
+                    }
+
+        """
+        num_requests = num_connections = 0
+
+        for adapter in set(self._session.adapters.values()):
+            pools = adapter.poolmanager.pools
+
+            for key in list(pools.keys()):
+                try:
+                    pool = pools[key]
+                except KeyError:
+                    # pool was evicted by another thread
+                    continue
+
+                num_requests += pool.num_requests
+                num_connections += pool.num_connections
+
+        reused = max(num_requests - num_connections, 0)
+
+        return {
+            'requests': num_requests,
+            'connections': num_connections,
+            'reused': reused,
+            'reuse_ratio': round(float(reused) / num_requests, 2) if num_requests else 0.0
+        }
+
+    @property
+    def entity_cache(self):
+        """Returns the cache of the entity GET responses, shared by all the requests."""
+        return self._entity_cache
+
+    def close(self):
+        """Closes the pooled session, and all the connections open in the pool."""
+        self._session.close()
+        self._entity_cache.clear()
 
     def _is_valid_service(self):
         """Checks if the service url is a valid url or not.
@@ -97,7 +254,7 @@ class CVPySDK(object):
 
         """
         try:
-            response = requests.get(self._commcell_object._web_service, timeout=184)
+            response = self._session.get(self._commcell_object._web_service, timeout=184)
 
             # Valid service if the status code is 200 and response is True
             return response.status_code == httplib.OK and response.ok
@@ -216,7 +373,14 @@ class CVPySDK(object):
         else:
             return 'User already logged out'
 
-    def make_request(self, method, url, payload=None, attempts=0, headers=None, stream=False):
+    def make_request(self,
+                     method,
+                     url,
+                     payload=None,
+                     attempts=0,
+                     headers=None,
+                     stream=False,
+                     cache=False):
         """Makes the request of the type specified in the argument 'method'.
 
             Args:
@@ -235,7 +399,10 @@ class CVPySDK(object):
                 url         (str)           --  the web url or service to run the HTTP request on
 
 
-                payload     (dict / str)    --  data to be passed along with the request
+                payload     (dict / str / Payload)  --  data to be passed along with the request
+
+                    instance of JsonPayload / XmlPayload / RawPayload / StreamPayload is sent
+                    with its content type, and string or bytes payload starting with < as XML
 
                     default: None
 
@@ -257,12 +424,24 @@ class CVPySDK(object):
 
                     default: False
 
+
+                cache       (bool)          --  boolean specifying whether the response of the GET
+                request can be served from, and stored in the entity cache
+
+                    response is cached only if the entity cache is enabled, i.e., has a TTL > 0,
+                    and the request was success
+
+                    default: False
+
             Returns:
                 tuple:
                     (True, response)    -   in case of success
 
                     (False, response)   -   in case of failure
 
+                    where, response is an instance of the CVResponse class, wrapping the
+                    requests response, which decodes the JSON body only once
+
             Raises:
                 SDKException:
                     if the method passed is incorrect / not supported
@@ -275,47 +454,61 @@ class CVPySDK(object):
         """
         try:
             if headers is None:
-                headers = self._commcell_object._headers.copy()
+                # headers are not modified, copied by the payload only to set its content type
+                headers = self._commcell_object._headers
+
+            use_cache = cache and method == 'GET' and not stream and self._entity_cache.enabled
+
+            if use_cache:
+                cached_response = self._entity_cache.get(url)
+
+                if cached_response is not None:
+                    # new wrapper for every hit, so the callers do not share the decoded dict
+                    return (True, CVResponse(cached_response))
+            elif method != 'GET':
+                self._entity_cache.invalidate(url)
 
             if method == 'POST':
-                if isinstance(payload, (dict, list)):
-                    response = requests.post(url, headers=headers, json=payload, stream=stream)
+                payload = as_payload(payload)
+
+                if payload is None:
+                    response = self._session.post(url, headers=headers, stream=stream)
                 else:
-                    try:
-                        # call encode on the payload in case the characters in the payload
-                        # are not encoded, and to encode the string payload to bytes
-                        payload = payload.encode()
-                    except AttributeError:
-                        # pass silently if payload is alredy encoded in bytes
-                        pass
-
-                    if 'Content-type' in headers:
-                        try:
-                            if payload is not None:
-                                xmltodict.parse(payload)
-                            headers['Content-type'] = 'application/xml'
-                        except ExpatError:
-                            headers['Content-type'] = 'text/plain'
-
-                    response = requests.post(url, headers=headers, data=payload, stream=stream)
+                    response = self._session.post(
+                        url, headers=payload.headers(headers), data=payload.body(), stream=stream
+                    )
             elif method == 'GET':
-                response = requests.get(url, headers=headers, stream=stream)
+                response = self._session.get(url, headers=headers, stream=stream)
             elif method == 'PUT':
-                response = requests.put(url, headers=headers, json=payload)
+                if isinstance(payload, Payload):
+                    response = self._session.put(
+                        url, headers=payload.headers(headers), data=payload.body()
+                    )
+                else:
+                    response = self._session.put(url, headers=headers, json=payload)
             elif method == 'DELETE':
-                response = requests.delete(url, headers=headers)
+                response = self._session.delete(url, headers=headers)
             else:
                 raise SDKException('CVPySDK', '102', 'HTTP method {} not supported'.format(method))
 
             if response.status_code == httplib.UNAUTHORIZED and headers['Authtoken'] is not None:
                 if attempts < 3:
                     self._commcell_object._headers['Authtoken'] = self._renew_login_token()
-                    return self.make_request(method, url, payload, attempts + 1)
+                    return self.make_request(
+                        method, url, payload, attempts + 1, stream=stream, cache=cache
+                    )
                 else:
                     # Raise max attempts exception, if attempts exceeds 3
                     raise SDKException('CVPySDK', '103')
 
+            # wrap the response to decode the JSON body only once, irrespective of the
+            # number of times response.json() is called by the caller
+            response = CVResponse(response)
+
             if response.status_code == httplib.OK and response.ok:
+                if use_cache:
+                    self._entity_cache.set(url, response.response)
+
                 return (True, response)
             else:
                 return (False, response)
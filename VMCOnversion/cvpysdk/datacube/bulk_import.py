@@ -0,0 +1,390 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------------
+# Copyright Commvault Systems, Inc.
+# See LICENSE.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+"""File for importing a large number of documents into a Datasource of the Datacube.
+
+BulkImporter is the ingestion pipeline used by the **Datasource.bulk_import()** method.
+
+    #.  Documents are read from any iterable, or generator, and are never held in memory
+        all at once
+
+    #.  Documents are serialized to JSON by a serializer thread, and grouped into batches,
+        limited by the number of documents, and the size of the batch in bytes
+
+    #.  Batches are imported by a pool of workers, with a bounded number of import requests
+        in flight, so the serializer does not run ahead of the backend
+
+    #.  A failed batch is imported again, up to the maximum retries, with a backoff, only if
+        the request was never sent, or the server failed with a 5xx error, so the documents
+        of a batch are not imported twice
+
+    #.  Each import returns the number of documents, batches, bytes, failures, and the
+        documents imported per second
+
+
+BulkImporter:
+
+    __init__(datasource_object,
+             batch_size,
+             max_batch_bytes,
+             max_in_flight,
+             max_retries)           --  initialize the instance of the BulkImporter class,
+    for the given datasource
+
+    __repr__()                      --  returns the string representation of the instance
+
+    _batches()                      --  serializes the documents, and groups them into batches
+
+    _post_batch()                   --  posts a single batch, and returns if it can be retried
+
+    _import_batch()                 --  imports a single batch, retrying on failure
+
+    _serialize()                    --  submits the batches to the workers, with a bounded
+    number of batches in flight
+
+    run()                           --  imports all the documents into the datasource
+
+
+BulkImporter instance Attributes
+================================
+
+    **stats**                       --  returns the statistics of the last import
+
+"""
+
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import json
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from requests.packages.urllib3.exceptions import NewConnectionError
+
+from ..exception import SDKException
+from ..payload import JsonPayload
+
+
+DEFAULT_BATCH_SIZE = 1000
+"""int:     Default maximum number of documents in a batch."""
+
+DEFAULT_MAX_BATCH_BYTES = 1024 ** 2 * 8
+"""int:     Default maximum size of a batch, in bytes."""
+
+DEFAULT_MAX_IN_FLIGHT = 4
+"""int:     Default number of import requests in flight."""
+
+DEFAULT_MAX_RETRIES = 3
+"""int:     Default number of times a failed batch is imported again, before giving up."""
+
+
+class BulkImporter(object):
+    """Class for importing a large number of documents into a Datasource."""
+
+    def __init__(self,
+                 datasource_object,
+                 batch_size=DEFAULT_BATCH_SIZE,
+                 max_batch_bytes=DEFAULT_MAX_BATCH_BYTES,
+                 max_in_flight=DEFAULT_MAX_IN_FLIGHT,
+                 max_retries=DEFAULT_MAX_RETRIES):
+        """Initialize the BulkImporter object for the given datasource.
+
+            Args:
+                datasource_object   (object)    --  instance of the Datasource class
+
+                batch_size          (int)       --  maximum number of documents in a batch
+
+                    default: 1000
+
+                max_batch_bytes     (int)       --  maximum size of a batch, in bytes,
+                a document larger than this is imported in a batch of its own
+
+                    default: 8 MB
+
+                max_in_flight       (int)       --  number of import requests in flight
+
+                    default: 4
+
+                max_retries         (int)       --  number of times to import a failed batch again
+
+                    default: 3
+
+            Returns:
+                object  -   instance of the BulkImporter class
+
+            Raises:
+                SDKException:
+                    if any of the limits is not a positive integer
+
+        """
+        for value in (batch_size, max_batch_bytes, max_in_flight):
+            if not isinstance(value, int) or value <= 0:
+                raise SDKException('Datacube', '101')
+
+        if not isinstance(max_retries, int) or max_retries < 0:
+            raise SDKException('Datacube', '101')
+
+        self._datasource_object = datasource_object
+        self.batch_size = batch_size
+        self.max_batch_bytes = max_batch_bytes
+        self.max_in_flight = max_in_flight
+        self._max_retries = max_retries
+
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def __repr__(self):
+        """String representation of the instance of this class."""
+        return "BulkImporter class instance for Datasource: '{0}'".format(
+            self._datasource_object.datasource_name
+        )
+
+    @property
+    def stats(self):
+        """Returns the statistics of the last import, as a dict."""
+        with self._lock:
+            return dict(self._stats)
+
+    def _batches(self, documents):
+        """Serializes the documents, and groups them into batches.
+
+            Args:
+                documents   (iterable)  --  documents to import, each a dict of key value pairs
+
+            Yields:
+                tuple   -   (number of documents, JSON list of the documents as bytes)
+
+        """
+        encoded_docs = []
+        batch_bytes = 2
+
+        for document in documents:
+            encoded_doc = json.dumps(document).encode('utf-8')
+
+            if encoded_docs and (len(encoded_docs) >= self.batch_size or
+                                 batch_bytes + len(encoded_doc) + 1 > self.max_batch_bytes):
+                yield len(encoded_docs), b'[' + b','.join(encoded_docs) + b']'
+                encoded_docs = []
+                batch_bytes = 2
+
+            encoded_docs.append(encoded_doc)
+            batch_bytes += len(encoded_doc) + 1
+
+        if encoded_docs:
+            yield len(encoded_docs), b'[' + b','.join(encoded_docs) + b']'
+
+    def _post_batch(self, payload):
+        """Posts the batch to the import data API of the datasource.
+
+            Args:
+                payload     (bytes) --  JSON list of the documents
+
+            Returns:
+                tuple   -   (error, retry), error is None if the batch was imported, and retry
+                is True only if the documents were surely not imported
+
+        """
+        cvpysdk_object = self._datasource_object._datacube_object._commcell_object._cvpysdk_object
+
+        try:
+            flag, response = cvpysdk_object.make_request(
+                'POST', self._datasource_object._DATACUBE_IMPORT_DATA, JsonPayload(payload)
+            )
+        except requests.exceptions.ConnectTimeout as excp:
+            return str(excp), True
+        except requests.exceptions.ConnectionError as excp:
+            # the connection could not be opened, so the request was never sent
+            reason = getattr(excp.args[0], 'reason', None) if excp.args else None
+            return str(excp), isinstance(reason, NewConnectionError)
+        except (SDKException, requests.exceptions.RequestException) as excp:
+            return str(excp), False
+
+        if not flag and response.status_code >= 500:
+            return 'Response status {0}: {1}'.format(response.status_code, response.text), True
+
+        try:
+            # an errorCode returned by the server is never retried
+            self._datasource_object._check_import_response(flag, response)
+        except SDKException as excp:
+            return str(excp), False
+
+        return None, False
+
+    def _import_batch(self, doc_count, payload):
+        """Imports the batch, and records the result in the statistics.
+
+            Batch is imported again, up to the maximum retries, only if the request was never
+            sent, or the server failed with a 5xx error.
+
+            Args:
+                doc_count   (int)   --  number of documents in the batch
+
+                payload     (bytes) --  JSON list of the documents
+
+        """
+        attempt = 0
+
+        while True:
+            try:
+                error, retry = self._post_batch(payload)
+            except Exception as excp:
+                # e.g., a 200 response which is not JSON, the batch may have been imported
+                error, retry = 'Failed to import the batch: {0}'.format(excp), False
+
+            if error is None:
+                break
+            else:
+                attempt += 1
+
+                if not retry or attempt > self._max_retries:
+                    with self._lock:
+                        self._stats['failed_batches'] += 1
+                        self._stats['failed_documents'] += doc_count
+                        self._stats['errors'].append(error)
+                    return
+
+                with self._lock:
+                    self._stats['retries'] += 1
+
+                time.sleep(min(2 ** attempt, 30))
+
+        with self._lock:
+            self._stats['imported_documents'] += doc_count
+
+    def _serialize(self, documents, executor, in_flight):
+        """Serializes the documents into batches, and submits them to the workers.
+
+            Args:
+                documents   (iterable)              --  documents to import
+
+                executor    (ThreadPoolExecutor)    --  pool of the import workers
+
+                in_flight   (BoundedSemaphore)      --  limits the batches submitted, and not
+                yet imported
+
+        """
+        try:
+            for doc_count, payload in self._batches(documents):
+                in_flight.acquire()
+
+                with self._lock:
+                    self._stats['documents'] += doc_count
+                    self._stats['batches'] += 1
+                    self._stats['bytes'] += len(payload)
+
+                future = executor.submit(self._import_batch, doc_count, payload)
+                future.add_done_callback(lambda _: in_flight.release())
+        except Exception as excp:
+            with self._lock:
+                self._stats['errors'].append(
+                    'Failed to serialize the documents: {0}'.format(excp)
+                )
+
+    def run(self, documents, raise_error=True):
+        """Imports all the documents into the datasource.
+
+            Args:
+                documents   (iterable)  --  documents to import, each a dict of key value pairs,
+                can be a list, or a generator
+
+                raise_error (bool)      --  raise exception if any batch failed to import
+
+                    default: True
+
+            Returns:
+                dict    -   statistics of the import
+
+                    {
+                        'documents': 100000,
+
+                        'imported_documents': 100000,
+
+                        'failed_documents': 0,
+
+                        'batches': 100,
+
+                        'failed_batches': 0,
+
+                        'retries': 1,
+
+                        'bytes': 52428800,
+
+                        'time_taken': 20.5,
+
+                        'docs_per_sec': 4878.0,
+
+                        'errors': []
+                    }
+
+            Raises:
+                SDKException:
+                    if any batch failed to import, or documents failed to serialize,
+                    or any batch is neither imported, nor failed, and raise_error is True
+
+        """
+        with self._lock:
+            self._stats = {
+                'documents': 0,
+                'imported_documents': 0,
+                'failed_documents': 0,
+                'batches': 0,
+                'failed_batches': 0,
+                'retries': 0,
+                'bytes': 0,
+                'time_taken': 0,
+                'docs_per_sec': 0,
+                'errors': []
+            }
+
+        start_time = time.time()
+        in_flight = threading.BoundedSemaphore(self.max_in_flight)
+        executor = ThreadPoolExecutor(max_workers=self.max_in_flight)
+
+        try:
+            serializer = threading.Thread(
+                target=self._serialize, args=(documents, executor, in_flight),
+                name='BulkImportSerializer'
+            )
+            serializer.daemon = True
+            serializer.start()
+            serializer.join()
+        finally:
+            executor.shutdown(wait=True)
+
+        time_taken = time.time() - start_time
+
+        with self._lock:
+            self._stats['time_taken'] = round(time_taken, 3)
+
+            if time_taken:
+                self._stats['docs_per_sec'] = round(
+                    self._stats['imported_documents'] / time_taken, 1
+                )
+
+            stats = dict(self._stats)
+
+        unaccounted = (
+            stats['documents'] - stats['imported_documents'] - stats['failed_documents']
+        )
+
+        if (stats['errors'] or unaccounted) and raise_error:
+            error = stats['errors'][-1] if stats['errors'] else (
+                '{0} documents were neither imported, nor failed'.format(unaccounted)
+            )
+
+            raise SDKException(
+                'Datacube', '102', 'Failed to import {0} of {1} documents\nError: "{2}"'.format(
+                    stats['documents'] - stats['imported_documents'], stats['documents'], error
+                )
+            )
+
+        return stats
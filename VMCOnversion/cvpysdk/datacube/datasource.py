@@ -63,8 +63,16 @@ Datasource:
 
     update_datasource_schema(schema)    --  updates the schema for the given data source
 
+    _import_data(payload)               --  posts the documents to the import data API
+
+    _check_import_response(flag,
+                           response)    --  checks the response of the import data API
+
     import_data(data)                   --  imports/pumps given data into data source.
 
+    bulk_import(documents)              --  imports a large number of documents into the data
+                                                source, in concurrent batches
+
     delete_content()                    --  deletes the contents of the data source.
 
     refresh()                           --  refresh the properties of the datasource
@@ -76,10 +84,16 @@ from __future__ import unicode_literals
 
 from past.builtins import basestring
 
+from .bulk_import import BulkImporter
+from .bulk_import import DEFAULT_BATCH_SIZE
+from .bulk_import import DEFAULT_MAX_BATCH_BYTES
+from .bulk_import import DEFAULT_MAX_IN_FLIGHT
+from .bulk_import import DEFAULT_MAX_RETRIES
 from .handler import Handlers
 from .sedstype import SEDS_TYPE_DICT
 
 from ..exception import SDKException
+from ..payload import JsonPayload
 
 
 class Datasources(object):
@@ -642,11 +656,12 @@ class Datasource(object):
                 response.text)
             raise SDKException('Response', '101', response_string)
 
-    def import_data(self, data):
-        """imports/pumps given data into data source.
+    def _import_data(self, payload):
+        """Posts the documents to the import data API of the data source.
 
             Args:
-                data (list)   -- data to be indexed and pumped into  solr.list of key value pairs.
+                payload (list / bytes)  --  documents to import, or the JSON list of the documents
+                already serialized to bytes
 
             Raises:
                 SDKException:
@@ -656,8 +671,25 @@ class Datasource(object):
 
         """
         flag, response = self._datacube_object._commcell_object._cvpysdk_object.make_request(
-            'POST', self._DATACUBE_IMPORT_DATA, data
+            'POST', self._DATACUBE_IMPORT_DATA, JsonPayload(payload)
         )
+        self._check_import_response(flag, response)
+
+    def _check_import_response(self, flag, response):
+        """Checks the response of the import data API.
+
+            Args:
+                flag        (bool)      --  True if the request succeeded
+
+                response    (object)    --  response of the import data API
+
+            Raises:
+                SDKException:
+                    if response is empty
+
+                    if response is not success
+
+        """
         if flag:
             if response.json() and 'errorCode' in response.json():
                 error_code = response.json()['errorCode']
@@ -671,11 +703,73 @@ class Datasource(object):
             else:
                 raise SDKException('Response', '102')
         else:
-            response_string = self._commcell_object._commcell_object._update_response_(
+            response_string = self._datacube_object._commcell_object._update_response_(
                 response.text
             )
             raise SDKException('Response', '101', response_string)
 
+    def import_data(self, data):
+        """imports/pumps given data into data source.
+
+            Args:
+                data (list)   -- data to be indexed and pumped into  solr.list of key value pairs.
+
+            Raises:
+                SDKException:
+                    if response is empty
+
+                    if response is not success
+
+        """
+        self._import_data(data)
+
+    def bulk_import(self,
+                    documents,
+                    batch_size=DEFAULT_BATCH_SIZE,
+                    max_batch_bytes=DEFAULT_MAX_BATCH_BYTES,
+                    max_in_flight=DEFAULT_MAX_IN_FLIGHT,
+                    max_retries=DEFAULT_MAX_RETRIES,
+                    raise_error=True):
+        """imports a large number of documents into the data source, in concurrent batches.
+
+            Args:
+                documents       (iterable)  --  documents to import, each a dict of key value
+                pairs, can be a list, or a generator
+
+                batch_size      (int)       --  maximum number of documents in a batch
+
+                    default: 1000
+
+                max_batch_bytes (int)       --  maximum size of a batch, in bytes
+
+                    default: 8 MB
+
+                max_in_flight   (int)       --  number of import requests in flight
+
+                    default: 4
+
+                max_retries     (int)       --  number of times to import a failed batch again
+
+                    default: 3
+
+                raise_error     (bool)      --  raise exception if any batch failed to import
+
+                    default: True
+
+            Returns:
+                dict    -   statistics of the import, with the number of documents, batches,
+                bytes, failures, and the documents imported per second
+
+            Raises:
+                SDKException:
+                    if any of the limits is not a positive integer
+
+                    if any batch failed to import, and raise_error is True
+
+        """
+        importer = BulkImporter(self, batch_size, max_batch_bytes, max_in_flight, max_retries)
+        return importer.run(documents, raise_error)
+
     def delete_content(self):
         """deletes the content of a data source from Data Cube.
            The data source itself is not deleted using this API.
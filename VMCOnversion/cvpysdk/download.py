@@ -0,0 +1,715 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------------
+# Copyright Commvault Systems, Inc.
+# See LICENSE.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+"""File for downloading large files from the Commcell, to the controller machine.
+
+FileDownloader is the download engine used by the **DownloadCenter.download_package()** method.
+
+    #.  File is downloaded to a **.part** file next to the destination, and renamed to the
+        destination only once it is complete, and verified
+
+    #.  If the server supports range requests, an interrupted download is resumed from the
+        bytes already in the **.part** file, by the same call after a failed chunk, or by the
+        next call for the same destination. Size and the validator (ETag, or Last-Modified) of
+        the file are saved in a **.part.json** file, and the **.part** file is downloaded again
+        if the file on the server changed
+
+    #.  If the server supports range requests, and more than one stream is configured, the file
+        is split into segments, fetched in parallel, and written at their offset in the
+        **.part** file. Progress of each segment is saved in a **.part.json** file, to resume
+        the segments on the next call
+
+    #.  Checksum of the file is computed as the bytes are streamed, for a single stream, and
+        verified against the expected checksum, if given
+
+    #.  Progress callback is called with the bytes downloaded, the total bytes, and the
+        throughput, after every chunk
+
+
+FileDownloader:
+
+    __init__(cvpysdk_object,
+             chunk_size,
+             streams,
+             max_retries,
+             progress_callback)     --  initialize the instance of the FileDownloader class
+
+    __repr__()                      --  returns the string representation of the instance
+
+    _request()                      --  sends the request for the range of the file
+
+    _load_state()                   --  returns the saved state of the part file
+
+    _save_state()                   --  saves the state of the part file
+
+    _report()                       --  records the downloaded bytes, and calls the callback
+
+    _download_sequential()          --  downloads the file in a single stream
+
+    _download_segment()             --  downloads a single segment of the file
+
+    _download_parallel()            --  downloads the segments of the file in parallel
+
+    _verify()                       --  verifies the size, and checksum of the downloaded file
+
+    download()                      --  downloads the file from the url to the destination
+
+
+FileDownloader instance Attributes
+==================================
+
+    **chunk_size**                  --  size of each chunk read from the stream, in bytes
+
+    **streams**                     --  number of segments downloaded in parallel
+
+"""
+
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from .exception import SDKException
+from .payload import Payload
+from .payload import XmlPayload
+
+
+DEFAULT_CHUNK_SIZE = 1024 ** 2
+"""int:     Default size of each chunk read from the stream, in bytes."""
+
+DEFAULT_STREAMS = 1
+"""int:     Default number of segments downloaded in parallel."""
+
+DEFAULT_MAX_RETRIES = 3
+"""int:     Default number of times a failed stream is resumed, before giving up."""
+
+MIN_SEGMENT_SIZE = 1024 ** 2 * 16
+"""int:     Files are split into segments of at least this size, for a parallel download."""
+
+PART_SUFFIX = '.part'
+"""str:     Suffix of the file, the bytes are downloaded to."""
+
+STATE_SUFFIX = '.part.json'
+"""str:     Suffix of the file, the progress of the segments is saved to."""
+
+_CONTENT_RANGE = re.compile(r'bytes\s+(\d+)-(\d+)/(\d+|\*)')
+
+_UNSATISFIED_RANGE = re.compile(r'bytes\s+\*/(\d+)')
+
+
+class FileDownloader(object):
+    """Class for downloading large files from the Commcell, with resume, and parallel ranges."""
+
+    def __init__(self,
+                 cvpysdk_object,
+                 chunk_size=DEFAULT_CHUNK_SIZE,
+                 streams=DEFAULT_STREAMS,
+                 max_retries=DEFAULT_MAX_RETRIES,
+                 progress_callback=None):
+        """Initialize the FileDownloader object.
+
+            Args:
+                cvpysdk_object      (object)    --  instance of the CVPySDK class
+
+                chunk_size          (int)       --  size of each chunk read from the stream
+
+                    default: 1 MB
+
+                streams             (int)       --  number of segments to download in parallel,
+                if the server supports range requests
+
+                    default: 1
+
+                max_retries         (int)       --  number of times to resume a failed stream
+
+                    default: 3
+
+                progress_callback   (callable)  --  function called after every chunk, with the
+                bytes downloaded, the total bytes (None if not known), and the throughput in MB/s
+
+                    default: None
+
+            Returns:
+                object  -   instance of the FileDownloader class
+
+            Raises:
+                SDKException:
+                    if chunk size, or streams is not a positive integer
+
+        """
+        self._cvpysdk_object = cvpysdk_object
+        self.chunk_size = chunk_size
+        self.streams = streams
+        self._max_retries = max_retries
+        self._progress_callback = progress_callback
+
+        self._lock = threading.Lock()
+        self._downloaded = 0
+        self._total = None
+        self._start_time = None
+        self._resumed_from = 0
+        self._validator = None
+
+    def __repr__(self):
+        """String representation of the instance of this class."""
+        return 'FileDownloader class instance with {0} streams of {1} byte chunks'.format(
+            self.streams, self.chunk_size
+        )
+
+    @property
+    def chunk_size(self):
+        """Returns the size of each chunk read from the stream, in bytes."""
+        return self._chunk_size
+
+    @chunk_size.setter
+    def chunk_size(self, value):
+        """Sets the size of each chunk read from the stream, in bytes."""
+        if not isinstance(value, int) or value <= 0:
+            raise SDKException('Download', '101')
+
+        self._chunk_size = value
+
+    @property
+    def streams(self):
+        """Returns the number of segments downloaded in parallel."""
+        return self._streams
+
+    @streams.setter
+    def streams(self, value):
+        """Sets the number of segments downloaded in parallel."""
+        if not isinstance(value, int) or value <= 0:
+            raise SDKException('Download', '101')
+
+        self._streams = value
+
+    def _request(self, url, payload, start=0, end=None, validator=None):
+        """Sends the request for the range of the file, and returns the streamed response.
+
+            Args:
+                url         (str)       --  url to download the file from
+
+                payload     (object)    --  instance of the Payload class, for the request
+
+                start       (int)       --  offset of the first byte to download
+
+                    default: 0
+
+                end         (int)       --  offset of the last byte to download,
+                till the end of the file if None
+
+                    default: None
+
+                validator   (str)       --  ETag, or Last-Modified of the file the bytes before
+                the start were downloaded from, the complete file is returned if it changed
+
+                    default: None
+
+            Returns:
+                (object, int, int)  -   streamed response, offset of the first byte in the
+                response, and the total size of the file (None if not known)
+
+                response is None, if the start is at, or after the end of the file, and the
+                offset, and the total are the size of the file (None if not known)
+
+            Raises:
+                SDKException:
+                    if response is not success
+
+        """
+        headers = dict(self._cvpysdk_object._commcell_object._headers)
+        # server returns the complete file with status 200, if range requests are not supported
+        headers['Range'] = 'bytes={0}-{1}'.format(start, '' if end is None else end)
+
+        if start and validator:
+            headers['If-Range'] = validator
+
+        _, response = self._cvpysdk_object.make_request(
+            'POST', url, payload, headers=headers, stream=True
+        )
+
+        if response.status_code == 206:
+            match = _CONTENT_RANGE.match(response.headers.get('Content-Range', ''))
+
+            if match is None:
+                response.close()
+                raise SDKException('Download', '102', 'Invalid Content-Range in the response')
+
+            total = None if match.group(3) == '*' else int(match.group(3))
+            return response, int(match.group(1)), total
+
+        if response.status_code == 200:
+            # range is not supported, or not requested, complete file is returned
+            content_length = response.headers.get('Content-Length')
+            return response, 0, int(content_length) if content_length else None
+
+        if response.status_code == 416 and start:
+            # range starts at, or after the end of the file, the part file may be complete
+            match = _UNSATISFIED_RANGE.match(response.headers.get('Content-Range', ''))
+            response.close()
+
+            total = int(match.group(1)) if match is not None else None
+            return None, total, total
+
+        response_string = self._cvpysdk_object._commcell_object._update_response_(response.text)
+        raise SDKException('Response', '101', response_string)
+
+    @staticmethod
+    def _load_state(part_path, state_path):
+        """Returns the saved state of the part file, None if there is no part file to resume.
+
+            Args:
+                part_path   (str)   --  path of the part file
+
+                state_path  (str)   --  path of the file the state is saved to
+
+            Returns:
+                dict    -   total size, and validator of the file, and the progress of the
+                segments for a parallel download
+
+        """
+        if not (os.path.exists(part_path) and os.path.exists(state_path)):
+            return None
+
+        try:
+            with open(state_path, 'r') as state_file:
+                state = json.load(state_file)
+        except (IOError, ValueError):
+            return None
+
+        return state if isinstance(state, dict) else None
+
+    @staticmethod
+    def _save_state(state_path, state):
+        """Saves the state of the part file, to resume it on the next call.
+
+            Args:
+                state_path  (str)   --  path of the file to save the state to
+
+                state       (dict)  --  total size, and validator of the file, and the
+                progress of the segments for a parallel download
+
+        """
+        with open(state_path, 'w') as state_file:
+            json.dump(state, state_file)
+
+    def _report(self, length):
+        """Records the downloaded bytes, and calls the progress callback.
+
+            Args:
+                length  (int)   --  number of bytes downloaded since the last call
+
+        """
+        with self._lock:
+            self._downloaded += length
+            downloaded = self._downloaded
+
+        if self._progress_callback is not None:
+            time_taken = max(time.time() - self._start_time, 1e-6)
+            self._progress_callback(
+                downloaded, self._total, round(downloaded / (1024.0 ** 2) / time_taken, 2)
+            )
+
+    def _download_sequential(self, url, payload, part_path, hasher, response_details):
+        """Downloads the file in a single stream, resuming from the bytes in the part file.
+
+            Args:
+                url                 (str)       --  url to download the file from
+
+                payload             (object)    --  instance of the Payload class
+
+                part_path           (str)       --  path of the part file
+
+                hasher              (object)    --  hashlib object updated with the bytes before
+                the offset of the response, None to not compute the checksum
+
+                response_details    (tuple)     --  response of the first request, offset of
+                its first byte, and the total size of the file
+
+            Returns:
+                object  -   hashlib object updated with all the bytes of the file
+
+            Raises:
+                SDKException:
+                    if failed to download the file after the maximum retries
+
+        """
+        response, offset, total = response_details
+        attempt = 0
+
+        while True:
+            try:
+                if response is None:
+                    response, start, total = self._request(
+                        url, payload, offset, validator=self._validator
+                    )
+
+                    if response is None:
+                        break
+
+                    if start != offset:
+                        # server returned the file from the start, discard the bytes downloaded
+                        if hasher is not None:
+                            hasher = hashlib.new(hasher.name)
+
+                        with self._lock:
+                            self._downloaded -= offset - start
+
+                        offset = start
+
+                with open(part_path, 'ab') as file_pointer:
+                    # bytes after the offset are discarded, as they may be incomplete
+                    file_pointer.truncate(offset)
+
+                    for content in response.iter_content(chunk_size=self.chunk_size):
+                        file_pointer.write(content)
+                        offset += len(content)
+
+                        if hasher is not None:
+                            hasher.update(content)
+
+                        self._report(len(content))
+
+                if total is not None and offset < total:
+                    raise SDKException('Download', '102', 'Stream ended before the end of file')
+
+                return hasher
+            except (SDKException, requests.exceptions.RequestException, IOError) as excp:
+                attempt += 1
+
+                if attempt > self._max_retries:
+                    raise SDKException('Download', '102', str(excp))
+
+                time.sleep(min(2 ** attempt, 30))
+            finally:
+                if response is not None:
+                    response.close()
+
+                # resumed from the offset by the next attempt
+                response = None
+
+        raise SDKException('Download', '102', 'Range of the file is not satisfiable')
+
+    def _download_segment(self, url, payload, part_path, segment, save_state):
+        """Downloads the segment of the file, resuming from the bytes written to it.
+
+            Args:
+                url         (str)       --  url to download the file from
+
+                payload     (object)    --  instance of the Payload class
+
+                part_path   (str)       --  path of the part file
+
+                segment     (list)      --  first byte, last byte, and bytes written of the
+                segment
+
+                save_state  (callable)  --  saves the progress of the segments
+
+            Raises:
+                SDKException:
+                    if failed to download the segment after the maximum retries
+
+        """
+        attempt = 0
+
+        while segment[0] + segment[2] <= segment[1]:
+            start = segment[0] + segment[2]
+            response = None
+
+            try:
+                response, offset, _ = self._request(url, payload, start, segment[1])
+
+                if offset != start:
+                    raise SDKException('Download', '102', 'Server returned a different range')
+
+                with open(part_path, 'r+b') as file_pointer:
+                    file_pointer.seek(start)
+
+                    for content in response.iter_content(chunk_size=self.chunk_size):
+                        content = content[:segment[1] - segment[0] - segment[2] + 1]
+                        file_pointer.write(content)
+                        segment[2] += len(content)
+                        self._report(len(content))
+                        save_state()
+
+                        if segment[0] + segment[2] > segment[1]:
+                            break
+            except (SDKException, requests.exceptions.RequestException, IOError) as excp:
+                attempt += 1
+
+                if attempt > self._max_retries:
+                    raise SDKException('Download', '102', str(excp))
+
+                time.sleep(min(2 ** attempt, 30))
+            finally:
+                if response is not None:
+                    response.close()
+
+    def _download_parallel(self, url, payload, part_path, state_path, total):
+        """Downloads the segments of the file in parallel, into the part file.
+
+            Args:
+                url         (str)       --  url to download the file from
+
+                payload     (object)    --  instance of the Payload class
+
+                part_path   (str)       --  path of the part file
+
+                state_path  (str)       --  path of the file to save the progress of the segments
+
+                total       (int)       --  size of the file
+
+        """
+        segments = None
+        state = self._load_state(part_path, state_path)
+
+        if (state is not None and 'segments' in state and state.get('total') == total and
+                state.get('validator') == self._validator):
+            segments = state['segments']
+
+        if segments is None:
+            segment_size = max(MIN_SEGMENT_SIZE, -(-total // self.streams))
+            segments = [
+                [start, min(start + segment_size, total) - 1, 0]
+                for start in range(0, total, segment_size)
+            ]
+
+            with open(part_path, 'wb') as file_pointer:
+                file_pointer.truncate(total)
+
+        self._resumed_from = sum(segment[2] for segment in segments)
+
+        with self._lock:
+            self._downloaded += self._resumed_from
+
+        state_lock = threading.Lock()
+
+        def save_state():
+            """Saves the progress of the segments, to resume them on the next call."""
+            with state_lock:
+                self._save_state(state_path, {
+                    'total': total, 'validator': self._validator, 'segments': segments
+                })
+
+        save_state()
+
+        with ThreadPoolExecutor(max_workers=min(self.streams, len(segments))) as executor:
+            futures = [
+                executor.submit(
+                    self._download_segment, url, payload, part_path, segment, save_state
+                ) for segment in segments
+            ]
+
+            for future in futures:
+                future.result()
+
+    def _verify(self, part_path, total, checksum, checksum_type, hasher):
+        """Verifies the size, and the checksum of the downloaded file.
+
+            Args:
+                part_path       (str)       --  path of the part file
+
+                total           (int)       --  expected size of the file, None if not known
+
+                checksum        (str)       --  expected checksum of the file, None to skip
+
+                checksum_type   (str)       --  hashlib algorithm of the checksum
+
+                hasher          (object)    --  hashlib object updated with the streamed bytes,
+                None to compute the checksum from the part file
+
+            Raises:
+                SDKException:
+                    if the size, or the checksum of the file does not match
+
+        """
+        if total is not None and os.path.getsize(part_path) != total:
+            raise SDKException('Download', '102', 'Size of the file does not match {0}'.format(
+                total
+            ))
+
+        if checksum is None:
+            return
+
+        if hasher is None:
+            hasher = hashlib.new(checksum_type)
+
+            with open(part_path, 'rb') as file_pointer:
+                for content in iter(lambda: file_pointer.read(self.chunk_size), b''):
+                    hasher.update(content)
+
+        if hasher.hexdigest().lower() != checksum.lower():
+            raise SDKException('Download', '103')
+
+    def download(self, url, payload, download_path, checksum=None, checksum_type='sha256'):
+        """Downloads the file from the url to the download path.
+
+            Bytes already in the part file of the download path, from an earlier failed call,
+            are not downloaded again, if the server supports range requests, and the size, and
+            the validator of the file did not change since.
+
+            Args:
+                url             (str)       --  url to download the file from
+
+                payload         (object)    --  payload of the download request, instance of
+                the Payload class, or an XML string
+
+                download_path   (str)       --  path on the controller to download the file to
+
+                checksum        (str)       --  expected checksum of the file, in hex
+
+                    default: None
+
+                checksum_type   (str)       --  hashlib algorithm of the checksum
+
+                    default: sha256
+
+            Returns:
+                dict    -   dictionary consisting of the details of the download
+
+                    {
+                        "file": "C:\\\\packages\\\\package.zip",
+
+                        "size": 4294967296,
+
+                        "streams": 4,
+
+                        "resumed_from": 1073741824,
+
+                        "time_taken": 42.1,
+
+                        "throughput": 72.9
+                    }
+
+                    where, time_taken is in seconds, and throughput is in MB/s
+
+            Raises:
+                SDKException:
+                    if failed to download the file
+
+                    if the checksum of the file does not match
+
+                    if response is not success
+
+        """
+        if not isinstance(payload, Payload):
+            payload = XmlPayload(payload)
+
+        part_path = download_path + PART_SUFFIX
+        state_path = download_path + STATE_SUFFIX
+
+        with self._lock:
+            self._downloaded = 0
+            self._total = None
+            self._start_time = time.time()
+
+        # part file without a state is not resumed, as it may be of a different file
+        state = self._load_state(part_path, state_path)
+
+        if state is None or ('segments' in state and self.streams == 1):
+            # segments of an earlier parallel download are resumed only by a parallel download
+            state = None
+            offset = 0
+        elif 'segments' in state:
+            # segments of an earlier parallel download are resumed from the state file
+            offset = 0
+        else:
+            offset = os.path.getsize(part_path)
+
+        self._validator = state.get('validator') if state else None
+        response, start, total = self._request(url, payload, offset, validator=self._validator)
+
+        if offset and start == offset and total is not None and total == state.get('total'):
+            # server resumed after the bytes of the part file, of the same file
+            pass
+        elif response is None or start:
+            # part file is of a different file, or larger than it, download it again
+            if response is not None:
+                response.close()
+
+            offset = 0
+            self._validator = None
+            response, start, total = self._request(url, payload)
+
+        if response is not None:
+            etag = response.headers.get('ETag')
+            self._validator = (
+                etag if etag and not etag.startswith('W/') else
+                response.headers.get('Last-Modified')
+            ) or self._validator
+
+        self._total = total
+        hasher = hashlib.new(checksum_type) if checksum is not None else None
+
+        parallel = (
+            self.streams > 1 and offset == 0 and response.status_code == 206 and
+            total is not None and total >= 2 * MIN_SEGMENT_SIZE
+        )
+
+        if parallel:
+            response.close()
+            hasher = None
+            streams = self.streams
+            self._download_parallel(url, payload, part_path, state_path, total)
+            resumed_from = self._resumed_from
+        else:
+            if hasher is not None and start:
+                # checksum of the bytes already downloaded, before the streamed bytes
+                with open(part_path, 'rb') as file_pointer:
+                    remaining = start
+
+                    while remaining:
+                        content = file_pointer.read(min(self.chunk_size, remaining))
+
+                        if not content:
+                            break
+
+                        hasher.update(content)
+                        remaining -= len(content)
+
+            with self._lock:
+                self._downloaded = start
+
+            streams = 1
+            resumed_from = start
+
+            if response is not None:
+                self._save_state(state_path, {'total': total, 'validator': self._validator})
+                hasher = self._download_sequential(
+                    url, payload, part_path, hasher, (response, start, total)
+                )
+
+        self._verify(part_path, total, checksum, checksum_type, hasher)
+
+        if os.path.exists(download_path):
+            os.remove(download_path)
+
+        os.rename(part_path, download_path)
+
+        if os.path.exists(state_path):
+            os.remove(state_path)
+
+        time_taken = max(time.time() - self._start_time, 1e-6)
+        size = os.path.getsize(download_path)
+
+        return {
+            'file': download_path,
+            'size': size,
+            'streams': streams,
+            'resumed_from': resumed_from,
+            'time_taken': round(time_taken, 2),
+            'throughput': round((size - resumed_from) / (1024.0 ** 2) / time_taken, 2)
+        }
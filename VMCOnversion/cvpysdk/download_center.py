@@ -109,7 +109,9 @@ import os
 import time
 import xmltodict
 
+from .download import FileDownloader
 from .exception import SDKException
+from .payload import XmlPayload
 
 
 class DownloadCenter(object):
@@ -1105,9 +1107,23 @@ class DownloadCenter(object):
             response_string = self._update_response_(response.text)
             raise SDKException('Response', '101', response_string)
 
-    def download_package(self, package, download_location, platform=None, download_type=None):
+    def download_package(
+            self,
+            package,
+            download_location,
+            platform=None,
+            download_type=None,
+            chunk_size=1024 ** 2,
+            streams=1,
+            checksum=None,
+            checksum_type='sha256',
+            progress_callback=None):
         """Downloads the given package from Download Center to the path specified.
 
+            Package is downloaded to a .part file, and resumed from the bytes already downloaded
+            by an earlier call for the same package and location, if the server supports
+            range requests.
+
             Args:
                 package             (str)   --  name of the pacakge to be downloaded
 
@@ -1125,6 +1141,28 @@ class DownloadCenter(object):
 
                     default: None
 
+                chunk_size          (int)   --  size of each chunk read from the stream, in bytes
+
+                    default: 1 MB
+
+                streams             (int)   --  number of ranges of the package to download in
+                parallel, if the server supports range requests
+
+                    default: 1
+
+                checksum            (str)   --  expected checksum of the package, in hex
+
+                    default: None
+
+                checksum_type       (str)   --  hashlib algorithm of the checksum
+
+                    default: sha256
+
+                progress_callback   (callable)  --  function called after every chunk, with the
+                bytes downloaded, the total bytes, and the throughput in MB/s
+
+                    default: None
+
             Returns:
                 str     -   path on local machine where the file has been downloaded
 
@@ -1144,6 +1182,10 @@ class DownloadCenter(object):
 
                     if error returned by the server
 
+                    if failed to download the package
+
+                    if checksum of the package does not match
+
                     if response was not success
 
         """
@@ -1297,23 +1339,16 @@ class DownloadCenter(object):
 
             # execute request to get the stream of content
             # using request id returned in the previous response
-            flag1, response1 = self._cvpysdk_object.make_request(
-                'POST',
+            downloader = FileDownloader(
+                self._cvpysdk_object, chunk_size, streams, progress_callback=progress_callback
+            )
+            downloader.download(
                 self._services['DOWNLOAD_VIA_STREAM'],
-                request_xml.format(package_id, platform_id, download_type, request_id),
-                stream=True
+                XmlPayload(request_xml.format(package_id, platform_id, download_type, request_id)),
+                download_path,
+                checksum,
+                checksum_type
             )
-
-            # download chunks of 1MB each
-            chunk_size = 1024 ** 2
-
-            if flag1:
-                with open(download_path, "wb") as file_pointer:
-                    for content in response1.iter_content(chunk_size=chunk_size):
-                        file_pointer.write(content)
-            else:
-                response_string = self._update_response_(response1.text)
-                raise SDKException('Response', '101', response_string)
         else:
             response_string = self._update_response_(response.text)
             raise SDKException('Response', '101', response_string)
@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------------
+# Copyright Commvault Systems, Inc.
+# See LICENSE.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+"""File for the cache of the entity properties responses, shared by a Commcell session.
+
+Constructing the Client, Agent, Instance, Backupset, and Subclient objects triggers a GET request
+for the properties of the entity, and for the list of the child entities.
+
+EntityCache stores these responses per URL, i.e., per entity id, for a configurable time to live,
+and evicts the least recently used responses once the maximum size is reached.
+
+Cache is **disabled** by default, and is enabled by setting a TTL greater than 0:
+
+    >>> commcell.entity_cache.ttl = 300
+
+Any POST / PUT / DELETE request made through the session invalidates the cached responses for the
+same entity, its parents, and its children, e.g., a POST on **Subclient/10** invalidates the cached
+**Subclient/10** properties, and the **Subclient?clientId=2** list of subclients.
+
+Any POST / PUT / DELETE request on the **QCommand** APIs, e.g., a qoperation execute, clears the
+cache, as the command can modify any entity, which is not known from the URL.
+
+
+EntityCache:
+
+    __init__(ttl, max_size)     --  initialize the instance of the EntityCache class
+
+    __repr__()                  --  returns the string representation of the instance
+
+    __len__()                   --  returns the number of responses in the cache
+
+    _path()                     --  returns the path of the URL, without the query string
+
+    get()                       --  returns the cached response for the URL, if not expired
+
+    set()                       --  caches the response for the URL
+
+    invalidate()                --  removes the cached responses related to the URL
+
+    clear()                     --  removes all the cached responses
+
+    reset_stats()               --  resets the hit / miss / eviction counters
+
+
+EntityCache instance Attributes
+===============================
+
+    **ttl**                     --  seconds for which the cached responses are valid
+
+    **max_size**                --  maximum number of responses to cache
+
+    **enabled**                 --  returns whether the cache is enabled or not
+
+    **stats**                   --  returns the hits, misses, evictions, and invalidations count
+
+"""
+
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import threading
+import time
+
+from collections import OrderedDict
+
+from .exception import SDKException
+
+
+GLOBAL_OPERATIONS = ('qcommand',)
+"""tuple:   Path segments of the APIs which can modify any entity, and clear the cache."""
+
+
+class EntityCache(object):
+    """Class for caching the responses of the entity properties requests, with TTL and LRU."""
+
+    def __init__(self, ttl=0, max_size=1024):
+        """Initialize the EntityCache object.
+
+            Args:
+                ttl         (int)   --  seconds for which the cached responses are valid,
+                cache is disabled if 0
+
+                    default: 0
+
+                max_size    (int)   --  maximum number of responses to keep in the cache
+
+                    default: 1024
+
+            Returns:
+                object  -   instance of the EntityCache class
+
+        """
+        self._ttl = 0
+        self._max_size = 1
+
+        self.ttl = ttl
+        self.max_size = max_size
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def __repr__(self):
+        """String representation of the instance of this class."""
+        return 'EntityCache class instance with TTL: {0} seconds, and {1} entries'.format(
+            self._ttl, len(self)
+        )
+
+    def __len__(self):
+        """Returns the number of responses in the cache."""
+        return len(self._entries)
+
+    @staticmethod
+    def _path(url):
+        """Returns the path of the URL, without the query string, and the trailing slash."""
+        return url.split('?', 1)[0].rstrip('/').lower()
+
+    @property
+    def ttl(self):
+        """Returns the seconds for which the cached responses are valid."""
+        return self._ttl
+
+    @ttl.setter
+    def ttl(self, value):
+        """Sets the seconds for which the cached responses are valid, 0 to disable the cache."""
+        if not isinstance(value, (int, float)) or value < 0:
+            raise SDKException('EntityCache', '101')
+
+        self._ttl = value
+
+        if not value and hasattr(self, '_entries'):
+            self.clear()
+
+    @property
+    def max_size(self):
+        """Returns the maximum number of responses to keep in the cache."""
+        return self._max_size
+
+    @max_size.setter
+    def max_size(self, value):
+        """Sets the maximum number of responses to keep in the cache."""
+        if not isinstance(value, int) or value < 1:
+            raise SDKException('EntityCache', '102')
+
+        self._max_size = value
+
+    @property
+    def enabled(self):
+        """Returns whether the cache is enabled or not."""
+        return self._ttl > 0
+
+    @property
+    def stats(self):
+        """Returns the usage statistics of the cache.
+
+            Returns:
+                dict    -   dictionary consisting of the cache usage statistics
+
+                    {
+                        "hits": 40,
+
+                        "misses": 10,
+
+                        "evictions": 0,
+
+                        "invalidations": 2,
+
+                        "size": 8
+                    }
+
+        """
+        return {
+            'hits': self._hits,
+            'misses': self._misses,
+            'evictions': self._evictions,
+            'invalidations': self._invalidations,
+            'size': len(self)
+        }
+
+    def get(self, url):
+        """Returns the cached response for the URL, if it has not expired.
+
+            Args:
+                url     (str)   --  URL of the request
+
+            Returns:
+                object  -   cached response
+
+                None    -   if the response is not cached, has expired, or cache is disabled
+
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(url)
+
+            if entry is not None and time.time() - entry[0] <= self._ttl:
+                # mark the entry as the most recently used
+                del self._entries[url]
+                self._entries[url] = entry
+                self._hits += 1
+                return entry[1]
+
+            if entry is not None:
+                del self._entries[url]
+
+            self._misses += 1
+            return None
+
+    def set(self, url, response):
+        """Caches the response for the URL.
+
+            Args:
+                url         (str)       --  URL of the request
+
+                response    (object)    --  response to cache
+
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._entries.pop(url, None)
+            self._entries[url] = (time.time(), response)
+
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, url):
+        """Removes the cached responses for the entity of the URL, its parents, and its children.
+
+            All the cached responses are removed, if the URL is of an API which can modify any
+            entity, like the qoperation execute.
+
+            Args:
+                url     (str)   --  URL of the request modifying the entity
+
+            Returns:
+                int     -   number of responses removed from the cache
+
+        """
+        if not self._entries:
+            return 0
+
+        path = self._path(url)
+
+        if any(segment in GLOBAL_OPERATIONS for segment in path.split('/')):
+            with self._lock:
+                count = len(self._entries)
+                self._entries.clear()
+                self._invalidations += count
+
+            return count
+
+        with self._lock:
+            stale_urls = []
+
+            for cached_url in self._entries:
+                cached_path = self._path(cached_url)
+
+                if (cached_path == path or
+                        cached_path.startswith(path + '/') or
+                        path.startswith(cached_path + '/')):
+                    stale_urls.append(cached_url)
+
+            for cached_url in stale_urls:
+                del self._entries[cached_url]
+
+            self._invalidations += len(stale_urls)
+
+            return len(stale_urls)
+
+    def clear(self):
+        """Removes all the responses from the cache."""
+        with self._lock:
+            self._entries.clear()
+
+    def reset_stats(self):
+        """Resets the hits, misses, evictions, and invalidations count of the cache."""
+        with self._lock:
+            self._hits = self._misses = self._evictions = self._invalidations = 0
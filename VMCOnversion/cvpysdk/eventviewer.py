@@ -9,12 +9,29 @@
 
 """Main file for performing Event Viewer Operations
 
-Events and Event are 2 classes defined in this file
+Events, EventPoller, EventSubscription and Event are the classes defined in this file
 
 Events: Class for representing all the Events associated with the commcell
 
+EventPoller: Class for polling the new Events in the background, and publishing them to the
+subscribers
+
+EventSubscription: Class for the bounded queue of the new Events of a subscriber
+
 Event: Class for a single Event of the commcell
 
+Events are fetched incrementally, using a cursor of the id, and time of the last event seen.
+Each poll requests only the events from the time of the last event seen, and skips the events
+already seen, so the cost of a poll scales with the number of new events:
+
+    >>> for event in commcell.event_viewer.new_events():
+    ...     print(event['id'], event['eventCode'])
+
+    >>> poller = commcell.event_viewer.poller(interval=60)
+    >>> subscription = poller.subscribe()
+    >>> poller.start()
+    >>> new_events = subscription.get_events()
+
 
 Events:
     __init__(commcell_object) --  initialise object of Clients
@@ -26,11 +43,74 @@ Events:
     __repr__()                --  returns the string to represent
                                   the instance of the Events class.
 
+    _get_events()             --  gets the event records for the query params
+
+    _cursor_key()             --  returns the key of the cursor for the query params
+
+    _advance_cursor()         --  moves the cursor past the event record
+
     events()    --  gets all the Events associated with the commcell
 
+    iter_events()         --  yields the event records newer than the event id, and time
+
+    new_events()          --  returns the event records since the last call, and moves the cursor
+
+    reset_cursor()        --  moves the cursor to the input event id, and time
+
+    poller()              --  returns the EventPoller for the new events of the commcell
+
     get(event_id)         --  returns the Event class object of the input event id
 
 
+Events Attributes
+=================
+
+    **cursor**            --  returns the id, and time of the last event seen
+
+
+EventSubscription:
+    __init__(max_events, callback)  --  initialise object of the EventSubscription class
+
+    __len__()                   --  returns the number of events in the queue
+
+    publish(event)              --  adds the event to the queue, dropping the oldest if full
+
+    get_events()                --  returns, and removes all the events in the queue
+
+
+EventSubscription Attributes
+============================
+
+    **dropped**           --  returns the number of events dropped as the queue was full
+
+
+EventPoller:
+    __init__(events_object, interval, max_events, query_params_dict)
+                                --  initialise object of the EventPoller class
+
+    __repr__()                  --  returns the string to represent the instance
+
+    subscribe(callback)         --  returns a new subscription to the events
+
+    unsubscribe(subscription)   --  removes the subscription
+
+    poll()                      --  fetches the new events, and publishes them to the subscribers
+
+    _run()                      --  polls the events at the interval, until stopped
+
+    start()                     --  starts polling the events in the background
+
+    stop()                      --  stops the background polling
+
+
+EventPoller Attributes
+======================
+
+    **is_running**        --  returns whether the poller is running in the background
+
+    **last_error**        --  returns the exception raised by the last poll, if any
+
+
 Event:
     __init__(commcell_object)     --  initialise object of
                                       Class associated to the commcell
@@ -51,8 +131,19 @@ Event:
 from __future__ import absolute_import
 from __future__ import unicode_literals
 
+import threading
+
+from collections import deque
+
+from future.standard_library import install_aliases
+
 from .exception import SDKException
 
+install_aliases()
+
+# query param of the Events API, to get the events from the time of the last event seen
+SINCE_TIME_PARAM = 'fromTime'
+
 
 class Events(object):
     """Class for representing Events associated with the commcell."""
@@ -67,8 +158,17 @@ class Events(object):
                 object - instance of the Events class
         """
         self._commcell_object = commcell_object
+
+        self._lock = threading.Lock()
+
+        # query params -> [id, time] of the last event seen for the query
+        self._cursors = {}
+
         self._events = self.events()
 
+        if self._events:
+            self._cursors[()] = [max(int(event_id) for event_id in self._events), None]
+
     def __str__(self):
         """Representation string consisting of all events of the commcell.
 
@@ -88,6 +188,83 @@ class Events(object):
         representation_string = 'Events class instance'
         return representation_string
 
+    def _get_events(self, query_params_dict=None):
+        """Gets the event records of the commcell for the query params.
+
+            Args:
+                query_params_dict (dict)  --  Query Params Dict
+
+            Returns:
+                list - event records in the response, as returned by the API, empty list
+                if there are no events for the query params
+
+            Raises:
+                SDKException:
+                    if response is not success
+        """
+        from urllib.parse import urlencode
+
+        events_request = self._commcell_object._services['GET_EVENTS']
+        if query_params_dict:
+            events_request = events_request + '?' + urlencode(query_params_dict)
+
+        flag, response = self._commcell_object._cvpysdk_object.make_request(
+            'GET', events_request)
+
+        if flag:
+            # commservEvents is not returned, if there are no events for the query params
+            if response.json() and 'commservEvents' in response.json():
+                return response.json()['commservEvents']
+            else:
+                return []
+        else:
+            response_string = self._commcell_object._update_response_(
+                response.text)
+            raise SDKException('Response', '101', response_string)
+
+    @staticmethod
+    def _cursor_key(query_params_dict):
+        """Returns the key of the cursor for the query params."""
+        return tuple(sorted(
+            (str(key), str(value)) for key, value in (query_params_dict or {}).items()
+        ))
+
+    @staticmethod
+    def _advance_cursor(cursor, event):
+        """Moves the cursor past the event record, if the event is newer than the cursor.
+
+            Args:
+                cursor  (list)  --  [id, time] of the last event seen
+
+                event   (dict)  --  event record
+        """
+        event_id = int(event['id'])
+
+        if cursor[0] is None or event_id > cursor[0]:
+            cursor[0] = event_id
+
+        event_time = event.get('timeSource')
+        if event_time is not None and (cursor[1] is None or int(event_time) > cursor[1]):
+            cursor[1] = int(event_time)
+
+    @property
+    def cursor(self):
+        """Returns the id, and time of the last event seen by new_events(), as a tuple."""
+        return tuple(self._cursors.get((), (None, None)))
+
+    def reset_cursor(self, since_id=None, since_time=None, query_params_dict=None):
+        """Moves the cursor of the query params to the input event id, and time.
+
+            Args:
+                since_id            (int)   --  id of the last event seen, all events if None
+
+                since_time          (int)   --  time of the last event seen, all events if None
+
+                query_params_dict   (dict)  --  Query Params of the cursor
+        """
+        with self._lock:
+            self._cursors[self._cursor_key(query_params_dict)] = [since_id, since_time]
+
     def events(self, query_params_dict={}):
         """Gets all the events associated with the commcell
 
@@ -106,38 +283,93 @@ class Events(object):
 
             Raises:
                 SDKException:
-                    if response is empty
+                    if response is not success
+        """
+        events_dict = {}
+
+        for dictionary in self._get_events(query_params_dict):
+            event_id = dictionary['id']
+            event_code = dictionary['eventCode']
+            events_dict[event_id] = event_code
+
+        return events_dict
+
+    def iter_events(self, since_id=None, since_time=None, query_params_dict=None):
+        """Yields the event records newer than the event id, in the order of the event id.
+
+            Only the events from the since time are requested, and the events at the since time
+            with an id less than or equal to the since id are skipped.
+
+            Args:
+                since_id            (int)   --  id of the last event seen, all events if None
+
+                since_time          (int)   --  time of the last event seen, all events if None
 
+                query_params_dict   (dict)  --  additional Query Params, like the jobId
+
+            Yields:
+                dict - event record, with the id, eventCode, timeSource, severity, jobId,
+                description, and the other properties of the event
+
+            Raises:
+                SDKException:
                     if response is not success
         """
-        events_request = self._commcell_object._services['GET_EVENTS']
-        if query_params_dict:
-            events_request = events_request + '?'
-            for query_param in query_params_dict.keys():
-                if events_request[-1] != '?':
-                    events_request = events_request + '&'
-                events_request = events_request + query_param + \
-                    '=' + query_params_dict[query_param]
+        query_params = dict(query_params_dict or {})
+        if since_time is not None:
+            query_params[SINCE_TIME_PARAM] = since_time
 
-        flag, response = self._commcell_object._cvpysdk_object.make_request(
-            'GET', events_request)
+        records = self._get_events(query_params)
 
-        if flag:
-            if response.json() and 'commservEvents' in response.json():
-                events_dict = {}
+        if since_id is not None:
+            records = [record for record in records if int(record['id']) > since_id]
 
-                for dictionary in response.json()['commservEvents']:
-                    event_id = dictionary['id']
-                    event_code = dictionary['eventCode']
-                    events_dict[event_id] = event_code
+        for record in sorted(records, key=lambda record: int(record['id'])):
+            yield record
 
-                return events_dict
-            else:
-                raise SDKException('Response', '102')
-        else:
-            response_string = self._commcell_object._update_response_(
-                response.text)
-            raise SDKException('Response', '101', response_string)
+    def new_events(self, query_params_dict=None):
+        """Returns the event records since the last call, and moves the cursor past them.
+
+            A separate cursor is kept for each query params, so the events of a job do not
+            move the cursor of all the events.
+
+            Args:
+                query_params_dict   (dict)  --  additional Query Params, like the jobId
+
+            Returns:
+                list - event records newer than the cursor, in the order of the event id
+
+            Raises:
+                SDKException:
+                    if response is not success
+        """
+        with self._lock:
+            cursor = self._cursors.setdefault(self._cursor_key(query_params_dict), [None, None])
+            records = list(self.iter_events(cursor[0], cursor[1], query_params_dict))
+
+            for record in records:
+                self._advance_cursor(cursor, record)
+
+            return records
+
+    def poller(self, interval=60, max_events=1000, query_params_dict=None):
+        """Returns the EventPoller for the new events of the commcell.
+
+            Args:
+                interval            (int)   --  seconds between the polls
+
+                    default: 60
+
+                max_events          (int)   --  maximum number of events queued per subscriber
+
+                    default: 1000
+
+                query_params_dict   (dict)  --  additional Query Params, like the jobId
+
+            Returns:
+                object  -   instance of the EventPoller class
+        """
+        return EventPoller(self, interval, max_events, query_params_dict)
 
     def get(self, event_id):
         """Returns an event object
@@ -151,6 +383,212 @@ class Events(object):
         return Event(self._commcell_object, event_id)
 
 
+class EventSubscription(object):
+    """Class for the bounded queue of the new events of a subscriber."""
+
+    def __init__(self, max_events=1000, callback=None):
+        """Initialize the EventSubscription object.
+
+            Args:
+                max_events  (int)       --  maximum number of events in the queue, the oldest
+                events are dropped once full
+
+                callback    (callable)  --  function called with each new event
+
+            Returns:
+                object  -   instance of the EventSubscription class
+        """
+        self._queue = deque(maxlen=max_events)
+        self._callback = callback
+        self._lock = threading.Lock()
+        self._dropped = 0
+
+    def __len__(self):
+        """Returns the number of events in the queue."""
+        return len(self._queue)
+
+    @property
+    def dropped(self):
+        """Returns the number of events dropped as the queue was full."""
+        return self._dropped
+
+    def publish(self, event):
+        """Adds the event to the queue, dropping the oldest event if the queue is full.
+
+            Args:
+                event   (dict)  --  event record
+        """
+        with self._lock:
+            if len(self._queue) == self._queue.maxlen:
+                self._dropped += 1
+
+            self._queue.append(event)
+
+        if self._callback is not None:
+            self._callback(event)
+
+    def get_events(self):
+        """Returns, and removes all the events in the queue.
+
+            Returns:
+                list - event records, oldest first
+        """
+        with self._lock:
+            events = list(self._queue)
+            self._queue.clear()
+
+        return events
+
+
+class EventPoller(object):
+    """Class for polling the new events in the background, and publishing them to subscribers."""
+
+    def __init__(self, events_object, interval=60, max_events=1000, query_params_dict=None):
+        """Initialize the EventPoller object.
+
+            Args:
+                events_object       (object)    --  instance of the Events class
+
+                interval            (int)       --  seconds between the polls
+
+                    default: 60
+
+                max_events          (int)       --  maximum number of events queued per subscriber
+
+                    default: 1000
+
+                query_params_dict   (dict)      --  additional Query Params, like the jobId
+
+            Returns:
+                object  -   instance of the EventPoller class
+
+            Raises:
+                SDKException:
+                    if interval is not a positive number
+
+                    if max events is not a positive integer
+        """
+        if not isinstance(interval, (int, float)) or interval <= 0:
+            raise SDKException('EventViewer', '101')
+
+        if not isinstance(max_events, int) or max_events <= 0:
+            raise SDKException('EventViewer', '102')
+
+        self._events_object = events_object
+        self._interval = interval
+        self._max_events = max_events
+        self._query_params_dict = query_params_dict
+
+        self._subscriptions = []
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._last_error = None
+
+    def __repr__(self):
+        """String representation of the instance of this class."""
+        return 'EventPoller class instance polling every {0} seconds, for {1} subscribers'.format(
+            self._interval, len(self._subscriptions)
+        )
+
+    @property
+    def is_running(self):
+        """Returns whether the poller is running in the background."""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def last_error(self):
+        """Returns the exception raised by the last poll, None if the poll succeeded."""
+        return self._last_error
+
+    def subscribe(self, callback=None):
+        """Returns a new subscription to the new events.
+
+            Args:
+                callback    (callable)  --  function called with each new event, by the poller
+
+            Returns:
+                object  -   instance of the EventSubscription class
+        """
+        subscription = EventSubscription(self._max_events, callback)
+
+        with self._lock:
+            self._subscriptions.append(subscription)
+
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """Removes the subscription, the events are no longer published to it.
+
+            Args:
+                subscription    (object)    --  instance of the EventSubscription class
+        """
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    def poll(self):
+        """Fetches the new events, and publishes them to all the subscribers.
+
+            Returns:
+                int - number of new events
+
+            Raises:
+                SDKException:
+                    if response is not success
+        """
+        events = self._events_object.new_events(self._query_params_dict)
+
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+
+        for event in events:
+            for subscription in subscriptions:
+                try:
+                    subscription.publish(event)
+                except Exception as excp:
+                    # cursor has moved past the event, a failing callback of a subscriber
+                    # should not lose the event for the other subscribers
+                    self._last_error = excp
+
+        return len(events)
+
+    def _run(self):
+        """Polls the events at the interval, until the poller is stopped."""
+        while not self._stop_event.is_set():
+            self._last_error = None
+
+            try:
+                self.poll()
+            except Exception as excp:
+                self._last_error = excp
+
+            self._stop_event.wait(self._interval)
+
+    def start(self):
+        """Starts polling the events in the background, if not already running."""
+        if self.is_running:
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='EventPoller')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """Stops the background polling, and waits for the running poll to complete.
+
+            Args:
+                timeout     (int)   --  seconds to wait for the running poll, waits till
+                complete if None
+        """
+        self._stop_event.set()
+
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
 class Event(object):
     """Class for Event Viewer operations."""
 
@@ -279,6 +279,19 @@ EXCEPTION_DICT = {
     'Snap': {
         '101': 'Volume id is not set, Failed to perform Snap Operation',
         '102': 'Failed to run the job for Snap Operation',
+    },
+    'EntityCache': {
+        '101': 'TTL should be a non-negative number of seconds',
+        '102': 'Maximum size should be a positive integer'
+    },
+    'EventViewer': {
+        '101': 'Poll interval should be a positive number of seconds',
+        '102': 'Maximum events should be a positive integer'
+    },
+    'Download': {
+        '101': 'Chunk size, and streams should be positive integers',
+        '102': 'Failed to download the file',
+        '103': 'Checksum of the downloaded file does not match the expected checksum'
     }
 }
 
@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------------
+# Copyright Commvault Systems, Inc.
+# See LICENSE.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+"""File for executing a script, or a command on many clients of the Commcell.
+
+FleetExecution is the engine used by the **Clients.execute_on()** method.
+
+    #.  Script, or command is executed on the clients concurrently, by a bounded pool of workers
+
+    #.  Results are returned as each client finishes, and not after all the clients complete
+
+    #.  Script file is read only once, and the escaped script lines of the qcommand are
+        cached by the hash of the script, and shared by all the clients, and executions
+
+    #.  Summary of the execution gives the aggregate exit code, the clients which failed,
+        and the time taken by the clients
+
+    >>> execution = commcell.clients.execute_on(['proxy1', 'proxy2'], 'hostname')
+    >>> for result in execution:
+    ...     print(result.client_name, result.exit_code)
+    >>> execution.summary()['exit_code']
+    0
+
+
+ExecutionResult:
+
+    **succeeded**               --  returns whether the client ran the script with exit code 0
+
+
+FleetExecution:
+
+    __init__(clients_object,
+             clients,
+             script,
+             script_type,
+             script_arguments,
+             wait_for_completion,
+             concurrency)           --  initialize the instance, and start the execution
+
+    __iter__()                      --  yields the result of each client, as it finishes
+
+    __repr__()                      --  returns the string representation of the instance
+
+    _execute()                      --  executes the script, or command on a single client
+
+    results()                       --  waits for all the clients, and returns their results
+
+    summary()                       --  waits for all the clients, and returns the summary
+
+
+escaped_script_lines()              --  returns the escaped script lines of the qcommand,
+cached by the hash of the script
+
+"""
+
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import hashlib
+import os
+import threading
+import time
+
+from collections import namedtuple
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
+
+from past.builtins import basestring
+
+
+DEFAULT_CONCURRENCY = 8
+"""int:     Default number of clients the script is executed on concurrently."""
+
+SCRIPT_CACHE_SIZE = 32
+"""int:     Maximum number of escaped scripts kept in the cache."""
+
+# sha256 of the script -> escaped script lines, least recently used evicted first
+_SCRIPT_CACHE = OrderedDict()
+_SCRIPT_CACHE_LOCK = threading.Lock()
+
+
+def escaped_script_lines(script):
+    """Returns the escaped script lines of the App_ExecuteCommandReq qcommand for the script.
+
+        Lines are escaped, and joined only once for the same script, and served from the cache
+        for the subsequent executions.
+
+        Args:
+            script  (str)   --  contents of the script
+
+        Returns:
+            str     -   scriptLines elements of the script
+
+    """
+    import html
+
+    key = hashlib.sha256(script.encode('utf-8')).hexdigest()
+
+    with _SCRIPT_CACHE_LOCK:
+        if key in _SCRIPT_CACHE:
+            _SCRIPT_CACHE.move_to_end(key)
+            return _SCRIPT_CACHE[key]
+
+    script_lines = ''.join(
+        '<scriptLines val="{0}"/>'.format(line) for line in html.escape(script).split('\n')
+    )
+
+    with _SCRIPT_CACHE_LOCK:
+        _SCRIPT_CACHE[key] = script_lines
+
+        while len(_SCRIPT_CACHE) > SCRIPT_CACHE_SIZE:
+            _SCRIPT_CACHE.popitem(last=False)
+
+    return script_lines
+
+
+class ExecutionResult(namedtuple('ExecutionResult', (
+        'client_name', 'exit_code', 'output', 'error_message', 'exception', 'time_taken'))):
+    """Result of the script, or command executed on a single client.
+
+        exit_code is -1, and exception is set, if the request for the client failed.
+
+    """
+    __slots__ = ()
+
+    @property
+    def succeeded(self):
+        """Returns whether the client ran the script, or command with exit code 0."""
+        return self.exception is None and self.exit_code == 0
+
+
+class FleetExecution(object):
+    """Class for executing a script, or a command on many clients concurrently."""
+
+    def __init__(self,
+                 clients_object,
+                 clients,
+                 script,
+                 script_type=None,
+                 script_arguments=None,
+                 wait_for_completion=True,
+                 concurrency=DEFAULT_CONCURRENCY):
+        """Initialize the FleetExecution object, and start executing on the clients.
+
+            Args:
+                clients_object      (object)    --  instance of the Clients class
+
+                clients             (list)      --  names of the clients, or instances of the
+                Client class
+
+                script              (str)       --  path, or contents of the script, or the
+                command if the script type is None
+
+                script_type         (str)       --  type of the script, like PowerShell,
+                UnixShell, executes the script as a command if None
+
+                    default: None
+
+                script_arguments    (str)       --  arguments to the script
+
+                    default: None
+
+                wait_for_completion (bool)      --  wait for the script to finish on the clients
+
+                    default: True
+
+                concurrency         (int)       --  number of clients executed on concurrently
+
+                    default: 8
+
+        """
+        self._clients_object = clients_object
+        self._script_type = script_type
+        self._script_arguments = script_arguments
+        self._wait_for_completion = wait_for_completion
+
+        if script_type is not None and os.path.isfile(script):
+            # read once for all the clients, instead of once by each client
+            with open(script, 'rb') as script_file:
+                script = script_file.read().decode()
+
+        self._script = script
+        # same client listed more than once is executed on only once
+        self._clients = list(OrderedDict(
+            (getattr(client, 'client_name', client).lower(), client) for client in clients
+        ).values())
+
+        self._start_time = time.time()
+        self._time_taken = None
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+        executor = ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(self._clients))))
+        self._futures = [executor.submit(self._execute, client) for client in self._clients]
+        executor.shutdown(wait=False)
+
+    def __repr__(self):
+        """String representation of the instance of this class."""
+        return 'FleetExecution class instance for {0} clients, {1} finished'.format(
+            len(self._clients), len(self._results)
+        )
+
+    def __iter__(self):
+        """Yields the ExecutionResult of each client, in the order the clients finish."""
+        for future in as_completed(self._futures):
+            yield future.result()
+
+    def _execute(self, client):
+        """Executes the script, or command on the client, and records its result.
+
+            Args:
+                client  (str / object)  --  name of the client, or instance of the Client class
+
+            Returns:
+                object  -   ExecutionResult of the client
+
+        """
+        start_time = time.time()
+        client_name = getattr(client, 'client_name', client)
+
+        try:
+            if isinstance(client, basestring):
+                client = self._clients_object.get(client)
+
+            if self._script_type is None:
+                exit_code, output, error_message = client.execute_command(
+                    self._script, self._script_arguments, self._wait_for_completion
+                )
+            else:
+                exit_code, output, error_message = client.execute_script(
+                    self._script_type, self._script, self._script_arguments,
+                    self._wait_for_completion
+                )
+
+            result = ExecutionResult(
+                client_name, exit_code, output, error_message, None, time.time() - start_time
+            )
+        except Exception as excp:
+            result = ExecutionResult(
+                client_name, -1, '', str(excp), excp, time.time() - start_time
+            )
+
+        with self._lock:
+            self._results[client_name] = result
+
+            if len(self._results) == len(self._clients):
+                self._time_taken = time.time() - self._start_time
+
+        return result
+
+    def results(self):
+        """Waits for all the clients to finish, and returns their results.
+
+            Returns:
+                list    -   ExecutionResult of each client, in the order of the input clients
+
+        """
+        return [future.result() for future in self._futures]
+
+    def summary(self):
+        """Waits for all the clients to finish, and returns the summary of the execution.
+
+            Returns:
+                dict    -   summary of the execution
+
+                    {
+                        'clients': 20,
+
+                        'succeeded': 19,
+
+                        'failed': ['client07'],
+
+                        'exit_code': 1,
+
+                        'exit_codes': {0: 19, 1: 1},
+
+                        'time_taken': 12.5,
+
+                        'average_time': 4.2,
+
+                        'slowest': ('client11', 11.9)
+                    }
+
+                exit_code is 0 if all the clients succeeded, else the exit code of the first
+                failed client, in the order of the input clients
+
+        """
+        results = self.results()
+        failed = [result for result in results if not result.succeeded]
+
+        exit_codes = {}
+        for result in results:
+            exit_codes[result.exit_code] = exit_codes.get(result.exit_code, 0) + 1
+
+        slowest = max(results, key=lambda result: result.time_taken) if results else None
+
+        return {
+            'clients': len(results),
+            'succeeded': len(results) - len(failed),
+            'failed': [result.client_name for result in failed],
+            'exit_code': failed[0].exit_code if failed else 0,
+            'exit_codes': exit_codes,
+            'time_taken': round(self._time_taken or 0, 3),
+            'average_time': round(
+                sum(result.time_taken for result in results) / len(results), 3
+            ) if results else 0,
+            'slowest': (slowest.client_name, round(slowest.time_taken, 3)) if slowest else None
+        }
@@ -203,7 +203,7 @@ class Instances(object):
 
                     if response is not success
         """
-        flag, response = self._cvpysdk_object.make_request('GET', self._INSTANCES)
+        flag, response = self._cvpysdk_object.make_request('GET', self._INSTANCES, cache=True)
 
         if flag:
             if response.json():
@@ -485,7 +485,7 @@ class Instance(object):
 
                     if response is not success
         """
-        flag, response = self._cvpysdk_object.make_request('GET', self._INSTANCE)
+        flag, response = self._cvpysdk_object.make_request('GET', self._INSTANCE, cache=True)
 
         if flag:
             if response.json() and "instanceProperties" in response.json():
@@ -13,6 +13,10 @@ JobController:  Class for managing jobs on this commcell
 
 Job:            Class for keeping track of a job and perform various operations on it.
 
+JobRecord:      Compact, immutable record of a job in the jobs list, yielded by iter_jobs()
+
+JobTracker:     Tracks the jobs added to it at any time, with a single background poller
+
 
 JobController:
 
@@ -25,8 +29,16 @@ JobController:
     __repr__()                  --  returns the string representation of the object of this class,
     with the commcell it is associated with
 
+    _get_jobs_request_json()    --  returns the request json for the jobs request
+
+    _get_job_record()           --  returns the compact JobRecord for the given job summary
+
     _get_jobs_list()            --  executes the request, and parses and returns the jobs response
 
+    _get_jobs_page()            --  returns a single page of the jobs, and the total jobs count
+
+    iter_jobs()                 --  generator to lazily iterate over all the pages of the jobs
+
     all_jobs()                  --  returns all the jobs on this commcell
 
     active_jobs()               --  returns the dict of active jobs and their details
@@ -35,6 +47,34 @@ JobController:
 
     get()                       --  returns the Job class instance for the given job id
 
+    _get_tracked_jobs_status()  --  returns the latest status of all the tracked jobs,
+    using a single jobs list request
+
+    _kill_job()                 --  kills the job with the given id
+
+    _track_jobs()               --  polls the status of the tracked jobs, till all of them finish
+
+    wait_for_jobs()             --  waits for multiple jobs to finish, with a single batched
+    request per poll, and returns futures resolved as each job finishes
+
+    track_jobs()                --  returns a JobTracker, to wait for the jobs submitted over
+    time, with a single batched request per poll
+
+
+JobTracker:
+
+    __init__()                  --  initializes the instance of JobTracker class, and starts
+    polling in a background thread
+
+    __repr__()                  --  returns the string representation of the object of this class
+
+    _take_added()               --  returns the jobs added since the last poll, and whether
+    the tracker is closed
+
+    add()                       --  adds the job to be tracked, and returns its future
+
+    close()                     --  stops the tracker, once all the added jobs finish
+
 
 Job:
 
@@ -115,11 +155,44 @@ Job instance Attributes
 from __future__ import absolute_import
 from __future__ import unicode_literals
 
+import math
+import threading
 import time
 
+from collections import namedtuple
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+
 from .exception import SDKException
 
 
+JOB_FINISHED_STATUSES = ('completed', 'killed', 'failed')
+"""tuple:   Job status keywords, which specify that the job has finished."""
+
+MAX_MISSED_POLLS = 10
+"""int:     Consecutive polls a tracked job is not found in, before its future is failed."""
+
+
+class JobRecord(namedtuple('JobRecord', [
+        'job_id',
+        'operation',
+        'status',
+        'app_type',
+        'job_type',
+        'percent_complete',
+        'pending_reason',
+        'subclient_id'])):
+    """Compact, immutable record of the summary of a job, returned by the jobs list."""
+
+    __slots__ = ()
+
+    def as_dict(self):
+        """Returns the details of the job, in the format of the dict returned by the jobs list."""
+        details = self._asdict()
+        del details['job_id']
+        return dict(details)
+
+
 class JobController(object):
     """Class for controlling all the jobs associated with the commcell."""
 
@@ -197,6 +270,10 @@ class JobController(object):
 
                             default: 20
 
+                    offset          (int)   --  number of jobs to skip, to get the next page
+
+                            default: 0
+
                     lookup_time     (int)   --  list of jobs to be retrieved which are specified
                     hours older
 
@@ -234,7 +311,7 @@ class JobController(object):
             "category": job_list_category[options.get('category', 'ALL')],
             "pagingConfig": {
                 "sortDirection": 1,
-                "offset": 0,
+                "offset": options.get('offset', 0),
                 "sortField": "jobId",
                 "limit": options.get('limit', 20)
             },
@@ -254,6 +331,28 @@ class JobController(object):
 
         return request_json
 
+    @staticmethod
+    def _get_job_record(job_summary):
+        """Returns the compact JobRecord for the summary of the job in the jobs list response.
+
+            Args:
+                job_summary     (dict)  --  jobSummary of the job from the jobs response
+
+            Returns:
+                object  -   instance of the JobRecord class
+
+        """
+        return JobRecord(
+            job_summary['jobId'],
+            job_summary['localizedOperationName'],
+            job_summary['status'],
+            job_summary.get('appTypeName', ''),
+            job_summary.get('jobType', ''),
+            job_summary['percentComplete'],
+            job_summary.get('pendingReason', ''),
+            job_summary.get('subclient', {}).get('subclientId', '')
+        )
+
     def _get_jobs_list(self, **options):
         """Executes a request on the server to get the list of jobs.
 
@@ -280,60 +379,174 @@ class JobController(object):
 
         if flag:
             try:
-                if response.json():
-                    if 'jobs' in response.json():
-                        all_jobs = response.json()['jobs']
+                response_json = response.json()
+
+                if response_json:
+                    if 'jobs' in response_json:
+                        all_jobs = response_json['jobs']
 
                         for job in all_jobs:
                             if 'jobSummary' in job and job['jobSummary']['isVisible'] is True:
+                                job_record = self._get_job_record(job['jobSummary'])
+                                jobs_dict[job_record.job_id] = job_record.as_dict()
 
-                                job_summary = job['jobSummary']
-                                job_id = job_summary['jobId']
+                    return jobs_dict
 
-                                status = job_summary['status']
-                                operation = job_summary['localizedOperationName']
-                                percent_complete = job_summary['percentComplete']
+                else:
+                    raise SDKException('Response', '102')
 
-                                app_type = ''
-                                job_type = ''
-                                pending_reason = ''
-                                subclient_id = ''
+            except ValueError:
+                raise SDKException('Response', '102', 'Please check the inputs.')
+        else:
+            response_string = self._update_response_(response.text)
+            raise SDKException('Response', '101', response_string)
 
-                                if 'appTypeName' in job_summary:
-                                    app_type = job_summary['appTypeName']
+    def _get_jobs_page(self, **options):
+        """Executes a request on the server to get a single page of the list of jobs.
 
-                                if 'jobType' in job_summary:
-                                    job_type = job_summary['jobType']
+            Args:
+                options     (dict)  --  options supported by the jobs request json,
+                with the **limit** and **offset** of the page
 
-                                if 'pendingReason' in job_summary:
-                                    pending_reason = job_summary['pendingReason']
+            Returns:
+                (list, int, int)
+                    list    -   list of JobRecord instances for the visible jobs in this page
 
-                                if 'subclient' in job_summary:
-                                    job_subclient = job_summary['subclient']
-                                    if 'subclientId' in job_subclient:
-                                        subclient_id = job_subclient['subclientId']
+                    int     -   count of the jobs in this page, including the hidden jobs
 
-                                jobs_dict[job_id] = {
-                                    'operation': operation,
-                                    'status': status,
-                                    'app_type': app_type,
-                                    'job_type': job_type,
-                                    'percent_complete': percent_complete,
-                                    'pending_reason': pending_reason,
-                                    'subclient_id': subclient_id
-                                }
+                    int     -   total number of jobs on the server, for the given options
 
-                    return jobs_dict
+            Raises:
+                SDKException:
+                    if response is empty
 
-                else:
-                    raise SDKException('Response', '102')
+                    if response is not success
+
+        """
+        request_json = self._get_jobs_request_json(**options)
 
+        flag, response = self._cvpysdk_object.make_request(
+            'POST', self._services['ALL_JOBS'], request_json
+        )
+
+        if flag:
+            try:
+                response_json = response.json()
             except ValueError:
                 raise SDKException('Response', '102', 'Please check the inputs.')
+
+            if not response_json:
+                raise SDKException('Response', '102')
+
+            all_jobs = response_json.get('jobs', [])
+
+            job_records = [
+                self._get_job_record(job['jobSummary'])
+                for job in all_jobs
+                if 'jobSummary' in job and job['jobSummary']['isVisible'] is True
+            ]
+
+            return (
+                job_records,
+                len(all_jobs),
+                response_json.get('totalRecordsWithoutPaging', len(all_jobs))
+            )
         else:
             response_string = self._update_response_(response.text)
             raise SDKException('Response', '101', response_string)
 
+    def iter_jobs(self, category='ALL', lookup_time=24, page_size=100, **options):
+        """Generator to lazily iterate over all the jobs on the Commcell matching the criteria,
+            one page at a time.
+
+            Next page is fetched in the background, while the caller processes the jobs in the
+            current page.
+
+            Args:
+                category        (str)   --  category of the jobs to iterate over
+
+                    Valid Values:
+
+                        - ALL
+
+                        - ACTIVE
+
+                        - FINISHED
+
+                    default: ALL
+
+                lookup_time     (int)   --  get all the jobs executed within the number of hours
+
+                    default: 24 Hours
+
+                page_size       (int)   --  number of jobs to get in a single request
+
+                    default: 100
+
+                options         (dict)  --  dict of key-word arguments
+
+                Available Options:
+
+                    show_aged_job   (bool)  --  boolean specifying whether to include aged jobs in
+                    the result or not
+
+                        default: False
+
+                    clients_list    (list)  --  list of clients to return the jobs for
+
+                        default: []
+
+                    job_type_list   (list)  --  list of job operation types
+
+                        default: []
+
+            Returns:
+                generator   -   generator yielding the JobRecord instance for each job
+
+            Raises:
+                SDKException:
+                    if page size is not a positive integer
+
+                    if client name is given, and no client exists with the given name
+
+                    if response is empty
+
+                    if response is not success
+
+        """
+        if not isinstance(page_size, int) or page_size < 1:
+            raise SDKException('Job', '102', 'Page size should be a positive integer')
+
+        options['category'] = category
+        options['lookup_time'] = lookup_time
+        options['limit'] = page_size
+
+        def _fetch_page(offset):
+            """Fetches the page of jobs starting at the given offset."""
+            page_options = dict(options)
+            page_options['offset'] = offset
+            return self._get_jobs_page(**page_options)
+
+        executor = ThreadPoolExecutor(max_workers=1)
+
+        try:
+            offset = 0
+            next_page = executor.submit(_fetch_page, offset)
+
+            while next_page is not None:
+                job_records, jobs_count, total_jobs = next_page.result()
+                offset += jobs_count
+
+                if jobs_count < page_size or offset >= total_jobs:
+                    next_page = None
+                else:
+                    next_page = executor.submit(_fetch_page, offset)
+
+                for job_record in job_records:
+                    yield job_record
+        finally:
+            executor.shutdown(wait=False)
+
     def all_jobs(self, client_name=None, lookup_time=5, job_filter=None, **options):
         """Returns the dict consisting of all the jobs executed on the Commcell within the number
             of hours specified in lookup time value.
@@ -583,6 +796,465 @@ class JobController(object):
         """
         return Job(self._commcell_object, job_id)
 
+    def _get_tracked_jobs_status(self, job_ids, lookup_time, limit):
+        """Gets the status of all the tracked jobs, with a single jobs list request.
+
+            Jobs which were not part of the jobs list, i.e., went beyond the limit on a
+            busy CommServ, are looked up individually.
+
+            Args:
+                job_ids         (set)   --  set of ids of the jobs to get the status of
+
+                lookup_time     (int)   --  hours to lookup the finished jobs for
+
+                limit           (int)   --  maximum number of jobs to get in the jobs list
+
+            Returns:
+                dict    -   dictionary consisting of the job id as the key, and the dict
+                with the status, pending reason, and percent complete of the job as value
+
+        """
+        jobs_dict = self._get_jobs_list(category='ALL', lookup_time=lookup_time, limit=limit)
+
+        tracked_jobs = {}
+
+        for job_id in job_ids:
+            if int(job_id) in jobs_dict:
+                tracked_jobs[job_id] = jobs_dict[int(job_id)]
+                continue
+
+            flag, response = self._cvpysdk_object.make_request(
+                'GET', self._services['JOB'] % job_id
+            )
+
+            if flag and response.json() and response.json().get('jobs'):
+                job_summary = response.json()['jobs'][0]['jobSummary']
+
+                tracked_jobs[job_id] = {
+                    'status': job_summary['status'],
+                    'pending_reason': job_summary.get('pendingReason', ''),
+                    'percent_complete': job_summary.get('percentComplete', 0)
+                }
+
+        return tracked_jobs
+
+    def _kill_job(self, job_id):
+        """Kills the job with the given id.
+
+            Args:
+                job_id  (str)   --  id of the job to kill
+
+            Returns:
+                bool    -   boolean specifying whether the kill request was successful or not
+
+        """
+        flag, _ = self._cvpysdk_object.make_request('POST', self._services['KILL_JOB'] % job_id)
+        return flag
+
+    def _track_jobs(self,
+                    futures,
+                    timeout,
+                    min_interval,
+                    max_interval,
+                    limit,
+                    callback,
+                    tracker=None):
+        """Polls the status of all the jobs in the futures dict, till all of them finish.
+
+            Poll interval starts at the minimum interval, and grows by 1.5 times on every poll
+            where none of the jobs changed their status, up to the maximum interval.
+
+            It falls back to the minimum interval, if any of the jobs changed its status,
+            or is near completion (90% or more).
+
+            Future of a job not found in **MAX_MISSED_POLLS** consecutive polls, neither in the
+            jobs list, nor by its id, is failed with the SDKException for no such job.
+
+            Args:
+                futures         (dict)      --  dict of job id and its Future instance
+
+                timeout         (int)       --  minutes after which a job should be killed,
+                if the job has been in Pending / Waiting state
+
+                min_interval    (int)       --  minimum seconds to wait between the polls
+
+                max_interval    (int)       --  maximum seconds to wait between the polls
+
+                limit           (int)       --  maximum number of jobs to get in a single poll
+
+                callback        (callable)  --  function to call with the job id and the final
+                status of the job, as soon as the job finishes
+
+                tracker         (object)    --  instance of the JobTracker class, to also poll
+                the jobs added to it, till it is closed
+
+                    default: None
+
+        """
+        status_list = ['pending', 'waiting']
+
+        start_time = time.time()
+        interval = min_interval
+
+        # status, and the time since the job is in pending / waiting state, for each job
+        previous_status = dict.fromkeys(futures)
+        state_start_time = dict.fromkeys(futures, start_time)
+
+        # consecutive polls in which the job was not found, for each job
+        missed_polls = {}
+
+        pending = set(futures)
+        closed = tracker is None
+
+        try:
+            while True:
+                if tracker is not None:
+                    # closed is read with the added jobs, so a job added just before the
+                    # tracker is closed is always polled
+                    added, closed = tracker._take_added()
+
+                    for job_id, future in added:
+                        futures[job_id] = future
+                        previous_status[job_id] = None
+                        state_start_time[job_id] = time.time()
+                        pending.add(job_id)
+
+                    if added:
+                        interval = min_interval
+
+                if not pending:
+                    if closed:
+                        break
+
+                    # idle till the next job is added
+                    tracker._added_event.wait(max_interval)
+                    continue
+
+                lookup_time = int(math.ceil((time.time() - start_time) / 3600)) + 1
+                tracked_jobs = self._get_tracked_jobs_status(pending, lookup_time, limit)
+
+                status_changed = False
+                near_completion = False
+
+                for job_id in list(pending):
+                    if job_id not in tracked_jobs:
+                        missed_polls[job_id] = missed_polls.get(job_id, 0) + 1
+
+                        if missed_polls[job_id] >= MAX_MISSED_POLLS:
+                            pending.discard(job_id)
+                            futures[job_id].set_exception(SDKException(
+                                'Job', '103', 'Job ID: {0} was not found in {1} polls'.format(
+                                    job_id, missed_polls[job_id]
+                                )
+                            ))
+
+                        continue
+
+                    missed_polls.pop(job_id, None)
+                    status = tracked_jobs[job_id]['status'].lower()
+
+                    if status != previous_status[job_id]:
+                        status_changed = True
+
+                    if any(finished in status for finished in JOB_FINISHED_STATUSES):
+                        pending.discard(job_id)
+                        futures[job_id].set_result(status)
+
+                        if callback is not None:
+                            callback(job_id, status)
+
+                        continue
+
+                    if tracked_jobs[job_id]['percent_complete'] >= 90:
+                        near_completion = True
+
+                    # same semantics as Job.wait_for_completion
+                    if status in status_list and previous_status[job_id] not in status_list:
+                        state_start_time[job_id] = time.time()
+
+                    if status in status_list:
+                        if (time.time() - state_start_time[job_id]) / 60 > timeout:
+                            self._kill_job(job_id)
+                            pending.discard(job_id)
+                            futures[job_id].set_result('killed')
+
+                            if callback is not None:
+                                callback(job_id, 'killed')
+
+                            continue
+
+                    previous_status[job_id] = status
+
+                if not pending:
+                    if tracker is None:
+                        break
+
+                    continue
+
+                if status_changed or near_completion:
+                    interval = min_interval
+                else:
+                    interval = min(interval * 1.5, max_interval)
+
+                if tracker is not None:
+                    # woken up early, if a job is added
+                    tracker._added_event.wait(interval)
+                else:
+                    time.sleep(interval)
+        except Exception as excp:
+            if tracker is not None:
+                tracker._fail(excp)
+
+                for job_id, future in tracker._take_added()[0]:
+                    futures[job_id] = future
+                    pending.add(job_id)
+
+            for job_id in pending:
+                futures[job_id].set_exception(excp)
+
+            raise
+
+    def wait_for_jobs(self,
+                      job_ids,
+                      timeout=30,
+                      min_interval=5,
+                      max_interval=60,
+                      limit=500,
+                      callback=None,
+                      wait=True):
+        """Waits for all the given jobs to finish, with a single jobs list request per poll,
+            irrespective of the number of jobs being tracked.
+
+            Kills a job, if the job has been in Pending / Waiting state for more than the
+            timeout value, same as **Job.wait_for_completion()**.
+
+            Args:
+                job_ids         (list)      --  list of ids of the jobs to wait for
+
+                timeout         (int)       --  minutes after which a job should be killed,
+                if the job has been in Pending / Waiting state
+
+                    default: 30
+
+                min_interval    (int)       --  minimum seconds to wait between the polls
+
+                    default: 5
+
+                max_interval    (int)       --  maximum seconds to wait between the polls
+
+                    default: 60
+
+                limit           (int)       --  maximum number of jobs to get in a single poll
+
+                    default: 500
+
+                callback        (callable)  --  function to call as soon as a job finishes,
+                with the job id and the final status of the job as arguments
+
+                    default: None
+
+                wait            (bool)      --  boolean specifying whether to block till all the
+                jobs finish, or to track the jobs in a background thread and return immediately
+
+                    default: True
+
+            Returns:
+                dict    -   dictionary consisting of the job id as the key, and the
+                **concurrent.futures.Future** instance resolved with the final status of the job
+                (completed / completed w/ one or more errors / failed / killed / ...)
+                as the value, or failed with the SDKException, if the job is not found
+
+            Raises:
+                SDKException:
+                    if type of the job ids argument is not list
+
+                    if any of the job ids is not an integer
+
+        """
+        if not isinstance(job_ids, (list, tuple, set)):
+            raise SDKException('Job', '102', 'Job IDs should be a list')
+
+        for job_id in job_ids:
+            try:
+                int(job_id)
+            except ValueError:
+                raise SDKException('Job', '101')
+
+        futures = dict((str(job_id), Future()) for job_id in job_ids)
+
+        for future in futures.values():
+            future.set_running_or_notify_cancel()
+
+        args = (futures, timeout, min_interval, max_interval, limit, callback)
+
+        if wait:
+            self._track_jobs(*args)
+        else:
+            tracker = threading.Thread(target=self._track_jobs, args=args)
+            tracker.daemon = True
+            tracker.start()
+
+        return futures
+
+    def track_jobs(self, timeout=30, min_interval=5, max_interval=60, limit=500, callback=None):
+        """Returns a tracker, to wait for the jobs submitted over time, with a single jobs
+            list request per poll for all the jobs added to it, irrespective of when they
+            were added.
+
+            Kills a job, if the job has been in Pending / Waiting state for more than the
+            timeout value, same as **Job.wait_for_completion()**.
+
+            Args:
+                timeout         (int)       --  minutes after which a job should be killed,
+                if the job has been in Pending / Waiting state
+
+                    default: 30
+
+                min_interval    (int)       --  minimum seconds to wait between the polls
+
+                    default: 5
+
+                max_interval    (int)       --  maximum seconds to wait between the polls
+
+                    default: 60
+
+                limit           (int)       --  maximum number of jobs to get in a single poll
+
+                    default: 500
+
+                callback        (callable)  --  function to call as soon as a job finishes,
+                with the job id and the final status of the job as arguments
+
+                    default: None
+
+            Returns:
+                object  -   instance of the JobTracker class, polling in a background thread
+
+        """
+        return JobTracker(self, timeout, min_interval, max_interval, limit, callback)
+
+
+class JobTracker(object):
+    """Class for tracking the jobs added to it at any time, with a single background poller."""
+
+    def __init__(self, job_controller, timeout, min_interval, max_interval, limit, callback):
+        """Initialize the JobTracker object, and start polling in a background thread.
+
+            Args:
+                job_controller  (object)    --  instance of the JobController class
+
+                timeout         (int)       --  minutes after which a job should be killed,
+                if the job has been in Pending / Waiting state
+
+                min_interval    (int)       --  minimum seconds to wait between the polls
+
+                max_interval    (int)       --  maximum seconds to wait between the polls
+
+                limit           (int)       --  maximum number of jobs to get in a single poll
+
+                callback        (callable)  --  function to call as soon as a job finishes,
+                with the job id and the final status of the job as arguments
+
+            Returns:
+                object  -   instance of the JobTracker class
+
+        """
+        self._lock = threading.Lock()
+        self._added = []
+        self._added_event = threading.Event()
+        self._closed = False
+        self._error = None
+        self._futures = {}
+
+        self._thread = threading.Thread(
+            target=job_controller._track_jobs,
+            args=({}, timeout, min_interval, max_interval, limit, callback, self)
+        )
+        self._thread.daemon = True
+        self._thread.start()
+
+    def __repr__(self):
+        """String representation of the instance of this class."""
+        return 'JobTracker class instance tracking {0} jobs'.format(len(self._futures))
+
+    def _take_added(self):
+        """Returns the jobs added since the last call, as a list of (job id, future) tuples,
+            and whether the tracker was closed, both read together under the lock.
+        """
+        with self._lock:
+            added, self._added = self._added, []
+            self._added_event.clear()
+            closed = self._closed
+
+        return added, closed
+
+    def _fail(self, excp):
+        """Marks the tracker as failed, with the exception raised by the poller."""
+        with self._lock:
+            self._error = excp
+            self._closed = True
+
+    @property
+    def closed(self):
+        """Returns whether the tracker is closed for new jobs."""
+        return self._closed
+
+    def add(self, job_id):
+        """Adds the job to be tracked by the poller.
+
+            Args:
+                job_id  (str / int / object)    --  id of the job, or instance of the Job class
+
+            Returns:
+                object  -   **concurrent.futures.Future** instance resolved with the final status
+                of the job (completed / completed w/ one or more errors / failed / killed / ...)
+
+            Raises:
+                SDKException:
+                    if job id is not an integer
+
+                    if the tracker is closed
+
+        """
+        job_id = str(getattr(job_id, 'job_id', job_id))
+
+        try:
+            int(job_id)
+        except ValueError:
+            raise SDKException('Job', '101')
+
+        with self._lock:
+            if self._closed:
+                raise SDKException('Job', '102', 'Tracker is closed{0}'.format(
+                    '' if self._error is None else ', polling failed: {0}'.format(self._error)
+                ))
+
+            if job_id not in self._futures:
+                future = Future()
+                future.set_running_or_notify_cancel()
+                self._futures[job_id] = future
+                self._added.append((job_id, future))
+                self._added_event.set()
+
+            return self._futures[job_id]
+
+    def close(self, wait=True):
+        """Stops accepting new jobs, and stops the poller once all the added jobs finish.
+
+            Args:
+                wait    (bool)  --  boolean specifying whether to block till all the added
+                jobs finish
+
+                    default: True
+
+        """
+        with self._lock:
+            self._closed = True
+            self._added_event.set()
+
+        if wait:
+            self._thread.join()
+
 
 class Job(object):
     """Class for performing client operations for a specific client."""
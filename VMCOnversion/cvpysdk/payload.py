@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------------
+# Copyright Commvault Systems, Inc.
+# See LICENSE.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+"""File for the typed request payloads accepted by the CVPySDK.make_request method.
+
+Each payload declares its content type, and serializes its body only once, so the
+**make_request()** method does not have to inspect the body to decide the Content-type header:
+
+    >>> flag, response = commcell._cvpysdk_object.make_request(
+    ...     'POST', commcell._services['EXECUTE_QCOMMAND'], XmlPayload(request_xml)
+    ... )
+
+    #.  JsonPayload     -   dict / list serialized to JSON once, or an already serialized JSON
+
+    #.  XmlPayload      -   XML request, like the qcommand, and the download center requests
+
+    #.  RawPayload      -   text, or bytes sent as is, with the given content type
+
+    #.  StreamPayload   -   file, file path, or an iterable of chunks, streamed in chunks
+    without reading the complete body into memory
+
+Text payloads larger than the stream threshold are encoded, and sent in chunks, instead of
+encoding the complete text into a second copy in memory.
+
+Untyped payloads passed to **make_request()** are converted by **as_payload()**, where a string,
+or bytes payload starting with **<** is sent as XML, and any other string as plain text.
+
+
+Payload:
+
+    content_type                --  content type of the payload, None to send without one
+
+    headers()                   --  returns the request headers, with the content type of the
+    payload
+
+    body()                      --  returns the body of the request
+
+
+JsonPayload:
+
+    __init__(data)              --  initialize the instance, for the dict / list, or JSON string
+
+
+XmlPayload:
+
+    __init__(xml)               --  initialize the instance, for the XML string
+
+
+RawPayload:
+
+    __init__(data,
+             content_type)      --  initialize the instance, for the text / bytes
+
+
+StreamPayload:
+
+    __init__(source,
+             content_type,
+             chunk_size)        --  initialize the instance, for the file / path / iterable
+
+
+as_payload()                    --  returns the typed payload for the payload passed to
+make_request()
+
+"""
+
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import json
+
+from past.builtins import basestring
+
+
+DEFAULT_CHUNK_SIZE = 1024 ** 2
+"""int:     Default size of each chunk of a streamed body, in bytes."""
+
+STREAM_THRESHOLD = 1024 ** 2 * 16
+"""int:     Text payloads longer than this are encoded, and sent in chunks."""
+
+CONTENT_TYPE_HEADER = 'Content-type'
+"""str:     Name of the content type header, as used in the headers of the Commcell."""
+
+
+class Payload(object):
+    """Base class for the typed payloads of the requests."""
+
+    content_type = None
+
+    # typed payloads always set their content type, payloads converted from an untyped
+    # argument set it only if the request headers have the content type header
+    _explicit = True
+
+    def headers(self, headers):
+        """Returns the request headers, with the content type of the payload.
+
+            Headers are copied only if the content type has to be changed.
+
+            Args:
+                headers     (dict)  --  request headers
+
+            Returns:
+                dict    -   request headers for this payload
+
+        """
+        if self.content_type is None:
+            return headers
+
+        if not self._explicit and CONTENT_TYPE_HEADER not in headers:
+            return headers
+
+        if headers.get(CONTENT_TYPE_HEADER) == self.content_type:
+            return headers
+
+        headers = dict(headers)
+        headers[CONTENT_TYPE_HEADER] = self.content_type
+        return headers
+
+    def body(self):
+        """Returns the body of the request, as bytes, a file, or an iterable of chunks."""
+        raise NotImplementedError
+
+
+class _TextPayload(Payload):
+    """Base class for the payloads of text, or bytes, encoded only once."""
+
+    def __init__(self, data):
+        """Initialize the payload for the text, or bytes.
+
+            Args:
+                data    (str / bytes)   --  body of the request
+
+        """
+        self._data = data
+        self._encoded = data if isinstance(data, (bytes, bytearray, memoryview)) else None
+
+    def __len__(self):
+        """Returns the length of the payload, in characters for text, and in bytes for bytes."""
+        return len(self._data)
+
+    def _iter_chunks(self):
+        """Yields the text encoded in chunks, to not keep a second copy of the text."""
+        for offset in range(0, len(self._data), DEFAULT_CHUNK_SIZE):
+            yield self._data[offset:offset + DEFAULT_CHUNK_SIZE].encode('utf-8')
+
+    def body(self):
+        """Returns the encoded body, encoding the text only on the first call.
+
+            Text longer than the stream threshold is returned as a generator of encoded chunks.
+
+        """
+        if self._encoded is not None:
+            return self._encoded
+
+        if len(self._data) > STREAM_THRESHOLD:
+            return self._iter_chunks()
+
+        self._encoded = self._data.encode('utf-8')
+        return self._encoded
+
+
+class JsonPayload(_TextPayload):
+    """Payload of a JSON request."""
+
+    content_type = 'application/json'
+
+    def __init__(self, data):
+        """Initialize the payload for the JSON data.
+
+            Args:
+                data    (dict / list / str / bytes)     --  data to serialize to JSON, or the
+                already serialized JSON
+
+        """
+        if isinstance(data, (dict, list, tuple)):
+            data = json.dumps(data).encode('utf-8')
+
+        super(JsonPayload, self).__init__(data)
+
+
+class XmlPayload(_TextPayload):
+    """Payload of an XML request."""
+
+    content_type = 'application/xml'
+
+
+class RawPayload(_TextPayload):
+    """Payload of text, or bytes, sent as is."""
+
+    def __init__(self, data, content_type='text/plain'):
+        """Initialize the payload for the text, or bytes.
+
+            Args:
+                data            (str / bytes)   --  body of the request
+
+                content_type    (str)           --  content type of the body,
+                None to send the request without setting one
+
+                    default: text/plain
+
+        """
+        super(RawPayload, self).__init__(data)
+        self.content_type = content_type
+
+
+class StreamPayload(Payload):
+    """Payload streamed in chunks, from a file, a file path, or an iterable of chunks."""
+
+    def __init__(self, source, content_type='application/octet-stream',
+                 chunk_size=DEFAULT_CHUNK_SIZE):
+        """Initialize the payload for the source of the body.
+
+            A file, or file path is read again from the start, if the request is sent again,
+            e.g., after renewing the Authtoken. An iterable of chunks can only be sent once.
+
+            Args:
+                source          (str / file / iterable)     --  path of the file, file object
+                opened in binary mode, or an iterable of bytes
+
+                content_type    (str)       --  content type of the body
+
+                    default: application/octet-stream
+
+                chunk_size      (int)       --  size of each chunk read from the file
+
+                    default: 1 MB
+
+        """
+        self._source = source
+        self.content_type = content_type
+        self.chunk_size = chunk_size
+        self._start = None
+
+        if hasattr(source, 'seek') and hasattr(source, 'tell'):
+            try:
+                self._start = source.tell()
+            except (IOError, OSError):
+                self._start = None
+
+    def _iter_file(self, file_object):
+        """Yields the chunks of the file."""
+        while True:
+            chunk = file_object.read(self.chunk_size)
+
+            if not chunk:
+                break
+
+            yield chunk
+
+    def _iter_path(self):
+        """Yields the chunks of the file at the path, closing the file once read."""
+        with open(self._source, 'rb') as file_object:
+            for chunk in self._iter_file(file_object):
+                yield chunk
+
+    def body(self):
+        """Returns the generator of the chunks of the body."""
+        if isinstance(self._source, basestring):
+            return self._iter_path()
+
+        if hasattr(self._source, 'read'):
+            if self._start is not None:
+                self._source.seek(self._start)
+
+            return self._iter_file(self._source)
+
+        return iter(self._source)
+
+
+def as_payload(payload):
+    """Returns the typed payload for the payload passed to the make_request() method.
+
+        The content type of a string, or bytes payload is decided by its first non-whitespace
+        character, instead of parsing the complete payload.
+
+        Args:
+            payload     (object)    --  payload passed to make_request()
+
+        Returns:
+            object  -   instance of the Payload class, None if the payload is None
+
+    """
+    if payload is None or isinstance(payload, Payload):
+        return payload
+
+    if isinstance(payload, (dict, list)):
+        return JsonPayload(payload)
+
+    if isinstance(payload, (bytes, bytearray)) or hasattr(payload, 'encode'):
+        head = payload[:1024].lstrip()
+        typed_payload = XmlPayload(payload) if head[:1] in ('<', b'<') else RawPayload(payload)
+    else:
+        # memoryview, file, or another body supported by requests, sent as is
+        typed_payload = RawPayload(payload, content_type=None)
+
+    typed_payload._explicit = False
+    return typed_payload
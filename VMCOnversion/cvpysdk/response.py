@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------------
+# Copyright Commvault Systems, Inc.
+# See LICENSE.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+"""File for the response wrapper returned by the CVPySDK.make_request method.
+
+The SDK collections call **response.json()** multiple times on the same response, to check for
+the keys and then read them. For large responses (clients list, jobs list, browse), decoding a
+multi-megabyte body repeatedly takes most of the time spent in the SDK.
+
+CVResponse decodes the body only once, and caches the result for all the subsequent calls.
+
+If available, a faster JSON decoder is used to decode the body:
+
+    #.  orjson
+
+    #.  ujson
+
+    and falls back to the decoder of the requests module, if neither of them is installed.
+
+For very large list endpoints, the items of a top-level list can be iterated over with an
+incremental parser, if **ijson** is installed, without building the complete response dict.
+Numbers with a fraction are returned as float, same as the JSON decoders, also with the versions
+of ijson older than 3.1, which return them as Decimal.
+
+
+CVResponse:
+
+    __init__(response)          --  initialize the instance of the CVResponse class,
+    for the given requests response
+
+    __repr__()                  --  returns the string representation of the wrapped response
+
+    __bool__()                  --  returns whether the response status code is less than 400
+
+    __iter__()                  --  iterates over the content of the response, in chunks
+
+    __getattr__()               --  returns the attribute of the wrapped response
+
+    _decode()                   --  decodes the body of the response using the fastest decoder
+
+    json()                      --  returns the decoded JSON body of the response, decoding it
+    only on the first call
+
+    iter_items()                --  generator to iterate over the items of a top-level list in
+    the JSON body of the response
+
+
+CVResponse instance Attributes
+==============================
+
+    **response**                --  returns the wrapped `requests.Response` instance
+
+    **is_decoded**              --  returns whether the body has already been decoded, or not
+
+"""
+
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import io
+
+from decimal import Decimal
+
+try:
+    import orjson as fast_json
+except ImportError:
+    try:
+        import ujson as fast_json
+    except ImportError:
+        fast_json = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+_IJSON_KWARGS = {}
+
+if ijson is not None:
+    try:
+        # use_float is supported since ijson 3.1
+        list(ijson.items(io.BytesIO(b'[]'), 'item', use_float=True))
+        _IJSON_KWARGS['use_float'] = True
+    except TypeError:
+        pass
+
+
+def _decimal_to_float(value):
+    """Returns the value with all the Decimal numbers in it converted to float."""
+    if isinstance(value, Decimal):
+        return float(value)
+
+    if isinstance(value, dict):
+        return dict((key, _decimal_to_float(item)) for key, item in value.items())
+
+    if isinstance(value, list):
+        return [_decimal_to_float(item) for item in value]
+
+    return value
+
+
+_NOT_DECODED = object()
+
+
+class CVResponse(object):
+    """Wrapper over the requests response, to decode the JSON body only once."""
+
+    def __init__(self, response):
+        """Initialize the CVResponse object for the given response.
+
+            Args:
+                response    (object)    --  instance of the requests.Response class
+
+            Returns:
+                object  -   instance of the CVResponse class
+
+        """
+        self._response = response
+        self._json = _NOT_DECODED
+
+    def __repr__(self):
+        """String representation of the wrapped response."""
+        return repr(self._response)
+
+    def __bool__(self):
+        """Returns True if the status code of the response is less than 400."""
+        return bool(self._response)
+
+    __nonzero__ = __bool__
+
+    def __iter__(self):
+        """Iterates over the content of the response, in chunks."""
+        return iter(self._response)
+
+    def __getattr__(self, attribute):
+        """Returns the attribute of the wrapped response, for all other attributes."""
+        return getattr(self._response, attribute)
+
+    def _decode(self, **kwargs):
+        """Decodes the body of the response, using the fastest decoder available.
+
+            Args:
+                kwargs      (dict)  --  keyword arguments to pass to the json decoder
+
+            Returns:
+                dict / list     -   decoded JSON body of the response
+
+            Raises:
+                ValueError:
+                    if the body of the response is not a valid JSON
+
+        """
+        if fast_json is not None and not kwargs:
+            try:
+                return fast_json.loads(self._response.content)
+            except ValueError:
+                # let the requests module try to detect the encoding, and raise the error
+                pass
+
+        return self._response.json(**kwargs)
+
+    @property
+    def response(self):
+        """Returns the wrapped requests response."""
+        return self._response
+
+    @property
+    def is_decoded(self):
+        """Returns whether the JSON body of the response has already been decoded, or not."""
+        return self._json is not _NOT_DECODED
+
+    def json(self, **kwargs):
+        """Returns the JSON body of the response, decoding it only on the first call.
+
+            Args:
+                kwargs      (dict)  --  keyword arguments to pass to the json decoder
+
+            Returns:
+                dict / list     -   decoded JSON body of the response
+
+            Raises:
+                ValueError:
+                    if the body of the response is not a valid JSON
+
+        """
+        if self._json is _NOT_DECODED:
+            self._json = self._decode(**kwargs)
+
+        return self._json
+
+    def iter_items(self, key):
+        """Generator to iterate over the items of the top-level list in the JSON body
+            of the response, with the given key.
+
+            Items are parsed incrementally if **ijson** is installed, and the body has not been
+            decoded already, otherwise the items are read from the decoded body.
+
+            Args:
+                key     (str)   --  key of the top-level list in the JSON body
+
+            Returns:
+                generator   -   generator yielding each item of the list
+
+            Raises:
+                ValueError:
+                    if the body of the response is not a valid JSON
+
+        """
+        if ijson is None or self.is_decoded:
+            response_json = self.json() or {}
+
+            for item in response_json.get(key, []):
+                yield item
+
+            return
+
+        items = ijson.items(io.BytesIO(self._response.content), key + '.item', **_IJSON_KWARGS)
+
+        for item in items:
+            yield item if _IJSON_KWARGS else _decimal_to_float(item)
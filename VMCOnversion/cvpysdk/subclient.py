@@ -87,6 +87,11 @@ Subclient:
 
     find()                      --  searches a given file/folder name in the subclient content
 
+    iter_browse()               --  generator to browse the content of the backup for this
+    subclient page by page, walking the sub-folders concurrently
+
+    iter_find()                 --  generator to search the subclient content page by page
+
     restore_in_place()          --  Restores the files/folders specified in the
     input paths list to the same location
 
@@ -308,7 +313,7 @@ class Subclients(object):
                     if response is not success
         """
         flag, response = self._cvpysdk_object.make_request(
-            'GET', self._SUBCLIENTS)
+            'GET', self._SUBCLIENTS, cache=True)
 
         if flag:
             if response.json() and 'subClientProperties' in response.json():
@@ -797,7 +802,7 @@ class Subclient(object):
         """
 
         flag, response = self._cvpysdk_object.make_request(
-            'GET', self._SUBCLIENT)
+            'GET', self._SUBCLIENT, cache=True)
 
         if flag:
             if response.json() and 'subClientProperties' in response.json():
@@ -1576,6 +1581,66 @@ class Subclient(object):
 
         return self._backupset_object.find(options)
 
+    def iter_browse(self, path='\\', page_size=1000, recursive=True, max_workers=4, **options):
+        """Generator to browse the content of the Subclient, page by page.
+
+            Yields a compact BrowseItem for each file / folder as the pages are received,
+            instead of collecting all the results in memory.
+
+            Example:
+
+                for item in subclient.iter_browse('c:\\\\data', page_size=5000):
+                    if item.is_file:
+                        print(item.path, item.size, item.modified_time)
+
+            Args:
+                path            (str)   --  path to browse
+
+                    default: \\
+
+                page_size       (int)   --  number of results to get in each browse request
+
+                    default: 1000
+
+                recursive       (bool)  --  whether to browse all the sub-folders as well
+
+                    default: True
+
+                max_workers     (int)   --  maximum number of browse requests in flight, while
+                walking the sub-folders
+
+                    default: 4
+
+                options         (dict)  --  other browse options, same as browse()
+
+            Returns:
+                generator   -   generator yielding a BrowseItem for each file / folder
+
+        """
+        options['_subclient_id'] = self._subclient_id
+
+        return self._backupset_object.iter_browse(
+            path, page_size, recursive, max_workers, **options
+        )
+
+    def iter_find(self, page_size=1000, **options):
+        """Generator to search the content of the Subclient, page by page.
+
+            Args:
+                page_size       (int)   --  number of results to get in each find request
+
+                    default: 1000
+
+                options         (dict)  --  find options, same as find()
+
+            Returns:
+                generator   -   generator yielding a BrowseItem for each matching file / folder
+
+        """
+        options['_subclient_id'] = self._subclient_id
+
+        return self._backupset_object.iter_find(page_size, **options)
+
     def restore_in_place(
             self,
             paths,
@@ -0,0 +1,435 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------------
+# Copyright Commvault Systems, Inc.
+# See LICENSE.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+"""File for uploading the files / folders from the controller machine to a client.
+
+FileUploader is the upload engine used by the **Client.upload_file()** and
+**Client.upload_folder()** methods.
+
+    #.  Files are memory-mapped, and each chunk is sent as a view on the mapping,
+        without reading, or copying the chunk into a separate buffer
+
+    #.  Files larger than the chunk size are streamed in chunks, over the pooled session of the
+        Commcell, and files smaller than the chunk size are uploaded in a single request
+
+    #.  Files of a folder are uploaded concurrently by a pool of workers
+
+    #.  Progress of a chunked upload is recorded after every acknowledged chunk, and a failed
+        chunk is sent again from the last acknowledged offset, with the same request id, only
+        if the chunk was surely not written, i.e., the request was never sent, or the server
+        returned an error status. If the upload still fails, calling **upload_file()** again
+        for the same file resumes the upload from the last acknowledged offset
+
+    #.  Each upload returns the size, time taken, and the throughput for the file
+
+
+FileUploader:
+
+    __init__(client_object,
+             chunk_size,
+             max_workers,
+             max_retries)           --  initialize the instance of the FileUploader class,
+    for the given client
+
+    __repr__()                      --  returns the string representation of the instance
+
+    _upload_chunk()                 --  uploads a single chunk, retrying from the last
+    acknowledged offset on failure
+
+    _upload_chunked()               --  uploads the memory-mapped file in chunks
+
+    upload_file()                   --  uploads the file to the destination folder on the client
+
+    upload_folder()                 --  uploads the folder to the destination folder on the
+    client, uploading the files concurrently
+
+
+FileUploader instance Attributes
+================================
+
+    **chunk_size**                  --  size of each chunk, in bytes
+
+    **max_workers**                 --  number of files uploaded concurrently by upload_folder()
+
+    **pending_uploads**             --  returns the chunked uploads which can be resumed
+
+"""
+
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import mmap
+import os
+import threading
+import time
+
+from base64 import b64encode
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from requests.packages.urllib3.exceptions import NewConnectionError
+
+from .exception import SDKException
+
+
+DEFAULT_CHUNK_SIZE = 1024 ** 2 * 2
+"""int:     Default size of each chunk of a chunked upload, in bytes."""
+
+DEFAULT_MAX_WORKERS = 4
+"""int:     Default number of files uploaded concurrently by upload_folder()."""
+
+DEFAULT_MAX_RETRIES = 3
+"""int:     Default number of times a failed chunk is sent again, before giving up."""
+
+
+class FileUploader(object):
+    """Class for uploading the files / folders from the controller machine to a client."""
+
+    def __init__(self,
+                 client_object,
+                 chunk_size=DEFAULT_CHUNK_SIZE,
+                 max_workers=DEFAULT_MAX_WORKERS,
+                 max_retries=DEFAULT_MAX_RETRIES):
+        """Initialize the FileUploader object for the given client.
+
+            Args:
+                client_object   (object)    --  instance of the Client class
+
+                chunk_size      (int)       --  size of each chunk of a chunked upload, in bytes
+
+                    default: 2 MB
+
+                max_workers     (int)       --  number of files to upload concurrently
+
+                    default: 4
+
+                max_retries     (int)       --  number of times to send a failed chunk again
+
+                    default: 3
+
+            Returns:
+                object  -   instance of the FileUploader class
+
+        """
+        self._client_object = client_object
+        self._services = client_object._services
+
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self._max_retries = max_retries
+
+        # (source path, destination folder) -> [request id, chunk offset, acknowledged bytes]
+        self._pending_uploads = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        """String representation of the instance of this class."""
+        return "FileUploader class instance for Client: '{0}'".format(
+            self._client_object.client_name
+        )
+
+    @property
+    def chunk_size(self):
+        """Returns the size of each chunk of a chunked upload, in bytes."""
+        return self._chunk_size
+
+    @chunk_size.setter
+    def chunk_size(self, value):
+        """Sets the size of each chunk of a chunked upload, in bytes."""
+        if not isinstance(value, int) or value <= 0:
+            raise SDKException('Client', '101')
+
+        self._chunk_size = value
+
+    @property
+    def max_workers(self):
+        """Returns the number of files uploaded concurrently by upload_folder()."""
+        return self._max_workers
+
+    @max_workers.setter
+    def max_workers(self, value):
+        """Sets the number of files uploaded concurrently by upload_folder()."""
+        if not isinstance(value, int) or value <= 0:
+            raise SDKException('Client', '101')
+
+        self._max_workers = value
+
+    @property
+    def pending_uploads(self):
+        """Returns the dict of the chunked uploads which failed, and can be resumed.
+
+            dict - consists of the source file path and destination folder as the key,
+            and the number of bytes acknowledged by the server as the value
+
+                {
+                    ("C:\\\\data\\\\file1.dat", "/opt/data"): 20971520
+                }
+
+        """
+        with self._lock:
+            return dict(
+                (key, progress[2]) for key, progress in self._pending_uploads.items()
+            )
+
+    def _upload_chunk(self, upload_url, view, headers, progress):
+        """Uploads the chunk, and records the acknowledged offset in the progress.
+
+            Chunk is sent again from the last acknowledged offset, with the same request id,
+            up to the maximum retries, only if the request was never sent, or the server
+            returned an error status. A read timeout, or a connection closed after the chunk
+            was sent is raised without a retry, and the upload is not kept to be resumed, as
+            the server may have written the chunk.
+
+            Args:
+                upload_url  (str)           --  url to upload the chunk to
+
+                view        (memoryview)    --  view on the memory-mapped chunk
+
+                headers     (dict)          --  request headers for the chunk
+
+                progress    (list)          --  request id, chunk offset, and acknowledged bytes
+                of the upload
+
+            Raises:
+                SDKException:
+                    if failed to upload the chunk after the maximum retries
+
+                    if the server did not acknowledge the chunk
+
+                requests.exceptions.RequestException:
+                    if the chunk may have been written, and cannot be sent again
+
+        """
+        attempt = 0
+
+        while True:
+            try:
+                progress[0], progress[1] = self._client_object._make_request(
+                    upload_url, view, headers, progress[0], progress[1]
+                )
+                progress[2] += len(view)
+                return
+            except (SDKException, requests.exceptions.RequestException) as excp:
+                if isinstance(excp, SDKException):
+                    # error status from the server, the chunk was not acknowledged
+                    retry = excp.exception_module == 'Response' and excp.exception_id == '101'
+                elif isinstance(excp, requests.exceptions.ConnectTimeout):
+                    retry = True
+                elif isinstance(excp, requests.exceptions.ConnectionError):
+                    # the connection could not be opened, so the chunk was never sent
+                    reason = getattr(excp.args[0], 'reason', None) if excp.args else None
+                    retry = isinstance(reason, NewConnectionError)
+                else:
+                    retry = False
+
+                if not retry:
+                    # acknowledged offset is not known, the upload is not resumed from it
+                    progress[0] = None
+                    raise
+
+                attempt += 1
+
+                if attempt > self._max_retries:
+                    raise
+
+                time.sleep(min(2 ** attempt, 30))
+
+    def _upload_chunked(self, mapped_file, file_size, headers, progress):
+        """Uploads the memory-mapped file in chunks, starting from the acknowledged offset.
+
+            Args:
+                mapped_file     (object)    --  memory-mapped file
+
+                file_size       (int)       --  size of the file, in bytes
+
+                headers         (dict)      --  request headers for the file
+
+                progress        (list)      --  request id, chunk offset, and acknowledged bytes
+                of the upload
+
+            Returns:
+                int     -   number of chunks uploaded
+
+        """
+        upload_url = self._services['UPLOAD_CHUNKED_FILE'] % (self._client_object.client_id)
+        chunks = 0
+
+        view = memoryview(mapped_file)
+
+        try:
+            while progress[2] < file_size:
+                offset = progress[2]
+                end = min(offset + self.chunk_size, file_size)
+
+                headers['FileSize'] = str(end - offset)
+                headers['FileEOF'] = str(int(end == file_size))
+
+                chunk = view[offset:end]
+
+                try:
+                    self._upload_chunk(upload_url, chunk, headers, progress)
+                finally:
+                    chunk.release()
+
+                chunks += 1
+        finally:
+            view.release()
+
+        return chunks
+
+    def upload_file(self, source_file_path, destination_folder):
+        """Uploads the source file to the destination folder on the client machine.
+
+            Resumes the upload from the last acknowledged offset, if a previous chunked upload
+            of the same file to the same folder had failed.
+
+            Args:
+                source_file_path    (str)   --  path of the file on the controller machine
+
+                destination_folder  (str)   --  path on the client machine where the file
+                is to be copied
+
+            Returns:
+                dict    -   dictionary consisting of the details of the upload
+
+                    {
+                        "file": "C:\\\\data\\\\file1.dat",
+
+                        "size": 104857600,
+
+                        "chunks": 50,
+
+                        "resumed_from": 0,
+
+                        "time_taken": 4.21,
+
+                        "throughput": 23.75
+                    }
+
+                    where, time_taken is in seconds, and throughput is in MB/s
+
+            Raises:
+                SDKException:
+                    if failed to upload the file
+
+                    if response is empty
+
+                    if response is not success
+
+        """
+        file_name = os.path.split(source_file_path)[-1]
+        file_size = os.path.getsize(source_file_path)
+
+        headers = {
+            'Authtoken': self._client_object._commcell_object._headers['Authtoken'],
+            'Accept': 'application/json',
+            'FileName': b64encode(file_name.encode('utf-8')),
+            'FileSize': None,
+            'ParentFolderPath': b64encode(destination_folder.encode('utf-8'))
+        }
+
+        key = (source_file_path, destination_folder)
+        start_time = time.time()
+
+        if file_size <= self.chunk_size:
+            upload_url = self._services['UPLOAD_FULL_FILE'] % (self._client_object.client_id)
+            headers['FileSize'] = str(file_size)
+
+            with open(source_file_path, 'rb') as file_stream:
+                self._client_object._make_request(upload_url, file_stream.read(), headers)
+
+            chunks, resumed_from = 1, 0
+        else:
+            with self._lock:
+                progress = self._pending_uploads.pop(key, [None, None, 0])
+
+            resumed_from = progress[2]
+
+            try:
+                with open(source_file_path, 'rb') as file_stream:
+                    mapped_file = mmap.mmap(file_stream.fileno(), 0, access=mmap.ACCESS_READ)
+
+                    try:
+                        chunks = self._upload_chunked(mapped_file, file_size, headers, progress)
+                    finally:
+                        try:
+                            mapped_file.close()
+                        except BufferError:
+                            # a view on the mapping is still referenced by the traceback of the
+                            # failed request, mapping is closed when the view is collected
+                            pass
+            except Exception:
+                # record the progress, to resume the upload on the next call for this file
+                if progress[0] is not None:
+                    with self._lock:
+                        self._pending_uploads[key] = progress
+
+                raise
+
+        time_taken = max(time.time() - start_time, 1e-6)
+
+        return {
+            'file': source_file_path,
+            'size': file_size,
+            'chunks': chunks,
+            'resumed_from': resumed_from,
+            'time_taken': round(time_taken, 2),
+            'throughput': round((file_size - resumed_from) / (1024.0 ** 2) / time_taken, 2)
+        }
+
+    def upload_folder(self, source_dir, destination_dir, delimiter='/'):
+        """Uploads the source folder to the destination folder on the client machine.
+
+            Files of the folder, and all its sub-folders, are uploaded concurrently by a pool
+            of **max_workers** workers.
+
+            Args:
+                source_dir          (str)   --  path of the folder on the controller machine
+
+                destination_dir     (str)   --  path on the client machine where the folder
+                is to be copied
+
+                delimiter           (str)   --  path separator of the client machine
+
+                    default: /
+
+            Returns:
+                list    -   list of the upload details of each file, same as upload_file()
+
+            Raises:
+                SDKException:
+                    if failed to upload any of the files
+
+                    if response is empty
+
+                    if response is not success
+
+        """
+        source_dir = os.path.normpath(source_dir)
+        base_dir = os.path.dirname(source_dir)
+        uploads = []
+
+        for root, _, files in os.walk(source_dir):
+            relative_path = os.path.relpath(root, base_dir).split(os.sep)
+            destination_folder = delimiter.join([destination_dir] + relative_path)
+
+            for file_name in sorted(files):
+                uploads.append((os.path.join(root, file_name), destination_folder))
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+
+        try:
+            futures = [
+                executor.submit(self.upload_file, file_path, destination_folder)
+                for file_path, destination_folder in uploads
+            ]
+
+            return [future.result() for future in futures]
+        finally:
+            executor.shutdown(wait=True)
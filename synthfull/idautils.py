@@ -995,7 +995,8 @@ class CommonUtils(object):
         except Exception as excp:
             raise Exception("\n {0} {1}".format(inspect.stack()[0][3], str(excp)))
 
-    def compare_file_metadata(self, client, source_path, destination_path, dirtime=True):
+    def compare_file_metadata(self, client, source_path, destination_path, dirtime=True,
+                              use_checksum=False):
         """Compares the meta data of source path with destination path and checks if they are same
 
              Args:
@@ -1011,6 +1012,12 @@ class CommonUtils(object):
                 dirtime             (bool)  --  whether to get time stamp of all directories
                     default: False
 
+                use_checksum        (bool)  --  compare the content hash of the files instead,
+                                                    hashing the source and destination together,
+                                                    or only the destination if the source was
+                                                    cached by TestdataValidator at backup
+                    default: False
+
             Returns:
                 bool   -   Returns True if lists are same or returns False
 
@@ -1025,6 +1032,13 @@ class CommonUtils(object):
 
             self.log.info("Client: [{0}], Source path [{1}]".format(client, source_path))
             self.log.info("Client: [{0}], Destination path [{1}]".format(client, destination_path))
+            if use_checksum:
+                self.log.info("Comparing content hash for source and destination paths")
+                from VirtualServer.VSAUtils.TestdataValidation import TestdataValidator
+                TestdataValidator().validate(
+                    machine_obj, source_path, machine_obj, destination_path)
+                return
+
             self.log.info("Comparing meta data for source and destination paths")
 
             response = machine_obj.compare_meta_data(source_path, destination_path, dirtime)